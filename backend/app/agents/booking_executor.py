@@ -0,0 +1,167 @@
+# app/agents/booking_executor.py
+import asyncio
+from datetime import date
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.agents.response_models.booker_agent import (
+    Bookings,
+    FlightBookingResult,
+    HotelBookingResult,
+)
+from app.agents.response_models.requirements_agent import CompleteRequirements
+from app.agents.tools.booking_tools import book_flight, book_hotel, search_hotels
+
+
+def _booking_plan(requirements: Optional[dict]) -> Optional[dict]:
+    """
+    Pull everything the bookings need out of the requirements.
+    Returns None when anything is missing or ambiguous, so the LLM booker can take over.
+    """
+    if not requirements:
+        return None
+    try:
+        reqs = CompleteRequirements(**requirements)
+    except ValidationError:
+        return None
+
+    top_option = reqs.flight_check.outbound_result.top_option
+    if (
+        top_option is None
+        or not top_option.flight_id
+        or not reqs.user_confirmations.accept_outbound_top_option
+    ):
+        return None
+
+    lead_name = reqs.traveler.lead_name
+    lead_email = reqs.traveler.lead_email
+    if not lead_name or not lead_email:
+        return None
+
+    # Without a return date there is no check-out date to book
+    if not reqs.trip.return_date:
+        return None
+    try:
+        nights = (
+            date.fromisoformat(reqs.trip.return_date)
+            - date.fromisoformat(reqs.trip.depart_date)
+        ).days
+    except ValueError:
+        return None
+    if nights < 1:
+        return None
+
+    hotels_amount = reqs.budget.hotels_amount
+    return {
+        "flight_id": top_option.flight_id,
+        "name": lead_name,
+        "email": lead_email,
+        "city": reqs.trip.destination.city,
+        "check_in": reqs.trip.depart_date,
+        "check_out": reqs.trip.return_date,
+        "stars": reqs.hotel_prefs.stars,
+        "amenities": reqs.hotel_prefs.amenities,
+        "max_price_per_night": hotels_amount / nights if hotels_amount > 0 else None,
+        "room_type": reqs.hotel_prefs.room_type or "Standard",
+    }
+
+
+def _confirmation(model, kind: str, fields: dict):
+    """
+    Build a booking confirmation from a booking response.
+    A successful response with a missing or null field counts as a failed
+    booking instead of raising after the booking was made.
+    """
+    try:
+        return model(**fields)
+    except ValidationError as e:
+        missing = ", ".join(str(err["loc"][0]) for err in e.errors())
+        print(
+            f"{kind} booking {fields.get('booking_id')} returned an incomplete "
+            f"confirmation (invalid: {missing})"
+        )
+        return None
+
+
+async def _book_flight(plan: dict) -> Optional[FlightBookingResult]:
+    result = await book_flight.ainvoke(
+        {
+            "flight_id": plan["flight_id"],
+            "passenger_name": plan["name"],
+            "passenger_email": plan["email"],
+        }
+    )
+    if not result.get("success"):
+        print(f"Flight booking failed: {result.get('error')}")
+        return None
+    return _confirmation(
+        FlightBookingResult,
+        "Flight",
+        {
+            "booking_id": result.get("booking_id"),
+            "status": result.get("status"),
+            "ticket_ref": result.get("booking_reference"),
+            "flight_id": plan["flight_id"],
+        },
+    )
+
+
+async def _search_and_book_hotel(plan: dict) -> Optional[HotelBookingResult]:
+    search = await search_hotels.ainvoke(
+        {
+            "city": plan["city"],
+            "check_in": plan["check_in"],
+            "check_out": plan["check_out"],
+            "stars": plan["stars"],
+            "max_price_per_night": plan["max_price_per_night"],
+            "amenities": plan["amenities"],
+            "top_k": 1,
+        }
+    )
+    if not search.get("available"):
+        print(f"No hotel in {plan['city']} matches the hotel preferences")
+        return None
+
+    hotel = search["hotels"][0]
+    result = await book_hotel.ainvoke(
+        {
+            "hotel_id": hotel["hotel_id"],
+            "guest_name": plan["name"],
+            "guest_email": plan["email"],
+            "check_in_date": plan["check_in"],
+            "check_out_date": plan["check_out"],
+            "room_type": plan["room_type"],
+        }
+    )
+    if not result.get("success"):
+        print(f"Hotel booking failed: {result.get('error')}")
+        return None
+    return _confirmation(
+        HotelBookingResult,
+        "Hotel",
+        {
+            "booking_id": result.get("booking_id"),
+            "status": result.get("status"),
+            "reservation_ref": result.get("booking_reference"),
+            "hotel_id": hotel["hotel_id"],
+            "total_price": result.get("total_price"),
+        },
+    )
+
+
+async def execute_bookings(requirements: Optional[dict]) -> Optional[Bookings]:
+    """
+    Book the confirmed outbound flight and the best ranked hotel without an LLM.
+    Both bookings run concurrently. Returns None, without booking anything, when
+    the requirements are too incomplete or ambiguous to book from directly.
+    """
+    plan = _booking_plan(requirements)
+    if plan is None:
+        return None
+
+    print(f"--- Booking flight {plan['flight_id']} and a hotel in {plan['city']} ---")
+    flight, hotel = await asyncio.gather(
+        _book_flight(plan), _search_and_book_hotel(plan)
+    )
+    return Bookings(flights=flight, hotels=hotel)
@@ -0,0 +1,133 @@
+# app/agents/context.py
+import json
+from typing import Any, Optional, Sequence
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from app.agents.handoff import compact_json
+from app.core.metrics import observe_tokens
+from app.core.tokens import count_tokens
+
+_MAX_LIST_ITEMS = 3
+_MAX_NOTE_CHARS = 600
+
+
+def _shrink(value: Any) -> Any:
+    """Keep the first few items of every list so a note stays small."""
+    if isinstance(value, dict):
+        return {key: _shrink(item) for key, item in value.items()}
+    if isinstance(value, list):
+        shrunk = [_shrink(item) for item in value[:_MAX_LIST_ITEMS]]
+        if len(value) > _MAX_LIST_ITEMS:
+            shrunk.append(f"+{len(value) - _MAX_LIST_ITEMS} more")
+        return shrunk
+    return value
+
+
+def summarize_tool_result(message: ToolMessage, args: Optional[dict] = None) -> str:
+    """One-line summary of a tool call and its result, e.g. for flight searches."""
+    try:
+        result = json.loads(message.content)
+    except (TypeError, ValueError):
+        result = message.content
+    note = f"{message.name}({compact_json(args or {})}) -> {compact_json(_shrink(result))}"
+    if len(note) > _MAX_NOTE_CHARS:
+        note = note[: _MAX_NOTE_CHARS - 1] + "…"
+    return note
+
+
+def tool_notes(messages: Sequence[BaseMessage], skip: Sequence[str] = ()) -> list[str]:
+    """Summaries of the tool results in an agent run, skipping tools named in `skip`."""
+    args_by_id = {
+        call["id"]: call["args"]
+        for message in messages
+        if isinstance(message, AIMessage)
+        for call in message.tool_calls
+    }
+    return [
+        summarize_tool_result(message, args_by_id.get(message.tool_call_id))
+        for message in messages
+        if isinstance(message, ToolMessage) and message.name not in skip
+    ]
+
+
+def window_messages(
+    messages: Sequence[BaseMessage], keep_turns: int
+) -> list[BaseMessage]:
+    """
+    The first user message (the original request) plus the last keep_turns
+    turns verbatim, where a turn starts at a user message.
+    """
+    human_indexes = [
+        i for i, message in enumerate(messages) if isinstance(message, HumanMessage)
+    ]
+    if len(human_indexes) <= keep_turns + 1:
+        return list(messages)
+    start = human_indexes[-keep_turns] if keep_turns > 0 else len(messages)
+    first = human_indexes[0]
+    return list(messages[first : first + 1]) + list(messages[start:])
+
+
+def build_agent_context(
+    messages: Sequence[BaseMessage],
+    keep_turns: int,
+    known_fields: Optional[dict] = None,
+    notes: Sequence[str] = (),
+) -> list[BaseMessage]:
+    """
+    Messages for an agent turn: a note carrying the fields gathered so far and
+    summaries of earlier tool results, then the windowed conversation.
+    """
+    context: list[BaseMessage] = []
+    sections = []
+    if known_fields:
+        sections.append(
+            "Requirements gathered so far (only output fields that are new or changed):\n"
+            + compact_json(known_fields)
+        )
+    if notes:
+        sections.append(
+            "Earlier tool results (no need to repeat these calls):\n"
+            + "\n".join(f"- {note}" for note in notes)
+        )
+    if sections:
+        context.append(SystemMessage(content="\n\n".join(sections)))
+    return context + window_messages(messages, keep_turns)
+
+
+def _text_tokens(messages: Sequence[BaseMessage]) -> int:
+    return sum(count_tokens(message.text) for message in messages)
+
+
+def observe_turn_tokens(
+    name: str,
+    context: Sequence[BaseMessage],
+    transcript: Sequence[BaseMessage],
+    response_messages: Sequence[BaseMessage],
+) -> None:
+    """
+    Record per-turn token metrics for agent `name`: the context it was sent,
+    the full transcript it would otherwise have been sent, and the LLM's
+    reported input/output usage where the provider returns it.
+    """
+    observe_tokens(f"{name} turn context", _text_tokens(context))
+    observe_tokens(f"{name} turn full transcript", _text_tokens(transcript))
+
+    usage = [
+        message.usage_metadata
+        for message in response_messages
+        if isinstance(message, AIMessage) and message.usage_metadata
+    ]
+    if usage:
+        observe_tokens(
+            f"{name} turn llm input", sum(u.get("input_tokens", 0) for u in usage)
+        )
+        observe_tokens(
+            f"{name} turn llm output", sum(u.get("output_tokens", 0) for u in usage)
+        )
@@ -0,0 +1,113 @@
+# app/agents/handoff.py
+import json
+from typing import Any, Callable, Optional
+
+from app.core.metrics import observe_tokens
+from app.core.tokens import count_tokens
+
+
+def prune(value: Any) -> Any:
+    """Recursively drop None, empty strings and empty lists/dicts."""
+    if isinstance(value, dict):
+        pruned = {key: prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if not _is_empty(item)}
+    if isinstance(value, list):
+        pruned = [prune(item) for item in value]
+        return [item for item in pruned if not _is_empty(item)]
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def compact_json(value: Any) -> str:
+    """Minified JSON without nulls or empty containers."""
+    return json.dumps(prune(value), separators=(",", ":"), ensure_ascii=False)
+
+
+def _get(data: Optional[dict], *path: str) -> Any:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _travelers(reqs: dict) -> dict:
+    traveler = reqs.get("traveler") or {}
+    travelers = {"adults": traveler.get("adults")}
+    # Zero children is the default; leave it out
+    if traveler.get("children"):
+        travelers["children"] = traveler["children"]
+    return travelers
+
+
+def planner_view(reqs: dict) -> dict:
+    """What the itinerary planner needs: where, when, who, and what they like."""
+    return {
+        "destination": _get(reqs, "trip", "destination", "city"),
+        "origin": _get(reqs, "trip", "origin", "city"),
+        "depart_date": _get(reqs, "trip", "depart_date"),
+        "return_date": _get(reqs, "trip", "return_date"),
+        "travelers": _travelers(reqs),
+        "interests": _get(reqs, "preferences", "interests"),
+        "budget": {
+            "currency": _get(reqs, "budget", "total_currency"),
+            "total": _get(reqs, "budget", "total_amount"),
+        },
+        "hotel_area": _get(reqs, "hotel_prefs", "area"),
+    }
+
+
+def booker_view(reqs: dict) -> dict:
+    """What the booker needs: the confirmed flight, the lead traveler and the stay."""
+    top_option = _get(reqs, "flight_check", "outbound_result", "top_option") or {}
+    return {
+        "confirmed_flight": {
+            "flight_id": top_option.get("flight_id"),
+            "carrier": top_option.get("carrier"),
+            "flight_number": top_option.get("flight_number"),
+            "depart_iso": top_option.get("depart_iso"),
+        }
+        if _get(reqs, "user_confirmations", "accept_outbound_top_option")
+        else None,
+        "lead_traveler": {
+            "name": _get(reqs, "traveler", "lead_name"),
+            "email": _get(reqs, "traveler", "lead_email"),
+        },
+        "travelers": _travelers(reqs),
+        "hotel": {
+            "city": _get(reqs, "trip", "destination", "city"),
+            "check_in": _get(reqs, "trip", "depart_date"),
+            "check_out": _get(reqs, "trip", "return_date"),
+            "stars": _get(reqs, "hotel_prefs", "stars"),
+            "area": _get(reqs, "hotel_prefs", "area"),
+            "room_type": _get(reqs, "hotel_prefs", "room_type"),
+            "amenities": _get(reqs, "hotel_prefs", "amenities"),
+            "budget_total": _get(reqs, "budget", "hotels_amount"),
+            "currency": _get(reqs, "budget", "total_currency"),
+        },
+    }
+
+
+def summary_view(reqs: dict) -> dict:
+    """Everything the user confirmed, without the bookkeeping fields."""
+    return {key: value for key, value in reqs.items() if key != "missing_info"}
+
+
+_VIEWS: dict[str, Callable[[dict], dict]] = {
+    "planner": planner_view,
+    "booker": booker_view,
+    "requirements": summary_view,
+}
+
+
+def serialize_requirements(requirements: Optional[dict], stage: str) -> str:
+    """
+    Compact JSON of the requirements projected down to what `stage` uses.
+    Records its token count under "handoff <stage>" in the token metrics.
+    """
+    text = compact_json(_VIEWS[stage](requirements or {}))
+    observe_tokens(f"handoff {stage}", count_tokens(text))
+    return text
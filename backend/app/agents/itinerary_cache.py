@@ -0,0 +1,242 @@
+# app/agents/itinerary_cache.py
+import asyncio
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+
+from pydantic import ValidationError
+
+from app.agents.response_models.planner_agent import DayItinerary, Itinerary
+from app.config import settings
+from app.core.cache import SqliteStore
+
+
+# Indexed by month % 12 // 3, so December to February is winter
+_SEASONS = ("winter", "spring", "summer", "autumn")
+
+
+class ItineraryKey(NamedTuple):
+    """What makes two trips' itineraries interchangeable."""
+
+    destination: str
+    days: int
+    interests: str
+    season: str
+
+
+@dataclass
+class TripDates:
+    city: str
+    start: date
+    days: int
+
+
+def trip_dates(requirements: Optional[dict]) -> Optional[TripDates]:
+    """Destination city, first day and length of a round trip, or None."""
+    trip = (requirements or {}).get("trip") or {}
+    city = (trip.get("destination") or {}).get("city")
+    try:
+        start = date.fromisoformat(trip["depart_date"])
+        end = date.fromisoformat(trip["return_date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not city or end < start:
+        return None
+    return TripDates(city=city, start=start, days=(end - start).days + 1)
+
+
+def itinerary_key(requirements: Optional[dict]) -> Optional[ItineraryKey]:
+    """
+    Normalized cache key: destination city, trip length in days, sorted
+    interests and (northern hemisphere) season of the departure month.
+    """
+    dates = trip_dates(requirements)
+    if dates is None:
+        return None
+    interests = ((requirements.get("preferences") or {}).get("interests")) or []
+    interests = sorted({i.strip().casefold() for i in interests if i.strip()})
+    return ItineraryKey(
+        destination=" ".join(dates.city.casefold().split()),
+        days=dates.days,
+        interests=",".join(interests),
+        season=_SEASONS[dates.start.month % 12 // 3],
+    )
+
+
+def redate(days: list[dict], city: str, start: date) -> list[dict]:
+    """Cached days moved onto the user's dates, validated against DayItinerary."""
+    return [
+        DayItinerary.model_validate(
+            {**day, "date": (start + timedelta(days=i)).isoformat(), "city": city}
+        ).model_dump()
+        for i, day in enumerate(days)
+    ]
+
+
+def append_days(
+    cached: list[dict], generated: list[dict], requirements: Optional[dict]
+) -> list[dict]:
+    """Cached days followed by newly planned ones, dated to follow on from them."""
+    dates = trip_dates(requirements)
+    missing = dates.days - len(cached)
+    start = dates.start + timedelta(days=len(cached))
+    return cached + redate(generated[:missing], dates.city, start)
+
+
+class CacheLookup(NamedTuple):
+    """Cached days re-dated to the trip; `missing` more days still need planning."""
+
+    days: list[dict]
+    missing: int
+
+
+class ItineraryCache(SqliteStore):
+    """
+    SQLite-backed store of generated itineraries keyed by ItineraryKey, with
+    the TTL and LRU eviction of SqliteStore. A lookup with no exact match
+    falls back to the longest cached itinerary for the same destination,
+    interests and season, so a 7-day trip can reuse a cached 5-day one and
+    only plan the last 2 days.
+    """
+
+    table = "itineraries"
+    schema = """
+        destination TEXT NOT NULL,
+        days INTEGER NOT NULL,
+        interests TEXT NOT NULL,
+        season TEXT NOT NULL,
+        itinerary TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        used_at REAL NOT NULL,
+        PRIMARY KEY (destination, interests, season, days)
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        super().__init__(path, max_entries, ttl_seconds)
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key: ItineraryKey) -> Optional[tuple[int, list[dict]]]:
+        """(cached length, cached days) of the best entry for key, or None."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            self._expire(conn, now)
+            # Exact length first, then the longest cached trip
+            row = conn.execute(
+                """
+                SELECT days, itinerary FROM itineraries
+                WHERE destination = ? AND interests = ? AND season = ?
+                ORDER BY days = ? DESC, days DESC LIMIT 1
+                """,
+                (key.destination, key.interests, key.season, key.days),
+            ).fetchone()
+            if row is None:
+                conn.commit()
+                return None
+            conn.execute(
+                "UPDATE itineraries SET used_at = ? WHERE destination = ? "
+                "AND interests = ? AND season = ? AND days = ?",
+                (now, key.destination, key.interests, key.season, row[0]),
+            )
+            conn.commit()
+        return row[0], json.loads(row[1])
+
+    def put(self, key: ItineraryKey, days: list[dict]) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO itineraries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key.destination,
+                    key.days,
+                    key.interests,
+                    key.season,
+                    json.dumps(days),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def invalidate(self, key: ItineraryKey, days: int) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM itineraries WHERE destination = ? AND interests = ? "
+                "AND season = ? AND days = ?",
+                (key.destination, key.interests, key.season, days),
+            )
+            conn.commit()
+
+    async def lookup(self, requirements: Optional[dict]) -> Optional[CacheLookup]:
+        """
+        Cached days for the trip, re-dated to its dates, plus how many days
+        are still missing. None on a miss (or an entry that no longer validates).
+        """
+        key = itinerary_key(requirements)
+        if not self.enabled or key is None:
+            return None
+        try:
+            found = await asyncio.to_thread(self.get, key)
+        except sqlite3.Error as e:
+            print(f"Itinerary cache unavailable: {e}")
+            return None
+        if found is None:
+            self.misses += 1
+            return None
+
+        cached_days, days = found
+        dates = trip_dates(requirements)
+        try:
+            redated = redate(days[: dates.days], dates.city, dates.start)
+        except ValidationError:
+            await asyncio.to_thread(self.invalidate, key, cached_days)
+            self.misses += 1
+            return None
+        missing = dates.days - len(redated)
+        if missing:
+            self.partial_hits += 1
+        else:
+            self.hits += 1
+        return CacheLookup(days=redated, missing=missing)
+
+    async def store(self, requirements: Optional[dict], itinerary: dict) -> None:
+        """Cache a generated itinerary that covers the whole trip."""
+        key = itinerary_key(requirements)
+        if not self.enabled or key is None:
+            return
+        days = Itinerary.model_validate(itinerary).model_dump()["days"]
+        if len(days) != key.days:
+            return
+        try:
+            await asyncio.to_thread(self.put, key, days)
+        except sqlite3.Error as e:
+            print(f"Could not cache itinerary: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "max_entries": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+itinerary_cache = ItineraryCache(
+    settings.ITINERARY_CACHE_PATH,
+    max_entries=settings.ITINERARY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ITINERARY_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,172 @@
+# app/agents/model_routing.py
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain.agents.structured_output import ToolStrategy
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.config import settings
+from app.core import llm
+from app.core.metrics import observe_latency
+from app.core.tokens import count_tokens
+
+# More tool rounds than this since the user's message makes a turn complex
+_MAX_SMALL_TOOL_ROUNDS = 3
+# Ending of the message ToolStrategy sends back when structured output is invalid
+_RETRY_SUFFIX = "Please fix your mistakes."
+
+
+def _tool_name(tool: Any) -> Optional[str]:
+    if isinstance(tool, dict):
+        return tool.get("name") or tool.get("function", {}).get("name")
+    return getattr(tool, "name", None)
+
+
+def _current_turn(request: ModelRequest) -> list:
+    """The messages since the user's latest message."""
+    for i in range(len(request.messages) - 1, -1, -1):
+        if isinstance(request.messages[i], HumanMessage):
+            return request.messages[i + 1 :]
+    return request.messages
+
+
+def complexity(request: ModelRequest, max_small_tokens: int) -> Optional[str]:
+    """Why the turn should skip the small model, or None if it is simple."""
+    turn = _current_turn(request)
+    if any(
+        isinstance(m, ToolMessage) and m.text.rstrip().endswith(_RETRY_SUFFIX)
+        for m in turn
+    ):
+        return "retrying invalid structured output"
+    if sum(isinstance(m, AIMessage) and bool(m.tool_calls) for m in turn) > _MAX_SMALL_TOOL_ROUNDS:
+        return "many tool rounds"
+    system = request.system_message.text if request.system_message else ""
+    prompt = "\n".join([system, *(m.text for m in request.messages)])
+    if count_tokens(prompt) > max_small_tokens:
+        return "long prompt"
+    return None
+
+
+def failure(request: ModelRequest, response: ModelResponse) -> Optional[str]:
+    """Why the small model's response can't be used, or None if it is fine."""
+    message = next((m for m in response.result if isinstance(m, AIMessage)), None)
+    if message is None:
+        return "no response"
+    if message.invalid_tool_calls:
+        return "malformed tool call"
+    structured = set()
+    if isinstance(request.response_format, ToolStrategy):
+        structured = {spec.name for spec in request.response_format.schema_specs}
+    known = structured | {_tool_name(tool) for tool in request.tools}
+    unknown = [call["name"] for call in message.tool_calls if call["name"] not in known]
+    if unknown:
+        return f"unknown tool {unknown[0]}"
+    if (
+        any(call["name"] in structured for call in message.tool_calls)
+        and response.structured_response is None
+    ):
+        return "invalid structured output"
+    if not message.tool_calls and not message.text.strip():
+        return "empty response"
+    return None
+
+
+class ModelRouter(AgentMiddleware):
+    """
+    Sends each model call of an agent to the small model first, and to the
+    large one when the turn is complex (see `complexity`) or the small
+    model's answer fails validation (see `failure`). The failed answer is
+    dropped, so the agent never sees it.
+
+    Every routed call is timed as "route <agent> small|large|escalated";
+    escalated times include the discarded small-model attempt.
+    """
+
+    def __init__(
+        self,
+        agent: str,
+        small: BaseChatModel,
+        large: BaseChatModel,
+        max_small_tokens: int,
+    ):
+        super().__init__()
+        self.agent = agent
+        self.small = small
+        self.large = large
+        self.max_small_tokens = max_small_tokens
+
+    def _record(self, route: str, start: float, reason: Optional[str] = None) -> None:
+        extra = {"reason": reason} if reason else {}
+        observe_latency(f"route {self.agent} {route}", time.perf_counter() - start, **extra)
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        reason = complexity(request, self.max_small_tokens)
+        if reason is None:
+            try:
+                response = handler(request.override(model=self.small))
+                reason = failure(request, response)
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+            if reason is None:
+                self._record("small", start)
+                return response
+            print(f"Escalating {self.agent} to the large model: {reason}")
+            route = "escalated"
+        else:
+            route = "large"
+        response = handler(request.override(model=self.large))
+        self._record(route, start, reason)
+        return response
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        reason = complexity(request, self.max_small_tokens)
+        if reason is None:
+            try:
+                response = await handler(request.override(model=self.small))
+                reason = failure(request, response)
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+            if reason is None:
+                self._record("small", start)
+                return response
+            print(f"Escalating {self.agent} to the large model: {reason}")
+            route = "escalated"
+        else:
+            route = "large"
+        response = await handler(request.override(model=self.large))
+        self._record(route, start, reason)
+        return response
+
+
+def agent_model(
+    agent: str, choice: str
+) -> tuple[BaseChatModel, list[AgentMiddleware]]:
+    """
+    The model and middleware for an agent configured as "small", "large",
+    "auto" (routed, see `ModelRouter`) or a model name.
+    """
+    if choice == "small":
+        return llm.get_small_model(), []
+    if choice == "large":
+        return llm.get_model(), []
+    if choice == "auto":
+        router = ModelRouter(
+            agent,
+            small=llm.get_small_model(),
+            large=llm.get_model(),
+            max_small_tokens=settings.MODEL_ROUTER_MAX_SMALL_TOKENS,
+        )
+        return llm.get_model(), [router]
+    return llm.chat_model(choice), []
@@ -0,0 +1,108 @@
+# app/agents/query_planning.py
+import re
+from typing import Optional
+
+from app.agents.response_models.planning_agent import PlanningAgentResponseModel
+
+
+# A capitalized place name, optionally followed by an IATA code: "Seoul(ICN)", "New York (JFK)"
+_PLACE = r"([A-Z][\w'.-]*(?:\s+[A-Z][\w'.-]*){0,2})\s*(?:\(([A-Z]{3})\))?"
+_DESTINATION = re.compile(rf"\b(?:to|visit|visiting|in|explore|exploring)\s+{_PLACE}")
+_ORIGIN = re.compile(rf"\bfrom\s+{_PLACE}")
+# Another place right after a destination means a multi-city trip
+_ANOTHER_PLACE = re.compile(r"\s*(?:(?:,|&|\band\b|\bthen\b|\bplus\b)\s*)+(?!I\b)[A-Z]")
+
+_NOT_PLACES = set(
+    """
+    i my we our the a an me
+    january february march april may june july august september october november december
+    monday tuesday wednesday thursday friday saturday sunday
+    spring summer autumn fall winter christmas easter
+    """.split()
+)
+_MULTI_PART_HINTS = (
+    "multi-city",
+    "multi city",
+    "multiple cities",
+    "several cities",
+    "road trip",
+    "countries",
+    "tour of",
+    "island hopping",
+    "stopover",
+    "or maybe",
+    "either",
+)
+_MAX_SIMPLE_WORDS = 60
+
+
+def _places(pattern: re.Pattern, query: str) -> list[tuple[str, Optional[str], int]]:
+    """Return (name, iata_code, end_offset) for each place the pattern finds."""
+    places = []
+    for match in pattern.finditer(query):
+        name, code = match.group(1), match.group(2)
+        if name.split()[0].casefold() in _NOT_PLACES:
+            continue
+        places.append((name, code, match.end()))
+    return places
+
+
+def _label(name: str, code: Optional[str]) -> str:
+    return f"{name} ({code})" if code else name
+
+
+def heuristic_plan(query: str) -> Optional[PlanningAgentResponseModel]:
+    """
+    Build a plan without an LLM for a simple single-destination query.
+    Returns None when the query looks multi-part, so callers can fall back to the planning agent.
+    """
+    lowered = query.casefold()
+    if len(query.split()) > _MAX_SIMPLE_WORDS or any(
+        hint in lowered for hint in _MULTI_PART_HINTS
+    ):
+        return None
+
+    origins = _places(_ORIGIN, query)
+    origin_names = {name for name, _, _ in origins}
+    destinations = [
+        place for place in _places(_DESTINATION, query) if place[0] not in origin_names
+    ]
+    if len({name for name, _, _ in destinations}) != 1:
+        return None
+
+    name, code, end = destinations[0]
+    if _ANOTHER_PLACE.match(query, end):
+        return None
+
+    destination = _label(name, code)
+    route = destination
+    sub_queries = [
+        f"{destination} – travel dates & trip length",
+        f"{destination} – attractions & activities matching the traveler's interests",
+        f"{destination} – hotels within budget",
+    ]
+    if origins:
+        origin = _label(origins[0][0], origins[0][1])
+        route = f"{origin} → {destination}"
+        sub_queries.insert(1, f"{route} – flight options")
+
+    plan = (
+        f"Single-destination trip: {route}. Confirm dates, travelers and budget, "
+        f"check flight availability, then plan activities and a hotel in {name}."
+    )
+    return PlanningAgentResponseModel(plan=plan, sub_queries=sub_queries)
+
+
+def generic_plan(query: str) -> PlanningAgentResponseModel:
+    """Template plan used by the heuristic mode when the query isn't single-destination."""
+    return PlanningAgentResponseModel(
+        plan=(
+            "Analyze user query, identify destinations, dates, preferences, and create "
+            "focused sub-queries to guide requirements gathering and itinerary planning."
+        ),
+        sub_queries=[
+            f"{query} – destinations & regions",
+            f"{query} – dates & duration",
+            f"{query} – activities & interests",
+        ],
+    )
@@ -0,0 +1,324 @@
+# app/agents/reply_extraction.py
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+from app.core.reference_data import ReferenceData
+
+
+_ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+# "15 November 2025", "15th Nov, 2025"
+_DAY_MONTH_YEAR = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,9})\.?,?\s+(\d{4})\b"
+)
+# "November 15, 2025", "Nov 15th 2025"
+_MONTH_DAY_YEAR = re.compile(
+    r"\b([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b"
+)
+_COUNT = re.compile(r"\b(\d{1,2})\s*(adults?|grown-?ups?|children|child|kids?)\b", re.I)
+_SOLO = re.compile(r"\b(?:just me|only me|myself|solo|on my own)\b", re.I)
+_AMOUNT = re.compile(
+    r"(?:(?P<symbol>[$€£¥])\s?(?P<amount>\d[\d,]*(?:\.\d+)?)(?P<k>k\b)?"
+    r"|\b(?P<amount2>\d[\d,]*(?:\.\d+)?)(?P<k2>k\b)?\s*"
+    r"(?P<code>USD|EUR|GBP|JPY|KRW|AUD|CAD|SGD|LKR|INR|dollars|euros|pounds)\b)"
+    r"(?P<purpose>\s+(?:total|overall|in total|for (?:the )?(?:flights?|hotels?|stays?)"
+    r"|on (?:the )?(?:flights?|hotels?|stays?)))?",
+    re.I,
+)
+_CABIN = re.compile(r"\b(premium economy|economy|premium|business)\b(?:\s+class)?", re.I)
+_IATA = re.compile(r"\b([A-Z]{3})\b")
+_YES = re.compile(
+    r"^\W*(?:yes|yep|yeah|sure|ok|okay|confirm(?:ed)?|sounds good|that works|"
+    r"works for me|perfect|great|go ahead|book it|let'?s do it)\b",
+    re.I,
+)
+_NO = re.compile(r"^\W*(?:no|nope|not really)\b", re.I)
+_ASKS_ORIGIN = re.compile(r"\b(?:from|origin|depart\w*|leaving)\b", re.I)
+_ASKS_DESTINATION = re.compile(r"\b(?:to|destination|going|visit\w*|headed)\b", re.I)
+_ASKS_RETURN = re.compile(r"\b(?:return\w*|back|home)\b", re.I)
+_ASKS_DEPART = re.compile(r"\b(?:depart\w*|leav\w*|outbound)\b", re.I)
+# Which budget field a question asks about, for an amount without a purpose
+_ASKS_BUDGET = {
+    "flights_amount": re.compile(r"\b(?:flights?|airfares?)\b", re.I),
+    "hotels_amount": re.compile(r"\b(?:hotels?|stays?|accommodation)\b", re.I),
+    "total_amount": re.compile(r"\b(?:total|overall|whole|entire|altogether)\b", re.I),
+}
+# A word right before an airport code that says which end of the trip it is
+_PLACE_CUE = re.compile(r"\b(?:(from|leaving|departing)|(to))\s+$", re.I)
+
+_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+_CURRENCY_WORDS = {"dollars": "USD", "euros": "EUR", "pounds": "GBP"}
+_CABINS = {"premium economy": "premium"}
+# Confirmation questions about something other than the flight itself
+_NOT_FLIGHT_CONFIRMATION = re.compile(r"non-?stop|direct|layover|hotel|budget", re.I)
+
+# Words that carry no requirement on their own; a reply is fully understood
+# when nothing else is left after the extracted values are removed
+_FILLER = set(
+    """
+    a an and the i we me my our us it is are am be that this those these just
+    only about around roughly approximately maybe please thanks thank you
+    of for in on to with at by from total overall budget class cabin
+    travelling traveling travellers travelers people person flying fly
+    depart departing departure leave leaving return returning back date dates
+    fine good great perfect works work sounds ok okay yes yep yeah sure
+    would like prefer want will do let's lets go ahead book
+    """.split()
+)
+_WORD = re.compile(r"[\w'-]+")
+
+
+@dataclass
+class ReplyExtraction:
+    """Requirement fields parsed from a user reply, by section."""
+
+    update: dict = field(default_factory=dict)
+    # True when every word of the reply was accounted for
+    understood: bool = True
+
+    def set(self, section: str, name: str, value) -> None:
+        self.update.setdefault(section, {})[name] = value
+
+
+def _parse_date(day: str, month: str, year: str) -> Optional[date]:
+    for fmt in ("%d %B %Y", "%d %b %Y"):
+        try:
+            return datetime.strptime(f"{day} {month} {year}", fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _dates(text: str) -> tuple[list[date], str]:
+    """Dates in the reply, in order, and the text with them removed."""
+    found = []
+
+    def take(match: re.Match, parsed: Optional[date]) -> str:
+        if parsed is None:
+            return match.group(0)
+        found.append((match.start(), parsed))
+        return " "
+
+    def iso(match: re.Match) -> str:
+        try:
+            parsed = date.fromisoformat(match.group(1))
+        except ValueError:
+            parsed = None
+        return take(match, parsed)
+
+    text = _ISO_DATE.sub(iso, text)
+    text = _DAY_MONTH_YEAR.sub(
+        lambda m: take(m, _parse_date(m.group(1), m.group(2), m.group(3))), text
+    )
+    text = _MONTH_DAY_YEAR.sub(
+        lambda m: take(m, _parse_date(m.group(2), m.group(1), m.group(3))), text
+    )
+    return [parsed for _, parsed in sorted(found)], text
+
+
+def _amount(match: re.Match) -> float:
+    amount = float((match.group("amount") or match.group("amount2")).replace(",", ""))
+    if match.group("k") or match.group("k2"):
+        amount *= 1000
+    return amount
+
+
+def _currency(match: re.Match) -> str:
+    if match.group("symbol"):
+        return _SYMBOLS[match.group("symbol")]
+    code = match.group("code")
+    return _CURRENCY_WORDS.get(code.casefold(), code.upper())
+
+
+def _budget_field(question: str) -> Optional[str]:
+    """
+    The budget field a bare amount answers: the one the question asks about,
+    the total when it names none, or None when it asks about several.
+    """
+    asked = [name for name, pattern in _ASKS_BUDGET.items() if pattern.search(question)]
+    if not asked:
+        return "total_amount"
+    return asked[0] if len(asked) == 1 else None
+
+
+def _place_for_airport(question: str, partial: dict) -> Optional[str]:
+    """Whether a single airport code answers the origin or the destination question."""
+    asks_origin = bool(_ASKS_ORIGIN.search(question))
+    asks_destination = bool(_ASKS_DESTINATION.search(question))
+    if asks_origin != asks_destination:
+        return "origin" if asks_origin else "destination"
+    trip = partial.get("trip") or {}
+    missing = [place for place in ("origin", "destination") if not trip.get(place)]
+    return missing[0] if len(missing) == 1 else None
+
+
+def _cued_place(text_before: str) -> Optional[str]:
+    """The place a "from"/"to" right before an airport code points to, if any."""
+    match = _PLACE_CUE.search(text_before)
+    if match is None:
+        return None
+    return "origin" if match.group(1) else "destination"
+
+
+def _airport_places(
+    cues: list[Optional[str]], question: str, partial: dict
+) -> Optional[list[str]]:
+    """
+    Origin or destination for each airport code, from its cue, else in
+    trip order for two codes or from the question for one. None when that
+    is ambiguous.
+    """
+    if len(cues) > 2:
+        return None
+    cued = [cue for cue in cues if cue]
+    if len(set(cued)) != len(cued):
+        return None
+    if len(cues) == 1 and not cued:
+        place = _place_for_airport(question, partial)
+        return [place] if place else None
+    remaining = iter(place for place in ("origin", "destination") if place not in cued)
+    return [cue or next(remaining) for cue in cues]
+
+
+def extract_reply(
+    reply: str, question: str, partial: dict, reference: ReferenceData
+) -> ReplyExtraction:
+    """
+    Parse a short reply to a requirements question into partial requirement
+    fields: dates, traveler counts, budget amounts, cabin class, IATA codes
+    known to the reference data, and a yes/no to the flight confirmation.
+    `understood` is False when anything in the reply is left unparsed, so the
+    caller can hand the turn to the requirements agent instead.
+    """
+    result = ReplyExtraction()
+    trip = partial.get("trip") or {}
+
+    dates, text = _dates(reply)
+    if len(dates) == 2:
+        result.set("trip", "depart_date", dates[0].isoformat())
+        result.set("trip", "return_date", dates[1].isoformat())
+    elif len(dates) == 1:
+        asks_return = bool(_ASKS_RETURN.search(question))
+        if asks_return and (
+            # Whether there is a return at all is for the agent to settle
+            trip.get("type") != "round_trip"
+            # Asked for both dates, one date could be either
+            or _ASKS_DEPART.search(question)
+        ):
+            result.understood = False
+        else:
+            result.set(
+                "trip",
+                "return_date" if asks_return else "depart_date",
+                dates[0].isoformat(),
+            )
+    elif dates:
+        result.understood = False
+
+    def count(match: re.Match) -> str:
+        adults = match.group(2).casefold().startswith(("adult", "grown"))
+        kind = "adults" if adults else "children"
+        result.set("traveler", kind, int(match.group(1)))
+        return " "
+
+    text = _COUNT.sub(count, text)
+    if _SOLO.search(text):
+        text = _SOLO.sub(" ", text)
+        result.set("traveler", "adults", 1)
+        result.set("traveler", "children", 0)
+    traveler = result.update.get("traveler", {})
+    if "adults" in traveler and "children" not in traveler:
+        if (partial.get("traveler") or {}).get("children") is None:
+            result.set("traveler", "children", 0)
+
+    bare_amounts = []
+
+    def amount(match: re.Match) -> str:
+        purpose = (match.group("purpose") or "").casefold()
+        if "flight" in purpose:
+            name = "flights_amount"
+        elif "hotel" in purpose or "stay" in purpose:
+            name = "hotels_amount"
+        elif purpose:
+            name = "total_amount"
+        else:
+            bare_amounts.append(match)
+            return " "
+        result.set("budget", name, _amount(match))
+        result.set("budget", "total_currency", _currency(match))
+        return " "
+
+    text = _AMOUNT.sub(amount, text)
+    if bare_amounts:
+        name = _budget_field(question)
+        if name is None or len(bare_amounts) > 1:
+            result.understood = False
+        else:
+            result.set("budget", name, _amount(bare_amounts[0]))
+            result.set("budget", "total_currency", _currency(bare_amounts[0]))
+    budget = {**(partial.get("budget") or {}), **result.update.get("budget", {})}
+    if (
+        "total_amount" not in budget
+        and "flights_amount" in budget
+        and "hotels_amount" in budget
+    ):
+        result.set(
+            "budget", "total_amount", budget["flights_amount"] + budget["hotels_amount"]
+        )
+
+    def cabin(match: re.Match) -> str:
+        value = match.group(1).casefold()
+        result.set("preferences", "cabin_class", _CABINS.get(value, value))
+        return " "
+
+    text = _CABIN.sub(cabin, text)
+
+    codes = []
+    cues = []
+
+    def airport(match: re.Match) -> str:
+        if not reference.knows_airport(match.group(1)):
+            return match.group(0)
+        codes.append(match.group(1))
+        cues.append(_cued_place(match.string[: match.start()]))
+        return " "
+
+    text = _IATA.sub(airport, text)
+    if codes:
+        places = _airport_places(cues, question, partial)
+        if places is None:
+            result.understood = False
+            places = []
+        for place, code in zip(places, codes):
+            city = reference.cities_by_code.get(code)
+            result.set(
+                "trip", place, {"city": city.name if city else code, "airport_iata": code}
+            )
+
+    top_option = (
+        ((partial.get("flight_check") or {}).get("outbound_result") or {}).get(
+            "top_option"
+        )
+    )
+    confirmed = (partial.get("user_confirmations") or {}).get(
+        "accept_outbound_top_option"
+    )
+    asks_confirmation = (
+        top_option
+        and confirmed is not True
+        and not _NOT_FLIGHT_CONFIRMATION.search(question)
+        and re.search(r"flight|option|work for you|proceed", question, re.I)
+    )
+    if asks_confirmation and _YES.match(reply):
+        result.set("user_confirmations", "accept_outbound_top_option", True)
+    elif asks_confirmation and _NO.match(reply):
+        # Turning the flight down needs the agent to look for alternatives
+        result.understood = False
+
+    leftover = [
+        word for word in _WORD.findall(text.casefold()) if word not in _FILLER
+    ]
+    if leftover:
+        result.understood = False
+    return result
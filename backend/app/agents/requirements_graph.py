@@ -1,43 +1,102 @@
-import json
+import asyncio
+from functools import lru_cache
 from typing import Optional
 
 from langchain.messages import HumanMessage, AIMessage
 from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.types import interrupt, Command
-from langgraph.checkpoint.memory import InMemorySaver
-
-from app.agents.travel_system_agents import requirements_agent
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import set_config_context
+
+from app.agents.context import build_agent_context, observe_turn_tokens, tool_notes
+from app.agents.reply_extraction import extract_reply
+from app.agents.requirements_state import (
+    complete_requirements,
+    fallback_question,
+    merge_update,
+    missing_fields,
+    needs_agent,
+)
+from app.agents.response_models.requirements_agent import (
+    RequirementsUpdateResponseModel,
+)
+from app.agents.travel_system_agents import get_requirements_agent
+from app.config import settings
+from app.core.checkpointer import get_checkpointer
+from app.core.convex import convex_client
+from app.core.reference_data import reference_store
 
 
-checkpointer = InMemorySaver()
+def interrupt_in_context(value, config: RunnableConfig):
+    """
+    Call `interrupt()` with an explicit config.
+    LangGraph only exposes the node config through a contextvar for async nodes
+    on Python 3.11+, so async callers on 3.10 would otherwise fail to interrupt.
+    """
+    with set_config_context(config) as context:
+        return context.run(interrupt, value)
 
 
 class RequirementsGraphState(MessagesState):
     requirements_complete: bool
     interruption_message: str
     requirements: Optional[dict]
+    # Fields gathered so far; each agent turn only adds what is new or changed
+    partial_requirements: Optional[dict]
+    # Compact summaries of earlier tool results
+    tool_notes: Optional[list]
+    # Set by extract_reply when the user's answer needs the agent
+    needs_agent: bool
+
+
+async def requirements_agent_node(
+    state: RequirementsGraphState, config: RunnableConfig
+) -> RequirementsGraphState:
+    # Send a window of recent turns plus the structured notes, not the whole transcript
+    context = build_agent_context(
+        state["messages"],
+        keep_turns=settings.REQUIREMENTS_WINDOW_TURNS,
+        known_fields=state.get("partial_requirements"),
+        notes=state.get("tool_notes") or [],
+    )
+    response = await get_requirements_agent().ainvoke({"messages": context}, config)
 
-
-def requirements_agent_node(state: RequirementsGraphState) -> RequirementsGraphState:
-    response = requirements_agent.invoke({"messages": state["messages"]})
+    messages = response.get("messages", []) if isinstance(response, dict) else []
+    new_messages = messages[len(context) :]
+    observe_turn_tokens("requirements", context, state["messages"], new_messages)
+    notes = (
+        (state.get("tool_notes") or [])
+        + tool_notes(new_messages, skip=[RequirementsUpdateResponseModel.__name__])
+    )[-settings.REQUIREMENTS_MAX_TOOL_NOTES :]
 
     # Handle both structured_response key and direct response
     if isinstance(response, dict) and "structured_response" in response:
-        requirements_response = response["structured_response"].requirements
-    elif hasattr(response, "requirements"):
-        requirements_response = response.requirements
+        update = response["structured_response"]
     else:
-        # Fallback: treat response as the requirements object itself
-        requirements_response = response
+        # Fallback: treat response as the update itself
+        update = response
 
-    if requirements_response.missing_info.question != "":
+    partial = merge_update(state.get("partial_requirements"), update)
+    return {
+        "tool_notes": notes,
+        **_next_step(partial, update.question),
+    }
+
+
+def _next_step(partial: dict, question: str = "") -> dict:
+    """
+    State update for a merged partial requirements object. Completeness is
+    decided from the schema, but never while the agent is asking a question.
+    """
+    missing = missing_fields(partial)
+    if missing or question:
+        question = question or fallback_question(missing)
         return {
-            "messages": [
-                AIMessage(content=requirements_response.missing_info.question)
-            ],
-            "interruption_message": requirements_response.missing_info.question,
+            "messages": [AIMessage(content=question)],
+            "interruption_message": question,
             "requirements_complete": False,
             "requirements": None,
+            "partial_requirements": partial,
         }
 
     # Store complete requirements as dict in state
@@ -45,16 +104,63 @@ def requirements_agent_node(state: RequirementsGraphState) -> RequirementsGraphS
         "messages": [],
         "requirements_complete": True,
         "interruption_message": "",
-        "requirements": requirements_response.model_dump(),
+        "requirements": complete_requirements(partial),
+        # A follow-up message starts over, so stale answers can't complete it
+        "partial_requirements": None,
+        "tool_notes": None,
     }
 
 
+async def extract_reply_node(
+    state: RequirementsGraphState, config: RunnableConfig
+) -> RequirementsGraphState:
+    """
+    Rule-based fast path for the user's answer to a question. Simple replies
+    ("2 adults", "$3000 total", "yes") are merged straight into the partial
+    requirements; the agent only runs when part of the reply is not
+    understood, a new flight search is needed, or the next question needs it.
+    """
+    partial = state.get("partial_requirements")
+    messages = state["messages"]
+    if (
+        settings.REQUIREMENTS_EXTRACTION_MODE == "llm"
+        or not partial
+        or len(messages) < 2
+        or not isinstance(messages[-1], HumanMessage)
+    ):
+        return {"needs_agent": True}
+
+    question, reply = messages[-2].text, messages[-1].text
+    extraction = extract_reply(reply, question, partial, await reference_store.get())
+    if not extraction.understood or not extraction.update:
+        return {"needs_agent": True}
+
+    merged = merge_update(
+        partial, RequirementsUpdateResponseModel.model_validate(extraction.update)
+    )
+    # New airports, dates or cabin mean the flight has to be searched again
+    searches = "trip" in extraction.update or "preferences" in extraction.update
+    if searches or needs_agent(missing_fields(merged)):
+        return {"needs_agent": True, "partial_requirements": merged}
+    return {**_next_step(merged), "needs_agent": False}
+
+
+def route_after_extraction(state: RequirementsGraphState) -> str:
+    if state["needs_agent"]:
+        return "requirements_agent"
+    if state["requirements_complete"]:
+        return END
+    return "ask_user_for_info"
+
+
 def should_ask_user_for_info(state: RequirementsGraphState) -> bool:
     return not state["requirements_complete"]
 
 
-def ask_user_for_info(state: RequirementsGraphState) -> RequirementsGraphState:
-    user_response = interrupt(state["interruption_message"])
+def ask_user_for_info(
+    state: RequirementsGraphState, config: RunnableConfig
+) -> RequirementsGraphState:
+    user_response = interrupt_in_context(state["interruption_message"], config)
 
     return {
         "messages": [HumanMessage(content=user_response)],
@@ -64,21 +170,30 @@ def ask_user_for_info(state: RequirementsGraphState) -> RequirementsGraphState:
     }
 
 
-graph = StateGraph(RequirementsGraphState)
-graph.add_node("requirements_agent", requirements_agent_node)
-graph.add_node("ask_user_for_info", ask_user_for_info)
-graph.add_edge(START, "requirements_agent")
-graph.add_conditional_edges(
-    "requirements_agent",
-    should_ask_user_for_info,
-    {True: "ask_user_for_info", False: END},
-)
-graph.add_edge("ask_user_for_info", "requirements_agent")
+@lru_cache(maxsize=None)
+def get_requirements_graph():
+    """The compiled requirements graph, built on first use."""
+    graph = StateGraph(RequirementsGraphState)
+    graph.add_node("requirements_agent", requirements_agent_node)
+    graph.add_node("ask_user_for_info", ask_user_for_info)
+    graph.add_node("extract_reply", extract_reply_node)
+    graph.add_edge(START, "requirements_agent")
+    graph.add_conditional_edges(
+        "requirements_agent",
+        should_ask_user_for_info,
+        {True: "ask_user_for_info", False: END},
+    )
+    graph.add_edge("ask_user_for_info", "extract_reply")
+    graph.add_conditional_edges(
+        "extract_reply",
+        route_after_extraction,
+        ["requirements_agent", "ask_user_for_info", END],
+    )
 
-compiled_graph = graph.compile(checkpointer=checkpointer)
+    return graph.compile(checkpointer=get_checkpointer())
 
 
-if __name__ == "__main__":
+async def main():
     initial_state = RequirementsGraphState(
         messages=[
             HumanMessage(
@@ -89,7 +204,7 @@ if __name__ == "__main__":
 
     config = {"configurable": {"thread_id": "thread-1"}}
 
-    result = compiled_graph.invoke(initial_state, config)
+    result = await get_requirements_graph().ainvoke(initial_state, config)
 
     while True:
         if "__interrupt__" in result:
@@ -99,8 +214,13 @@ if __name__ == "__main__":
 
             current_state = Command(resume=user_input)
 
-            result = compiled_graph.invoke(current_state, config)
+            result = await get_requirements_graph().ainvoke(current_state, config)
         else:
             break
 
     print(result["requirements"])
+    await convex_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+# app/agents/requirements_state.py
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.agents.response_models.requirements_agent import (
+    CompleteRequirements,
+    RequirementsUpdateResponseModel,
+)
+
+# Fields the booking flow needs even though the schema allows them to be empty
+_WORKFLOW_FIELDS = [
+    ("traveler", "lead_name"),
+    ("traveler", "lead_email"),
+]
+
+# Sections whose missing fields can be asked about with a plain templated
+# question; anything else (flight search results, the flight confirmation)
+# needs the requirements agent
+_TEMPLATED_SECTIONS = {"traveler", "trip", "preferences", "budget", "hotel_prefs"}
+
+# The flight that was checked and confirmed depends on these fields
+_FLIGHT_INPUT_FIELDS = {
+    "trip": ("type", "origin", "destination", "depart_date", "return_date"),
+    "preferences": ("cabin_class", "non_stop", "max_layovers", "date_flex_days"),
+    "traveler": ("adults", "children"),
+}
+_FLIGHT_DECISION_SECTIONS = ("flight_check", "user_confirmations")
+
+_FIELD_LABELS = {
+    "traveler": "who is travelling",
+    "traveler.adults": "how many adults are travelling",
+    "traveler.children": "how many children are travelling",
+    "traveler.lead_name": "the lead traveler's full name",
+    "traveler.lead_email": "the lead traveler's email",
+    "trip": "the trip details",
+    "trip.origin": "where you are flying from",
+    "trip.destination": "where you are going",
+    "trip.depart_date": "your departure date",
+    "trip.return_date": "your return date",
+    "preferences": "your travel preferences",
+    "preferences.cabin_class": "your cabin class (economy, premium or business)",
+    "budget": "your budget",
+    "budget.total_amount": "your total budget",
+    "budget.flights_amount": "how much of the budget is for flights",
+    "budget.hotels_amount": "how much of the budget is for hotels",
+    "hotel_prefs": "your hotel preferences",
+    "flight_check": "a flight to confirm",
+    "user_confirmations": "your confirmation of the flight",
+    "user_confirmations.accept_outbound_top_option": "your confirmation of the flight",
+}
+
+
+def merge_update(
+    partial: Optional[dict], update: RequirementsUpdateResponseModel
+) -> dict:
+    """
+    Merge an agent's update into the requirements gathered so far. Sections
+    merge field by field; a field the update leaves null keeps its value.
+    A change to a field the flight search depends on (route, dates, cabin,
+    stops, flexibility, traveler counts) drops the flight check and the
+    user's confirmation of it, unless the update brings new ones.
+    """
+    merged = {section: dict(fields) for section, fields in (partial or {}).items()}
+    changes = update.model_dump(exclude={"question"}, exclude_none=True)
+    flight_inputs_changed = any(
+        field in changes.get(section, {})
+        and (merged.get(section) or {}).get(field) != changes[section][field]
+        for section, fields in _FLIGHT_INPUT_FIELDS.items()
+        for field in fields
+    )
+    if flight_inputs_changed:
+        for section in _FLIGHT_DECISION_SECTIONS:
+            if section not in changes:
+                merged.pop(section, None)
+    for section, fields in changes.items():
+        merged.setdefault(section, {}).update(fields)
+    return merged
+
+
+def missing_fields(partial: dict) -> list[str]:
+    """
+    Dotted paths of what is still missing: fields CompleteRequirements needs,
+    the lead traveler details, the return date of a round trip, and the
+    user's confirmation of the top flight option.
+    """
+    try:
+        CompleteRequirements.model_validate(_with_empty_missing_info(partial))
+        missing = []
+    except ValidationError as e:
+        missing = sorted(
+            {
+                ".".join(str(part) for part in error["loc"][:2])
+                for error in e.errors()
+            }
+        )
+
+    for section, field in _WORKFLOW_FIELDS:
+        if not (partial.get(section) or {}).get(field):
+            missing.append(f"{section}.{field}")
+    trip = partial.get("trip") or {}
+    if trip.get("type") == "round_trip" and not trip.get("return_date"):
+        missing.append("trip.return_date")
+    confirmations = partial.get("user_confirmations") or {}
+    if confirmations.get("accept_outbound_top_option") is not True:
+        missing.append("user_confirmations.accept_outbound_top_option")
+    return list(dict.fromkeys(missing))
+
+
+def fallback_question(missing: list[str]) -> str:
+    """A plain question for the missing fields, for when the agent didn't ask one."""
+    labels = list(
+        dict.fromkeys(
+            _FIELD_LABELS.get(path) or _FIELD_LABELS.get(path.split(".")[0], path)
+            for path in missing
+        )
+    )
+    if len(labels) > 1:
+        wanted = ", ".join(labels[:-1]) + f" and {labels[-1]}"
+    else:
+        wanted = labels[0]
+    return f"Could you tell me {wanted}?"
+
+
+def needs_agent(missing: list[str]) -> bool:
+    """Whether asking for the missing fields needs the requirements agent."""
+    return any(path.split(".")[0] not in _TEMPLATED_SECTIONS for path in missing)
+
+
+def complete_requirements(partial: dict) -> dict:
+    """The final requirements dict for a partial state with nothing missing."""
+    return CompleteRequirements.model_validate(
+        _with_empty_missing_info(partial)
+    ).model_dump()
+
+
+def _with_empty_missing_info(partial: dict) -> dict:
+    return {**partial, "missing_info": {"missing_info": [], "question": ""}}
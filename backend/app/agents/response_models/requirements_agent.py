@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, create_model
+from typing import List, Optional, Type
 
 
 class TravelerProfile(BaseModel):
@@ -7,6 +7,12 @@ class TravelerProfile(BaseModel):
 
     adults: int = Field(..., description="Number of adult travelers")
     children: int = Field(..., description="Number of child travelers")
+    lead_name: Optional[str] = Field(
+        None, description="Full name of the lead traveler, used for bookings"
+    )
+    lead_email: Optional[str] = Field(
+        None, description="Email of the lead traveler, used for bookings"
+    )
 
 
 class AirportInfo(BaseModel):
@@ -53,6 +59,9 @@ class HotelPreferences(BaseModel):
     stars: str = Field(..., description="Star rating range (e.g., 3-4)")
     area: str = Field(..., description="Area preference (e.g., central, quiet)")
     room_type: str = Field(..., description="Room type preference")
+    amenities: List[str] = Field(
+        default_factory=list, description="Must-have amenities (e.g., WiFi, Pool)"
+    )
 
 
 class FlightQuery(BaseModel):
@@ -69,6 +78,9 @@ class FlightQuery(BaseModel):
 class FlightOption(BaseModel):
     """Individual flight option details."""
 
+    flight_id: Optional[str] = Field(
+        None, description="Flight ID from the flight search, used for booking"
+    )
     carrier: str = Field(..., description="Airline carrier")
     flight_number: str = Field(..., description="Flight number")
     depart_iso: str = Field(..., description="Departure time in ISO format")
@@ -150,3 +162,54 @@ class CompleteRequirements(BaseModel):
 
 class RequirementsAgentResponseModel(BaseModel):
     requirements: CompleteRequirements = Field(..., description="Complete requirements")
+
+
+def _partial(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Copy of a requirements section with every field optional, for updates."""
+    fields = {
+        name: (Optional[field.annotation], Field(None, description=field.description))
+        for name, field in model.model_fields.items()
+    }
+    return create_model(f"Partial{model.__name__}", __doc__=model.__doc__, **fields)
+
+
+PartialTravelerProfile = _partial(TravelerProfile)
+PartialTripDetails = _partial(TripDetails)
+PartialPreferences = _partial(Preferences)
+PartialBudget = _partial(Budget)
+PartialHotelPreferences = _partial(HotelPreferences)
+PartialFlightCheck = _partial(FlightCheck)
+PartialUserConfirmations = _partial(UserConfirmations)
+
+
+class RequirementsUpdateResponseModel(BaseModel):
+    """
+    Only the requirement fields that are new or changed this turn. Fields left
+    out (or null) keep their current value; completeness is checked locally.
+    """
+
+    traveler: Optional[PartialTravelerProfile] = Field(
+        None, description="New or changed traveler fields"
+    )
+    trip: Optional[PartialTripDetails] = Field(
+        None, description="New or changed trip fields"
+    )
+    preferences: Optional[PartialPreferences] = Field(
+        None, description="New or changed preference fields"
+    )
+    budget: Optional[PartialBudget] = Field(
+        None, description="New or changed budget fields"
+    )
+    hotel_prefs: Optional[PartialHotelPreferences] = Field(
+        None, description="New or changed hotel preference fields"
+    )
+    flight_check: Optional[PartialFlightCheck] = Field(
+        None, description="New or changed flight search queries and results"
+    )
+    user_confirmations: Optional[PartialUserConfirmations] = Field(
+        None, description="New or changed user confirmations"
+    )
+    question: str = Field(
+        "",
+        description="Question to ask the user for anything still missing or to confirm; empty if nothing",
+    )
@@ -1,11 +1,45 @@
 # app/agents/tools/booking_tools.py
-from typing import Optional
+from typing import List, Literal, Optional
 
-import requests
+import httpx
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from app.agents.tools.flight_tools import flight_network_cache, flight_search_cache
+from app.agents.tools.ranking import rank_hotels
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.convex import convex_client
+
+
+# Raw Convex search results keyed by (city, check_in, check_out)
+hotel_search_cache = TTLCache(
+    "hotel_search",
+    maxsize=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+async def fetch_hotels(
+    city: str, check_in: Optional[str] = None, check_out: Optional[str] = None
+) -> list[dict]:
+    """
+    Return the Convex hotels for a city and stay, served from the search cache when fresh.
+    Concurrent identical lookups share one upstream request. The returned list
+    is shared with the cache and must not be mutated.
+    """
+    key = (city.strip().casefold(), check_in or "", check_out or "")
+
+    async def load() -> list[dict]:
+        params = {"city": city.strip()}
+        if check_in:
+            params["checkIn"] = check_in
+        if check_out:
+            params["checkOut"] = check_out
+        data = await convex_client.aget("/hotels/search", params=params)
+        return data.get("hotels", [])
+
+    return await hotel_search_cache.get_or_load(key, load)
 
 
 class FlightBookingInput(BaseModel):
@@ -26,6 +60,19 @@ class HotelSearchInput(BaseModel):
     check_out: Optional[str] = Field(
         None, description="Check-out date in YYYY-MM-DD format (optional)"
     )
+    stars: Optional[str] = Field(
+        None, description="Star rating range from hotel preferences (e.g., 3-4)"
+    )
+    max_price_per_night: Optional[float] = Field(
+        None, description="Maximum price per night, e.g. hotel budget / nights"
+    )
+    amenities: Optional[List[str]] = Field(
+        None, description="Amenities every hotel must have (e.g., WiFi, Pool)"
+    )
+    sort_by: Literal["price", "rating"] = Field(
+        "price", description="Rank hotels by price or by star rating"
+    )
+    top_k: int = Field(5, ge=1, le=20, description="Number of hotels to return")
 
 
 class HotelBookingInput(BaseModel):
@@ -40,12 +87,20 @@ class HotelBookingInput(BaseModel):
 
 
 @tool("search_hotels", args_schema=HotelSearchInput)
-def search_hotels(
-    city: str, check_in: Optional[str] = None, check_out: Optional[str] = None
+async def search_hotels(
+    city: str,
+    check_in: Optional[str] = None,
+    check_out: Optional[str] = None,
+    stars: Optional[str] = None,
+    max_price_per_night: Optional[float] = None,
+    amenities: Optional[List[str]] = None,
+    sort_by: str = "price",
+    top_k: int = 5,
 ) -> dict:
     """
     Searches for hotels in a city with optional check-in and check-out dates.
-    Returns a list of available hotels with their details.
+    Filters by star range, nightly price and required amenities, and returns
+    the top matches with the hotel_id, name, stars and price needed to book.
     """
     print(f"--- TOOL CALLED: Searching hotels in {city} ---")
     if check_in:
@@ -53,25 +108,24 @@ def search_hotels(
     if check_out:
         print(f"  Check-out: {check_out}")
 
-    api_url = f"{settings.CONVEX_BASE_URL}/hotels/search"
-    params = {"city": city}
-    if check_in:
-        params["checkIn"] = check_in
-    if check_out:
-        params["checkOut"] = check_out
-
     try:
-        response = requests.get(api_url, params=params, timeout=10)
-        response.raise_for_status()
-
-        hotels = response.json().get("hotels", [])
-
-        if not hotels:
+        hotels = await fetch_hotels(city, check_in, check_out)
+
+        options, total_matches = rank_hotels(
+            hotels,
+            stars=stars,
+            max_price_per_night=max_price_per_night,
+            amenities=amenities,
+            sort_by=sort_by,
+            top_k=top_k,
+        )
+
+        if not options:
             return {"available": False, "hotels": []}
 
-        return {"available": True, "hotels": hotels}
+        return {"available": True, "total_matches": total_matches, "hotels": options}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"API call failed: {e}")
         return {"available": False, "hotels": [], "error": str(e)}
     except Exception as e:
@@ -84,7 +138,7 @@ def search_hotels(
 
 
 @tool("book_flight", args_schema=FlightBookingInput)
-def book_flight(flight_id: str, passenger_name: str, passenger_email: str) -> dict:
+async def book_flight(flight_id: str, passenger_name: str, passenger_email: str) -> dict:
     """
     Books a flight reservation using the confirmed flight ID.
     Returns booking confirmation with booking ID, reference, seat number, and status.
@@ -93,19 +147,21 @@ def book_flight(flight_id: str, passenger_name: str, passenger_email: str) -> di
         f"--- TOOL CALLED: Booking flight {flight_id} for {passenger_name} ({passenger_email}) ---"
     )
 
-    api_url = f"{settings.CONVEX_BASE_URL}/flights/book"
     payload = {
         "flightId": flight_id,
         "passengerName": passenger_name,
         "passengerEmail": passenger_email,
     }
-    headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(api_url, json=payload, headers=headers, timeout=10)
-        response.raise_for_status()
+        result = await convex_client.apost("/flights/book", payload)
 
-        result = response.json()
+        # Seat availability changed, so drop cached searches listing this flight
+        flight_search_cache.invalidate_where(
+            lambda _, flights: any(f.get("_id") == flight_id for f in flights)
+        )
+        # The connection index is one snapshot of every flight; rebuild it on next use
+        flight_network_cache.clear()
 
         if result.get("success"):
             booking = result.get("booking", {})
@@ -119,7 +175,7 @@ def book_flight(flight_id: str, passenger_name: str, passenger_email: str) -> di
 
         return {"success": False, "error": "Booking failed"}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"API call failed: {e}")
         return {"success": False, "error": str(e)}
     except Exception as e:
@@ -128,7 +184,7 @@ def book_flight(flight_id: str, passenger_name: str, passenger_email: str) -> di
 
 
 @tool("book_hotel", args_schema=HotelBookingInput)
-def book_hotel(
+async def book_hotel(
     hotel_id: str,
     guest_name: str,
     guest_email: str,
@@ -147,7 +203,6 @@ def book_hotel(
         f"  Check-in: {check_in_date}, Check-out: {check_out_date}, Room: {room_type}"
     )
 
-    api_url = f"{settings.CONVEX_BASE_URL}/hotels/book"
     payload = {
         "hotelId": hotel_id,
         "guestName": guest_name,
@@ -156,13 +211,14 @@ def book_hotel(
         "checkOutDate": check_out_date,
         "roomType": room_type,
     }
-    headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(api_url, json=payload, headers=headers, timeout=10)
-        response.raise_for_status()
+        result = await convex_client.apost("/hotels/book", payload)
 
-        result = response.json()
+        # Room availability changed, so drop cached searches listing this hotel
+        hotel_search_cache.invalidate_where(
+            lambda _, hotels: any(h.get("_id") == hotel_id for h in hotels)
+        )
 
         if result.get("success"):
             booking = result.get("booking", {})
@@ -177,7 +233,7 @@ def book_hotel(
 
         return {"success": False, "error": "Booking failed"}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"API call failed: {e}")
         return {"success": False, "error": str(e)}
     except Exception as e:
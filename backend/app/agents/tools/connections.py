@@ -0,0 +1,264 @@
+# app/agents/tools/connections.py
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from app.agents.tools.ranking import _parse_date, flight_times, project_flight
+
+
+class Leg(NamedTuple):
+    depart: datetime
+    arrive: datetime
+    origin: str
+    destination: str
+    price: float
+    duration_min: int
+    flight: dict
+
+
+class _Label(NamedTuple):
+    """
+    A partial itinerary ending at `airport`, ordered in the heap by its cost
+    plus a lower bound on the cost of reaching the destination.
+    """
+
+    estimate: float
+    seq: int
+    cost: float
+    airport: str
+    arrive: datetime
+    legs: tuple
+    visited: frozenset
+
+
+class _Settled(NamedTuple):
+    """An expanded label, as compared for dominance at its airport."""
+
+    onward_cost: float
+    legs: int
+    visited: frozenset
+    # Index range of the departures it can connect to
+    first: int
+    last: int
+
+
+class FlightNetwork:
+    """
+    Time-indexed flight graph built from a bulk Convex /flights snapshot.
+
+    Departures are grouped per airport and sorted by time, so the flights that
+    can follow an arrival are found with a binary search. Times are the local
+    times Convex reports; a connection only ever compares an arrival and a
+    departure at the same airport, so they share a timezone.
+    """
+
+    def __init__(self, flights: list[dict]):
+        self.departures: dict[str, list[Leg]] = {}
+        for flight in flights:
+            if flight.get("availableSeats") == 0:
+                continue
+            try:
+                depart, arrive = flight_times(flight)
+                origin = flight["origin"]["airport"].upper()
+                destination = flight["destination"]["airport"].upper()
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.departures.setdefault(origin, []).append(
+                Leg(
+                    depart,
+                    arrive,
+                    origin,
+                    destination,
+                    flight.get("price", 0),
+                    flight.get("duration") or int((arrive - depart).total_seconds() // 60),
+                    flight,
+                )
+            )
+        # Cheapest fare and shortest flight into each airport, by origin
+        self._into: dict[str, dict[str, tuple[float, int]]] = {}
+        for origin, legs in self.departures.items():
+            legs.sort(key=lambda leg: leg.depart)
+            for leg in legs:
+                sources = self._into.setdefault(leg.destination, {})
+                price, duration = sources.get(origin, (leg.price, leg.duration_min))
+                sources[origin] = (min(price, leg.price), min(duration, leg.duration_min))
+        self._depart_times = {
+            airport: [leg.depart for leg in legs]
+            for airport, legs in self.departures.items()
+        }
+        self.flight_count = sum(len(legs) for legs in self.departures.values())
+
+    def _departures_between(
+        self, airport: str, earliest: datetime, latest: datetime
+    ) -> list[Leg]:
+        times = self._depart_times.get(airport)
+        if not times:
+            return []
+        start = bisect_left(times, earliest)
+        # Inclusive of `latest`, which may be datetime.max for an undated search
+        end = bisect_right(times, latest)
+        return self.departures[airport][start:end]
+
+    def _hops_to(self, destination: str, limit: int) -> dict[str, int]:
+        """Fewest flights from each airport to destination, up to limit."""
+        hops = {destination: 0}
+        frontier = [destination]
+        for n in range(1, limit + 1):
+            frontier = [
+                source
+                for airport in frontier
+                for source in self._into.get(airport, ())
+                if source not in hops and hops.setdefault(source, n) == n
+            ]
+        return hops
+
+    def _cost_bounds(
+        self, destination: str, sort_by: str, min_connection_minutes: int
+    ) -> dict[str, float]:
+        """
+        A lower bound on the cost from each airport (having landed there) to
+        destination: the cheapest fares, or the shortest flights plus the
+        minimum connection before each. Dijkstra backwards over the routes.
+        """
+        bounds = {destination: 0.0}
+        heap = [(0.0, destination)]
+        while heap:
+            bound, airport = heapq.heappop(heap)
+            if bound > bounds[airport]:
+                continue
+            for source, (price, duration) in self._into.get(airport, {}).items():
+                if sort_by == "price":
+                    step = price
+                else:
+                    step = duration + min_connection_minutes
+                if bound + step < bounds.get(source, float("inf")):
+                    bounds[source] = bound + step
+                    heapq.heappush(heap, (bound + step, source))
+        return bounds
+
+    def search(
+        self,
+        origin: str,
+        destination: str,
+        date: Optional[str] = None,
+        flex_days: int = 0,
+        max_layovers: int = 1,
+        min_connection_minutes: int = 60,
+        max_connection_hours: float = 24,
+        sort_by: str = "price",
+        top_k: int = 5,
+    ) -> list[dict]:
+        """
+        Cheapest (sort_by="price") or fastest (sort_by="duration") itineraries
+        from origin to destination with at most max_layovers connections.
+
+        Label-setting search over (airport, arrival time) states: labels leave
+        a min-heap in order of cost plus a lower bound on the rest of the way
+        (see `_cost_bounds`), so itineraries reach the destination best first.
+        Flights to airports that can't reach the destination in the legs left
+        are never taken. A label is dropped once top_k settled labels at
+        the same airport dominate it: each can connect to every departure it
+        can (the maximum connection time makes that more than arriving
+        earlier), has used no more legs, has visited no airport it hasn't, and
+        costs no more onwards. Each of those can continue however it could, at
+        least as cheaply.
+        """
+        origin, destination = origin.upper(), destination.upper()
+        if date:
+            day = datetime.combine(_parse_date(date), datetime.min.time())
+            earliest = day - timedelta(days=flex_days)
+            latest = day + timedelta(days=flex_days + 1) - timedelta(microseconds=1)
+        else:
+            earliest, latest = datetime.min, datetime.max
+
+        min_connection = timedelta(minutes=min_connection_minutes)
+        max_connection = timedelta(hours=max_connection_hours)
+        max_legs = max_layovers + 1
+        hops = self._hops_to(destination, max_legs)
+        bounds = self._cost_bounds(destination, sort_by, min_connection_minutes)
+        heap: list[_Label] = []
+        seq = 0
+
+        def push(cost: float, leg: Leg, legs: tuple, visited: frozenset) -> None:
+            nonlocal seq
+            seq += 1
+            estimate = cost + bounds[leg.destination]
+            heapq.heappush(
+                heap,
+                _Label(estimate, seq, cost, leg.destination, leg.arrive, legs, visited),
+            )
+
+        start = frozenset([origin])
+        for leg in self._departures_between(origin, earliest, latest):
+            if hops.get(leg.destination, max_legs) > max_legs - 1:
+                continue
+            cost = leg.price if sort_by == "price" else leg.duration_min
+            push(cost, leg, (leg,), start | {leg.destination})
+
+        # Expanded labels by airport
+        settled: dict[str, list[_Settled]] = {}
+        results = []
+        while heap and len(results) < top_k:
+            label = heapq.heappop(heap)
+            if label.airport == destination:
+                results.append(label)
+                continue
+
+            times = self._depart_times.get(label.airport, [])
+            first = bisect_left(times, label.arrive + min_connection)
+            last = bisect_right(times, label.arrive + max_connection)
+            if first == last:
+                continue
+            onward_cost = label.cost
+            if sort_by == "duration":
+                # Waiting counts towards the duration, so arriving later is cheaper onwards
+                onward_cost -= (label.arrive - datetime.min).total_seconds() // 60
+            current = _Settled(onward_cost, len(label.legs), label.visited, first, last)
+            seen = settled.setdefault(label.airport, [])
+            dominated = sum(
+                1
+                for other in seen
+                if other.onward_cost <= current.onward_cost
+                and other.legs <= current.legs
+                and other.first <= current.first
+                and other.last >= current.last
+                and other.visited <= current.visited
+            )
+            if dominated >= top_k:
+                continue
+            seen.append(current)
+
+            legs_left = max_legs - len(label.legs) - 1
+            for leg in self.departures[label.airport][first:last]:
+                if leg.destination in label.visited or (
+                    hops.get(leg.destination, max_legs) > legs_left
+                ):
+                    continue
+                if sort_by == "price":
+                    cost = label.cost + leg.price
+                else:
+                    layover = (leg.depart - label.arrive).total_seconds() // 60
+                    cost = label.cost + layover + leg.duration_min
+                push(cost, leg, label.legs + (leg,), label.visited | {leg.destination})
+
+        return [_project_itinerary(label.legs) for label in results]
+
+
+def _project_itinerary(legs: tuple) -> dict:
+    layovers = [
+        {
+            "airport": prev.destination,
+            "minutes": int((nxt.depart - prev.arrive).total_seconds() // 60),
+        }
+        for prev, nxt in zip(legs, legs[1:])
+    ]
+    return {
+        "stops": len(legs) - 1,
+        "route": [legs[0].origin] + [leg.destination for leg in legs],
+        "total_price_usd": sum(leg.price for leg in legs),
+        "total_duration_min": sum(leg.duration_min for leg in legs)
+        + sum(layover["minutes"] for layover in layovers),
+        "layovers": layovers,
+        "legs": [project_flight(leg.flight) for leg in legs],
+    }
@@ -0,0 +1,78 @@
+# app/agents/tools/fare_calendar.py
+from datetime import date, timedelta
+from typing import Optional
+
+import numpy as np
+
+from app.agents.tools.ranking import _parse_date, project_flight
+
+
+def date_window(center: str, flex_days: int) -> list[date]:
+    """Every date from center - flex_days to center + flex_days."""
+    middle = _parse_date(center)
+    return [middle + timedelta(days=offset) for offset in range(-flex_days, flex_days + 1)]
+
+
+def min_fares(
+    flights: list[dict], dates: list[date]
+) -> tuple[np.ndarray, list[Optional[dict]]]:
+    """
+    Cheapest bookable fare per date (inf when there is none) and the flight
+    that has it.
+    """
+    index = {day: i for i, day in enumerate(dates)}
+    fares = np.full(len(dates), np.inf)
+    cheapest: list[Optional[dict]] = [None] * len(dates)
+    for flight in flights:
+        if flight.get("availableSeats") == 0:
+            continue
+        i = index.get(_parse_date(flight["flightDate"]))
+        if i is not None and flight.get("price", np.inf) < fares[i]:
+            fares[i] = flight["price"]
+            cheapest[i] = flight
+    return fares, cheapest
+
+
+def cheapest_round_trips(
+    outbound_fares: np.ndarray,
+    outbound_dates: list[date],
+    return_fares: np.ndarray,
+    return_dates: list[date],
+    top_k: int = 3,
+) -> list[tuple[int, int, float]]:
+    """
+    The top_k cheapest (outbound index, return index, total) combinations,
+    considering only returns at least one night after the outbound date.
+    """
+    totals = outbound_fares[:, None] + return_fares[None, :]
+    out_days = np.array([d.toordinal() for d in outbound_dates])
+    ret_days = np.array([d.toordinal() for d in return_dates])
+    totals[ret_days[None, :] <= out_days[:, None]] = np.inf
+
+    flat = totals.ravel()
+    k = min(top_k, int(np.isfinite(flat).sum()))
+    if k == 0:
+        return []
+    best = np.argpartition(flat, k - 1)[:k]
+    best = best[np.argsort(flat[best], kind="stable")]
+    rows, cols = np.unravel_index(best, totals.shape)
+    return [(int(i), int(j), float(flat[b])) for i, j, b in zip(rows, cols, best)]
+
+
+def fare_row(dates: list[date], fares: np.ndarray) -> dict:
+    """Compact {date: min price or None} mapping for the tool output."""
+    return {
+        day.isoformat(): (float(fare) if np.isfinite(fare) else None)
+        for day, fare in zip(dates, fares)
+    }
+
+
+def fare_option(flight: dict) -> dict:
+    option = project_flight(flight)
+    return {
+        "flight_id": option["flight_id"],
+        "carrier": option["carrier"],
+        "flight_number": option["flight_number"],
+        "depart_iso": option["depart_iso"],
+        "price_usd": option["price_usd"],
+    }
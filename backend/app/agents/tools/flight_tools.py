@@ -1,10 +1,72 @@
 # app/tools/flight_tools.py
-import requests
+import asyncio
+from typing import Literal, Optional
+
+import httpx
 
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from app.agents.tools.connections import FlightNetwork
+from app.agents.tools.fare_calendar import (
+    cheapest_round_trips,
+    date_window,
+    fare_option,
+    fare_row,
+    min_fares,
+)
+from app.agents.tools.ranking import rank_flights
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.convex import convex_client
+from app.core.reference_data import reference_store
+
+
+# Raw Convex search results keyed by (origin, destination, date)
+flight_search_cache = TTLCache(
+    "flight_search",
+    maxsize=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+async def fetch_flights(
+    origin: str, destination: str, date: Optional[str] = None
+) -> list[dict]:
+    """
+    Return the Convex flights for a route, served from the search cache when fresh.
+    Concurrent identical lookups share one upstream request. The returned list
+    is shared with the cache and must not be mutated.
+    """
+    key = (origin.strip().upper(), destination.strip().upper(), date or "")
+
+    async def load() -> list[dict]:
+        params = {"origin": key[0], "destination": key[1]}
+        if date:
+            params["date"] = date
+        data = await convex_client.aget("/flights/search", params=params)
+        return data.get("flights", [])
+
+    return await flight_search_cache.get_or_load(key, load)
+
+
+# Connection-search index built from the bulk /flights snapshot
+flight_network_cache = TTLCache(
+    "flight_network",
+    maxsize=1,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+async def get_flight_network() -> FlightNetwork:
+    """Return the connection-search index, rebuilding it when the snapshot expires."""
+
+    async def load() -> FlightNetwork:
+        data = await convex_client.aget("/flights")
+        # Indexing a large snapshot takes a while; keep it off the event loop
+        return await asyncio.to_thread(FlightNetwork, data.get("flights", []))
+
+    return await flight_network_cache.get_or_load("all", load)
 
 
 class FlightSearchInput(BaseModel):
@@ -16,32 +78,103 @@ class FlightSearchInput(BaseModel):
     destination: str = Field(
         ..., description="The IATA code for the destination airport (e.g., 'BKK')."
     )
+    date: Optional[str] = Field(
+        None, description="Travel date in YYYY-MM-DD format (optional)."
+    )
+    flex_days: int = Field(
+        0,
+        ge=0,
+        le=7,
+        description="Also include flights up to this many days before/after the date.",
+    )
+    cabin: Optional[str] = Field(
+        None, description="Cabin class: economy, premium, business (optional)."
+    )
+    max_price: Optional[float] = Field(
+        None, description="Maximum ticket price in USD (optional)."
+    )
+    sort_by: Literal["price", "duration"] = Field(
+        "price", description="Rank options by price or by flight duration."
+    )
+    top_k: int = Field(5, ge=1, le=20, description="Number of options to return.")
+
+
+async def _no_route_answer(origin: str, destination: str) -> Optional[dict]:
+    """
+    Answer locally when the route graph shows no direct route between two known
+    airports, listing one-stop connections and alternative airports instead.
+    Returns None when the route exists or the reference data can't tell,
+    including when it has no routes out of the origin at all (e.g. an empty
+    or partly malformed /reference/routes response).
+    """
+    routes = await reference_store.get()
+    if not (routes.knows_airport(origin) and routes.knows_airport(destination)):
+        return None
+    if not routes.destinations_from(origin) or routes.has_route(origin, destination):
+        return None
+
+    print(f"  No direct route {origin} → {destination}; skipping the search")
+    return {
+        "available": False,
+        "options": [],
+        "no_route": True,
+        "one_stop_routes": routes.connecting_routes(origin, destination, max_stops=1),
+        "alternative_destinations": routes.alternative_destinations(
+            origin, destination
+        ),
+    }
 
 
 @tool("search_flight_availability", args_schema=FlightSearchInput)
-def search_flight_availability(origin: str, destination: str) -> dict:
+async def search_flight_availability(
+    origin: str,
+    destination: str,
+    date: Optional[str] = None,
+    flex_days: int = 0,
+    cabin: Optional[str] = None,
+    max_price: Optional[float] = None,
+    sort_by: str = "price",
+    top_k: int = 5,
+) -> dict:
     """
     Checks if flights are available on a given date between two airports.
-    Returns a small list of candidate options sorted by price.
+    Returns a small list of candidate options sorted by price (or duration),
+    each with the flight_id needed for booking.
     Only call this after you have the origin, destination, and date.
+    If no direct route exists it answers at once with no_route, the one-stop
+    connections (airport paths) and alternative destination airports.
     """
     print(f"--- TOOL CALLED: Searching flights from {origin} to {destination} ---")
-
-    api_url = f"{settings.CONVEX_BASE_URL}/flights/search"
-    params = {"origin": origin, "destination": destination}
+    if date:
+        print(f"  Date: {date} (±{flex_days} days)")
 
     try:
-        response = requests.get(api_url, params=params, timeout=10)
-        response.raise_for_status()  # Raises an exception for 4XX/5XX errors
+        no_route = await _no_route_answer(origin, destination)
+        if no_route is not None:
+            return no_route
+
+        # An exact date lets Convex filter server-side; a flex window is
+        # filtered locally from the all-dates result for the route
+        query_date = date if date and flex_days == 0 else None
+        # Raises an exception for 4XX/5XX errors
+        flights = await fetch_flights(origin, destination, query_date)
 
-        flights = response.json().get("flights", [])
+        options, total_matches = rank_flights(
+            flights,
+            date=date,
+            flex_days=flex_days,
+            cabin=cabin,
+            max_price=max_price,
+            sort_by=sort_by,
+            top_k=top_k,
+        )
 
-        if not flights:
+        if not options:
             return {"available": False, "options": []}
 
-        return {"available": True, "options": flights}
+        return {"available": True, "total_matches": total_matches, "options": options}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"API call failed: {e}")
         return {"available": False, "options": [], "error": str(e)}
     except Exception as e:
@@ -51,3 +184,168 @@ def search_flight_availability(origin: str, destination: str) -> dict:
             "options": [],
             "error": "An internal error occurred.",
         }
+
+
+class ConnectionSearchInput(BaseModel):
+    """Input schema for connecting itinerary searches."""
+
+    origin: str = Field(..., description="The IATA code for the origin airport.")
+    destination: str = Field(
+        ..., description="The IATA code for the destination airport."
+    )
+    date: Optional[str] = Field(
+        None, description="Departure date of the first leg in YYYY-MM-DD format."
+    )
+    flex_days: int = Field(
+        0, ge=0, le=7, description="Allow the first leg this many days before/after."
+    )
+    max_layovers: int = Field(
+        1, ge=0, le=3, description="Maximum number of connections (the user's max layovers)."
+    )
+    min_connection_minutes: int = Field(
+        60, ge=0, le=720, description="Minimum time between connecting flights."
+    )
+    sort_by: Literal["price", "duration"] = Field(
+        "price", description="Find the cheapest or the fastest itineraries."
+    )
+    top_k: int = Field(3, ge=1, le=10, description="Number of itineraries to return.")
+
+
+@tool("search_connecting_flights", args_schema=ConnectionSearchInput)
+async def search_connecting_flights(
+    origin: str,
+    destination: str,
+    date: Optional[str] = None,
+    flex_days: int = 0,
+    max_layovers: int = 1,
+    min_connection_minutes: int = 60,
+    sort_by: str = "price",
+    top_k: int = 3,
+) -> dict:
+    """
+    Finds the cheapest or fastest itineraries between two airports, including
+    connections, with up to max_layovers stops. Each itinerary lists its legs
+    (each with a flight_id for booking), layover times, total price and duration.
+    Use it when there is no direct route or the user accepts layovers.
+    """
+    print(
+        f"--- TOOL CALLED: Searching connections from {origin} to {destination} "
+        f"(≤{max_layovers} layovers) ---"
+    )
+
+    try:
+        network = await get_flight_network()
+        # A wide search over a large index is CPU-bound; keep it off the event loop
+        itineraries = await asyncio.to_thread(
+            network.search,
+            origin,
+            destination,
+            date=date,
+            flex_days=flex_days,
+            max_layovers=max_layovers,
+            min_connection_minutes=min_connection_minutes,
+            sort_by=sort_by,
+            top_k=top_k,
+        )
+
+        if not itineraries:
+            return {"available": False, "itineraries": []}
+
+        return {"available": True, "itineraries": itineraries}
+
+    except httpx.HTTPError as e:
+        print(f"API call failed: {e}")
+        return {"available": False, "itineraries": [], "error": str(e)}
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return {
+            "available": False,
+            "itineraries": [],
+            "error": "An internal error occurred.",
+        }
+
+
+class FareCalendarInput(BaseModel):
+    """Input schema for flexible-date fare calendar requests."""
+
+    origin: str = Field(..., description="The IATA code for the origin airport.")
+    destination: str = Field(
+        ..., description="The IATA code for the destination airport."
+    )
+    depart_date: str = Field(..., description="Preferred departure date (YYYY-MM-DD).")
+    return_date: Optional[str] = Field(
+        None, description="Preferred return date (YYYY-MM-DD) for round trips."
+    )
+    flex_days: int = Field(
+        3, ge=0, le=7, description="Look this many days either side of each date."
+    )
+
+
+@tool("fare_calendar", args_schema=FareCalendarInput)
+async def fare_calendar(
+    origin: str,
+    destination: str,
+    depart_date: str,
+    return_date: Optional[str] = None,
+    flex_days: int = 3,
+) -> dict:
+    """
+    Shows the cheapest fare for every date in a ±flex_days window around the
+    departure (and return) date, and for round trips the cheapest date
+    combinations with their flight_ids. Use it when the user's dates are flexible
+    instead of searching one date at a time.
+    """
+    print(
+        f"--- TOOL CALLED: Fare calendar {origin} ⇄ {destination} "
+        f"around {depart_date} (±{flex_days} days) ---"
+    )
+
+    try:
+        # One cached all-dates search per direction, fetched concurrently
+        searches = [fetch_flights(origin, destination)]
+        if return_date:
+            searches.append(fetch_flights(destination, origin))
+        results = await asyncio.gather(*searches)
+
+        outbound_dates = date_window(depart_date, flex_days)
+        outbound_fares, outbound_flights = min_fares(results[0], outbound_dates)
+        calendar = {"outbound": fare_row(outbound_dates, outbound_fares)}
+
+        if not return_date:
+            i = int(outbound_fares.argmin())
+            if outbound_flights[i] is None:
+                return {"available": False, **calendar}
+            return {
+                "available": True,
+                **calendar,
+                "cheapest": fare_option(outbound_flights[i]),
+            }
+
+        return_dates = date_window(return_date, flex_days)
+        return_fares, return_flights = min_fares(results[1], return_dates)
+        calendar["return"] = fare_row(return_dates, return_fares)
+
+        combinations = [
+            {
+                "depart_date": outbound_dates[i].isoformat(),
+                "return_date": return_dates[j].isoformat(),
+                "total_price_usd": total,
+                "outbound": fare_option(outbound_flights[i]),
+                "return": fare_option(return_flights[j]),
+            }
+            for i, j, total in cheapest_round_trips(
+                outbound_fares, outbound_dates, return_fares, return_dates
+            )
+        ]
+        return {
+            "available": bool(combinations),
+            **calendar,
+            "cheapest_combinations": combinations,
+        }
+
+    except httpx.HTTPError as e:
+        print(f"API call failed: {e}")
+        return {"available": False, "error": str(e)}
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return {"available": False, "error": "An internal error occurred."}
@@ -1,9 +1,28 @@
 # app/agents/tools/planner_tools.py
-from langchain_community.tools import DuckDuckGoSearchRun
+from typing import List
 
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
 
-# DuckDuckGo search tool for finding attractions, POIs, and travel information
-web_search = DuckDuckGoSearchRun(
-    name="web_search",
-    description="Search the web for travel information, attractions, points of interest (POIs), and activities in a destination city. Use this to find popular sights, cultural sites, restaurants, shopping areas, and other tourist attractions.",
-)
+from app.agents.tools.web_search import web_searcher
+
+
+class WebSearchInput(BaseModel):
+    """Input schema for web searches."""
+
+    queries: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=6,
+        description="One or more search queries, e.g. ['Tokyo food markets', 'Tokyo temples'].",
+    )
+
+
+# Web search tool for finding attractions, POIs, and travel information
+@tool("web_search", args_schema=WebSearchInput)
+async def web_search(queries: List[str]) -> dict:
+    """
+    Search the web for travel information, attractions, points of interest (POIs), and activities in a destination city. Use this to find popular sights, cultural sites, restaurants, shopping areas, and other tourist attractions.
+    Pass all the searches you need (e.g. one per interest) in a single call; they run concurrently and the results come back merged.
+    """
+    return await web_searcher.search_many(queries)
@@ -0,0 +1,166 @@
+# app/agents/tools/ranking.py
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+
+def flight_times(flight: dict) -> tuple[datetime, datetime]:
+    """
+    Departure and arrival datetimes of a Convex flight.
+    Arrival times earlier than the departure time roll over to the next day.
+    """
+    depart = datetime.fromisoformat(f"{flight['flightDate']}T{flight['departureTime']}")
+    arrive = datetime.fromisoformat(f"{flight['flightDate']}T{flight['arrivalTime']}")
+    if arrive < depart:
+        arrive += timedelta(days=1)
+    return depart, arrive
+
+
+def project_flight(flight: dict) -> dict:
+    """Slim a Convex flight down to the fields FlightOption needs, plus its ID."""
+    depart, arrive = flight_times(flight)
+    return {
+        "flight_id": flight["_id"],
+        "carrier": flight.get("airline"),
+        "flight_number": flight.get("flightNumber"),
+        "depart_iso": depart.isoformat(timespec="minutes"),
+        "arrive_iso": arrive.isoformat(timespec="minutes"),
+        "duration_min": flight.get("duration"),
+        "price_usd": flight.get("price"),
+        "seats_left": flight.get("availableSeats"),
+    }
+
+
+def rank_flights(
+    flights: list[dict],
+    date: Optional[str] = None,
+    flex_days: int = 0,
+    cabin: Optional[str] = None,
+    max_price: Optional[float] = None,
+    sort_by: str = "price",
+    top_k: int = 5,
+) -> tuple[list[dict], int]:
+    """
+    Filter Convex flights to the date window, cabin and price cap, then
+    return the top_k projected options and the number of matches.
+    Cabin only filters flights that carry a cabin field; Convex flights
+    currently don't, so it is a no-op for them.
+    """
+    window = None
+    if date:
+        center = _parse_date(date)
+        window = (center - timedelta(days=flex_days), center + timedelta(days=flex_days))
+
+    matches = []
+    for flight in flights:
+        if window is not None:
+            flight_date = _parse_date(flight["flightDate"])
+            if not window[0] <= flight_date <= window[1]:
+                continue
+        # A flight without a price can't be shown to be under the cap
+        if max_price is not None and (
+            flight.get("price") is None or flight["price"] > max_price
+        ):
+            continue
+        flight_cabin = flight.get("cabin") or flight.get("cabinClass")
+        if cabin and flight_cabin and flight_cabin.lower() != cabin.lower():
+            continue
+        if flight.get("availableSeats") == 0:
+            continue
+        matches.append(flight)
+
+    price = lambda f: _missing_last(f.get("price"))
+    duration = lambda f: _missing_last(f.get("duration"))
+    if sort_by == "duration":
+        sort_key = lambda f: (duration(f), price(f))
+    else:
+        sort_key = lambda f: (price(f), duration(f))
+    matches.sort(key=sort_key)
+
+    return [project_flight(f) for f in matches[:top_k]], len(matches)
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+def _missing_last(value: Optional[float]) -> tuple[bool, float]:
+    """Sort key for a numeric field that orders missing (None) values last."""
+    return value is None, value if value is not None else 0.0
+
+
+def parse_star_range(stars: Optional[str]) -> Optional[tuple[int, int]]:
+    """Parse a star preference such as "3-4", "4" or "4+" into (min, max)."""
+    if not stars:
+        return None
+    text = stars.strip().replace("stars", "").replace("star", "").strip()
+    try:
+        if text.endswith("+"):
+            return int(text[:-1]), 5
+        if "-" in text:
+            low, high = text.split("-", 1)
+            return int(low), int(high)
+        value = int(text)
+        return value, value
+    except ValueError:
+        return None
+
+
+def project_hotel(hotel: dict) -> dict:
+    """Slim a Convex hotel down to what the booker needs to call book_hotel."""
+    return {
+        "hotel_id": hotel["_id"],
+        "name": hotel.get("name"),
+        "stars": hotel.get("starRating"),
+        "price_per_night": hotel.get("pricePerNight"),
+        "currency": hotel.get("currency"),
+        "rooms_left": hotel.get("availableRooms"),
+    }
+
+
+def rank_hotels(
+    hotels: list[dict],
+    stars: Optional[str] = None,
+    max_price_per_night: Optional[float] = None,
+    amenities: Optional[list[str]] = None,
+    sort_by: str = "price",
+    top_k: int = 5,
+) -> tuple[list[dict], int]:
+    """
+    Filter Convex hotels by star range, nightly price cap and required
+    amenities, then return the top_k projected options and the number of matches.
+    """
+    star_range = parse_star_range(stars)
+    required = {a.strip().casefold() for a in amenities or [] if a.strip()}
+
+    matches = []
+    for hotel in hotels:
+        rating = hotel.get("starRating")
+        if star_range and (
+            rating is None or not star_range[0] <= rating <= star_range[1]
+        ):
+            continue
+        # A hotel without a nightly price can't be shown to be under the cap
+        if max_price_per_night is not None and (
+            hotel.get("pricePerNight") is None
+            or hotel["pricePerNight"] > max_price_per_night
+        ):
+            continue
+        if required and not required <= {
+            a.casefold() for a in hotel.get("amenities") or []
+        }:
+            continue
+        if hotel.get("availableRooms") == 0:
+            continue
+        matches.append(hotel)
+
+    price = lambda h: _missing_last(h.get("pricePerNight"))
+    best_rated = lambda h: _missing_last(
+        None if h.get("starRating") is None else -h["starRating"]
+    )
+    if sort_by == "rating":
+        sort_key = lambda h: (best_rated(h), price(h))
+    else:
+        sort_key = lambda h: (price(h), best_rated(h))
+    matches.sort(key=sort_key)
+
+    return [project_hotel(h) for h in matches[:top_k]], len(matches)
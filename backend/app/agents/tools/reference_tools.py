@@ -0,0 +1,40 @@
+# app/agents/tools/reference_tools.py
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+
+from app.core.reference_data import reference_store
+
+
+class LocationLookupInput(BaseModel):
+    """Input schema for location lookups."""
+
+    query: str = Field(
+        ..., description="City name or IATA airport code, e.g. 'Tokio' or 'NRT'."
+    )
+
+
+@tool("lookup_location", args_schema=LocationLookupInput)
+async def lookup_location(query: str) -> dict:
+    """
+    Resolves a city name (misspellings are fine) or IATA code to its airport
+    code, country, currency and timezone, and lists the airports reachable
+    from it by direct flight. Use this instead of guessing IATA codes.
+    """
+    data = await reference_store.get()
+    city = data.lookup_city(query)
+    if city is None:
+        return {
+            "found": False,
+            "suggestions": [c.name for c in data.suggest_cities(query)],
+        }
+
+    country = data.country_of(city)
+    return {
+        "found": True,
+        "city": city.name,
+        "airport_iata": city.airport_code,
+        "country": city.country,
+        "currency": country.currency if country else None,
+        "timezone": country.timezone if country else None,
+        "direct_destinations": sorted(data.destinations_from(city.airport_code)),
+    }
@@ -0,0 +1,185 @@
+# app/agents/tools/web_search.py
+import asyncio
+import hashlib
+import re
+import sqlite3
+import time
+from typing import Protocol
+
+from app.config import settings
+from app.core.cache import SingleFlight, SqliteTTLCache
+from app.core.metrics import observe_latency
+from app.core.rate_limit import TokenBucket
+
+
+class SearchBackend(Protocol):
+    async def search(self, query: str, max_results: int) -> list[dict]:
+        """Results as {"title", "snippet", "link"} dicts."""
+        ...
+
+
+class DuckDuckGoBackend:
+    """DuckDuckGo text search; the client is synchronous, so it runs on a thread."""
+
+    def __init__(self):
+        self._wrapper = None
+
+    async def search(self, query: str, max_results: int) -> list[dict]:
+        if self._wrapper is None:
+            # Imported on the first search, not at startup: langchain_community is heavy
+            from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+
+            self._wrapper = DuckDuckGoSearchAPIWrapper()
+        return await asyncio.to_thread(self._wrapper.results, query, max_results)
+
+
+class StubSearchBackend:
+    """
+    Deterministic offline backend for local runs and benchmarks: returns
+    made-up results derived from the query after an optional delay.
+    """
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    async def search(self, query: str, max_results: int) -> list[dict]:
+        self.calls += 1
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        digest = hashlib.sha1(query.encode()).hexdigest()[:8]
+        return [
+            {
+                "title": f"{query} #{i + 1}",
+                "snippet": f"Things to do for '{query}': stub result {i + 1} ({digest}).",
+                "link": f"https://example.com/{digest}/{i + 1}",
+            }
+            for i in range(max_results)
+        ]
+
+
+def build_backend() -> SearchBackend:
+    """Create the backend selected by WEB_SEARCH_BACKEND (duckduckgo or stub)."""
+    if settings.WEB_SEARCH_BACKEND == "stub":
+        return StubSearchBackend()
+    if settings.WEB_SEARCH_BACKEND != "duckduckgo":
+        raise ValueError(f"Unknown WEB_SEARCH_BACKEND: {settings.WEB_SEARCH_BACKEND}")
+    return DuckDuckGoBackend()
+
+
+def normalize_query(query: str) -> str:
+    """Casefold, drop punctuation and collapse whitespace: "Tokyo  food!" -> "tokyo food"."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.casefold()).split())
+
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+class WebSearcher:
+    """
+    Web search with a persistent per-query cache and a token-bucket rate
+    limit on backend calls. `search_many` runs several queries concurrently
+    and merges their results, dropping duplicates.
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        cache: SqliteTTLCache,
+        limiter: TokenBucket,
+        max_results: int,
+        snippet_chars: int,
+    ):
+        self.backend = backend
+        self.cache = cache
+        self.limiter = limiter
+        self.max_results = max_results
+        self.snippet_chars = snippet_chars
+        # Identical queries in flight share one backend call
+        self._single_flight = SingleFlight()
+
+    async def search(self, query: str) -> list[dict]:
+        key = normalize_query(query)
+        try:
+            hit, results = await asyncio.to_thread(self.cache.get, key)
+        except sqlite3.Error as e:
+            print(f"Web search cache unavailable: {e}")
+            hit, results = False, None
+        if hit:
+            return results
+        return await self._single_flight.run(key, lambda: self._fetch(query, key))
+
+    async def _fetch(self, query: str, key: str) -> list[dict]:
+        await self.limiter.acquire()
+        start = time.perf_counter()
+        error = True
+        try:
+            results = await self.backend.search(query, self.max_results)
+            error = False
+        finally:
+            observe_latency("web_search", time.perf_counter() - start, error)
+        results = [
+            {
+                "title": _truncate(r.get("title", ""), 120),
+                "snippet": _truncate(r.get("snippet", ""), self.snippet_chars),
+                "link": r.get("link", ""),
+            }
+            for r in results
+        ]
+        try:
+            await asyncio.to_thread(self.cache.set, key, results)
+        except sqlite3.Error as e:
+            print(f"Could not cache web search: {e}")
+        return results
+
+    async def search_many(self, queries: list[str]) -> dict:
+        """
+        Run the distinct queries concurrently; return merged results without
+        duplicate links or snippets, and the queries that failed.
+        """
+        by_key = {}
+        for query in queries:
+            by_key.setdefault(normalize_query(query), query)
+        distinct = [query for key, query in by_key.items() if key]
+        outcomes = await asyncio.gather(
+            *(self.search(query) for query in distinct), return_exceptions=True
+        )
+
+        merged, failed, seen = [], [], set()
+        for query, outcome in zip(distinct, outcomes):
+            if isinstance(outcome, BaseException):
+                # Includes a search cancelled on its own, e.g. by a timeout
+                error = str(outcome) or type(outcome).__name__
+                failed.append({"query": query, "error": error})
+                continue
+            for result in outcome:
+                fingerprint = result["link"] or normalize_query(result["snippet"])
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                merged.append({**result, "query": query})
+        response = {"results": merged}
+        if failed:
+            response["failed"] = failed
+        return response
+
+
+web_search_cache = SqliteTTLCache(
+    "web_search",
+    path=settings.WEB_SEARCH_CACHE_PATH,
+    maxsize=settings.WEB_SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.WEB_SEARCH_CACHE_TTL_SECONDS,
+)
+
+web_searcher = WebSearcher(
+    backend=build_backend(),
+    cache=web_search_cache,
+    limiter=TokenBucket(
+        rate=settings.WEB_SEARCH_RATE_PER_SECOND,
+        capacity=settings.WEB_SEARCH_BURST,
+    ),
+    max_results=settings.WEB_SEARCH_MAX_RESULTS,
+    snippet_chars=settings.WEB_SEARCH_SNIPPET_CHARS,
+)
@@ -1,12 +1,17 @@
 # app/agents/travel_system.py
-from langgraph.checkpoint.memory import MemorySaver
-from langchain.agents import create_agent
-from langchain.agents.structured_output import ToolStrategy
+from functools import lru_cache
 
-from app.agents.tools.flight_tools import search_flight_availability
+from app.agents.tools.flight_tools import (
+    fare_calendar,
+    search_connecting_flights,
+    search_flight_availability,
+)
 from app.agents.tools.planner_tools import web_search
 from app.agents.tools.booking_tools import book_flight, book_hotel, search_hotels
-from app.agents.response_models.requirements_agent import RequirementsAgentResponseModel
+from app.agents.tools.reference_tools import lookup_location
+from app.agents.response_models.requirements_agent import (
+    RequirementsUpdateResponseModel,
+)
 from app.agents.response_models.planner_agent import PlannerAgentResponseModel
 from app.agents.response_models.booker_agent import BookerAgentResponseModel
 from app.agents.response_models.planning_agent import PlanningAgentResponseModel
@@ -16,46 +21,101 @@ from app.agents.prompts.travel_system import (
     PLANNER_AGENT_SYSTEM_PROMPT,
     BOOKER_AGENT_SYSTEM_PROMPT,
 )
-from app.core.llm import model
+from app.config import settings
+from app.core.convex import convex_client
 
 
-requirements_agent = create_agent(
-    model=model,
-    name="requirements",
-    tools=[search_flight_availability],
-    response_format=ToolStrategy(RequirementsAgentResponseModel),
-    system_prompt=REQUIREMENTS_AGENT_SYSTEM_PROMPT,
-    # checkpointer=MemorySaver(),  # Manages state in memory for the session
-)
+def _build_agent(name, tools, response_format, system_prompt, model_choice):
+    """
+    Create an agent with the model configured for it: small, large, auto
+    (routed per call) or a model name. langchain's agent factory and the
+    model router are imported here, on first use, to keep imports fast.
+    """
+    from langchain.agents import create_agent
+    from langchain.agents.structured_output import ToolStrategy
 
-planning_agent = create_agent(
-    model=model,
-    name="planning",
-    tools=[],
-    response_format=ToolStrategy(PlanningAgentResponseModel),
-    system_prompt=PLANNING_AGENT_SYSTEM_PROMPT,
-)
+    from app.agents.model_routing import agent_model
 
-planner_agent = create_agent(
-    model=model,
-    name="planner",
-    tools=[web_search],
-    response_format=ToolStrategy(PlannerAgentResponseModel),
-    system_prompt=PLANNER_AGENT_SYSTEM_PROMPT,
-)
+    model, middleware = agent_model(name, model_choice)
+    return create_agent(
+        model=model,
+        name=name,
+        tools=tools,
+        response_format=ToolStrategy(response_format),
+        system_prompt=system_prompt,
+        middleware=middleware,
+        # Agents run inside graph nodes; their turns are not checkpointed themselves
+        checkpointer=False,
+    )
 
-booker_agent = create_agent(
-    model=model,
-    name="booker",
-    tools=[book_flight, book_hotel, search_hotels],
-    response_format=ToolStrategy(BookerAgentResponseModel),
-    system_prompt=BOOKER_AGENT_SYSTEM_PROMPT,
-)
 
+@lru_cache(maxsize=None)
+def get_requirements_agent():
+    return _build_agent(
+        "requirements",
+        [
+            search_flight_availability,
+            search_connecting_flights,
+            fare_calendar,
+            lookup_location,
+        ],
+        RequirementsUpdateResponseModel,
+        REQUIREMENTS_AGENT_SYSTEM_PROMPT,
+        settings.REQUIREMENTS_AGENT_MODEL,
+    )
 
-if __name__ == "__main__":
-    for chunk in requirements_agent.stream(
+
+@lru_cache(maxsize=None)
+def get_planning_agent():
+    return _build_agent(
+        "planning",
+        [],
+        PlanningAgentResponseModel,
+        PLANNING_AGENT_SYSTEM_PROMPT,
+        settings.PLANNING_AGENT_MODEL,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_planner_agent():
+    return _build_agent(
+        "planner",
+        [web_search],
+        PlannerAgentResponseModel,
+        PLANNER_AGENT_SYSTEM_PROMPT,
+        settings.PLANNER_AGENT_MODEL,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_booker_agent():
+    return _build_agent(
+        "booker",
+        [book_flight, book_hotel, search_hotels],
+        BookerAgentResponseModel,
+        BOOKER_AGENT_SYSTEM_PROMPT,
+        settings.BOOKER_AGENT_MODEL,
+    )
+
+
+def build_agents() -> None:
+    """Build every agent now rather than on first use, e.g. at startup."""
+    get_requirements_agent()
+    get_planning_agent()
+    get_planner_agent()
+    get_booker_agent()
+
+
+async def main():
+    async for chunk in get_requirements_agent().astream(
         input={"messages": ["I want to go to Tokyo from Tokyo on October 26th, 2025."]},
         stream_mode="updates",
     ):
         print(chunk)
+    await convex_client.aclose()
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    asyncio.run(main())
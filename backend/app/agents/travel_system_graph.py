@@ -1,23 +1,41 @@
+import asyncio
 import json
+from functools import lru_cache
 from typing import Optional
-import os
 
 from langchain.messages import HumanMessage, AIMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.types import Command, interrupt
+from langgraph.types import Command
 from langchain_core.runnables import RunnableConfig
 
-from app.agents.requirements_graph import compiled_graph as requirements_graph
 from app.agents.travel_system_agents import (
-    planner_agent,
-    booker_agent,
-    planning_agent,
+    build_agents,
+    get_planner_agent,
+    get_booker_agent,
+    get_planning_agent,
+)
+from app.agents.requirements_graph import (
+    RequirementsGraphState,
+    get_requirements_graph,
+    interrupt_in_context,
+)
+from app.agents.booking_executor import execute_bookings
+from app.agents.handoff import compact_json, serialize_requirements
+from app.agents.itinerary_cache import append_days, itinerary_cache
+from app.agents.query_planning import heuristic_plan, generic_plan
+from app.agents.response_models.planning_agent import PlanningAgentResponseModel
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.checkpointer import get_checkpointer
+from app.core.convex import convex_client
+
+
+plan_cache = TTLCache(
+    "query_plan",
+    maxsize=settings.PLANNING_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PLANNING_CACHE_TTL_SECONDS,
 )
-from app.agents.requirements_graph import RequirementsGraphState
-
-
-checkpointer = InMemorySaver()
 
 
 class TravelSystemState(MessagesState):
@@ -33,53 +51,72 @@ class TravelSystemState(MessagesState):
     bookings: Optional[dict]  # Bookings dict from booker agent
 
 
-def planning_node(state: TravelSystemState) -> TravelSystemState:
+async def planning_node(
+    state: TravelSystemState, config: Optional[RunnableConfig] = None
+) -> TravelSystemState:
     """
     Analyze the user's travel query and decompose it into a structured plan.
-    This helps the requirements gathering agent understand multi-part queries better.
+    Runs alongside the requirements subgraph; how the plan is produced depends
+    on PLANNING_MODE, and plans are cached per thread and query.
     """
     # Get the user's initial message
     messages = state.get("messages", [])
-    if not messages:
+    if not messages or settings.PLANNING_MODE == "off":
         return {"plan": None, "sub_queries": None}
 
-    user_message = messages[-1].content if messages else ""
+    user_message = messages[-1].content
+    thread_id = (config or {}).get("configurable", {}).get("thread_id")
+    cache_key = (thread_id, " ".join(user_message.split()).casefold())
 
-    # Optional stub mode to avoid LLM calls during verification
-    if os.getenv("PLANNING_STUB", "0") == "1":
-        plan = (
-            "Analyze user query, identify destinations, dates, preferences, and create "
-            "focused sub-queries to guide requirements gathering and itinerary planning."
-        )
-        sub_queries = [
-            f"{user_message} – destinations & regions",
-            f"{user_message} – dates & duration",
-            f"{user_message} – activities & interests",
-        ]
-    else:
-        # Invoke planning agent
-        planning_prompt = f"""Analyze the following travel query and create a structured plan:
+    structured = await plan_cache.get_or_load(
+        cache_key, lambda: _build_plan(user_message, config)
+    )
+
+    return {
+        "plan": structured.plan if structured else "No plan generated",
+        "sub_queries": structured.sub_queries if structured else [],
+    }
+
+
+async def _build_plan(
+    user_message: str, config: Optional[RunnableConfig]
+) -> Optional[PlanningAgentResponseModel]:
+    mode = settings.PLANNING_MODE
+    if mode not in ("heuristic", "llm", "auto"):
+        raise ValueError(f"Unknown PLANNING_MODE: {mode}")
+
+    if mode != "llm":
+        structured = heuristic_plan(user_message)
+        if structured is not None:
+            return structured
+        if mode == "heuristic":
+            return generic_plan(user_message)
+
+    # Invoke planning agent
+    planning_prompt = f"""Analyze the following travel query and create a structured plan:
 
 Query: {user_message}
 
 Decompose it into specific search aspects and sub-queries that will help gather all necessary information."""
 
-        response = planning_agent.invoke(
-            {"messages": [HumanMessage(content=planning_prompt)]}
-        )
+    response = await get_planning_agent().ainvoke(
+        {"messages": [HumanMessage(content=planning_prompt)]}, config
+    )
+    return response.get("structured_response")
 
-        structured = response.get("structured_response")
-        plan = structured.plan if structured else "No plan generated"
-        sub_queries = structured.sub_queries if structured else []
 
-    return {
-        "messages": [AIMessage(content=f"Plan: {plan}", name="planner_node")],
-        "plan": plan,
-        "sub_queries": sub_queries,
-    }
+def _interrupt_message(interrupt_value) -> str:
+    """Text of the first interrupt in a graph result or state snapshot."""
+    if isinstance(interrupt_value, (list, tuple)) and len(interrupt_value) > 0:
+        # Extract the interrupt value - could be a dict or string
+        interrupt_obj = interrupt_value[0]
+        if hasattr(interrupt_obj, "value"):
+            return str(interrupt_obj.value)
+        return str(interrupt_obj)
+    return str(interrupt_value)
 
 
-def requirements_subgraph_node(
+async def requirements_subgraph_node(
     state: TravelSystemState, config: RunnableConfig
 ) -> TravelSystemState:
     """
@@ -87,173 +124,250 @@ def requirements_subgraph_node(
     The subgraph shares 'messages' and 'requirements' state with parent.
 
     Propagates interrupts to the top-level graph so the API can handle them.
-    When resuming from an interrupt, resumes the subgraph with user input.
+    Each run of this node raises at most one interrupt: LangGraph replays
+    every earlier resume value when a node is re-run, so a second question is
+    left pending in the subgraph and this node is routed back to itself to ask
+    it (see route_after_requirements).
     """
     # Extract parent's thread_id from config and derive subgraph thread_id
     # RunnableConfig is dict-like with "configurable" key containing thread_id
     configurable = config.get("configurable", {}) if config else {}
     parent_thread_id = configurable.get("thread_id", "main-thread")
     subgraph_thread_id = f"{parent_thread_id}-requirements"
-    subgraph_config = {"configurable": {"thread_id": subgraph_thread_id}}
-
-    # Check if we have a pending interrupt by trying to get resume value
-    # If we're resuming, the previous interrupt() call will return the resume value
-    # We need to structure this so we can capture it
-    # First, try normal invocation
-    subgraph_state = RequirementsGraphState(
-        messages=state["messages"],
-        requirements_complete=False,
-        interruption_message="",
-        requirements=state.get("requirements"),
-    )
+    subgraph_config = {
+        "configurable": {"thread_id": subgraph_thread_id},
+        # Forward callbacks so streamed runs also see the subgraph's LLM tokens
+        "callbacks": config.get("callbacks") if config else None,
+    }
 
-    subgraph_result = requirements_graph.invoke(
-        subgraph_state,
-        subgraph_config,
-    )
+    # A question is still pending if the subgraph is interrupted and has seen
+    # every parent message; a new user message starts a fresh subgraph run
+    snapshot = await get_requirements_graph().aget_state(subgraph_config)
+    known_ids = {message.id for message in snapshot.values.get("messages", [])}
+    if snapshot.interrupts and all(m.id in known_ids for m in state["messages"]):
+        subgraph_result = {"__interrupt__": snapshot.interrupts}
+    else:
+        subgraph_state = RequirementsGraphState(
+            messages=state["messages"],
+            requirements_complete=False,
+            interruption_message="",
+            requirements=state.get("requirements"),
+        )
+        subgraph_result = await get_requirements_graph().ainvoke(
+            subgraph_state,
+            subgraph_config,
+        )
 
     # Check if subgraph has an interrupt - propagate it to top level
     if "__interrupt__" in subgraph_result:
-        # Extract interrupt message
-        interrupt_value = subgraph_result["__interrupt__"]
-        if isinstance(interrupt_value, list) and len(interrupt_value) > 0:
-            # Extract the interrupt value - could be a dict or string
-            interrupt_obj = interrupt_value[0]
-            if hasattr(interrupt_obj, "value"):
-                interrupt_message = str(interrupt_obj.value)
-            else:
-                interrupt_message = str(interrupt_obj)
-        else:
-            interrupt_message = str(interrupt_value)
+        interrupt_message = _interrupt_message(subgraph_result["__interrupt__"])
 
         # Propagate interrupt to top-level graph using interrupt()
         # This will pause the top-level graph and return the interrupt to the API
         # When resumed, interrupt() will return the resume value
-        user_response = interrupt(interrupt_message)
+        user_response = interrupt_in_context(interrupt_message, config)
 
         # If we get here, we're resuming - resume the subgraph with user response
-        subgraph_result = requirements_graph.invoke(
+        subgraph_result = await get_requirements_graph().ainvoke(
             Command(resume=user_response),
             subgraph_config,
         )
 
-        # Check again for interrupts (subgraph might need more info)
+        # The subgraph needs more info: leave its question pending and
+        # re-enter this node to ask it
         if "__interrupt__" in subgraph_result:
-            interrupt_value = subgraph_result["__interrupt__"]
-            if isinstance(interrupt_value, list) and len(interrupt_value) > 0:
-                interrupt_obj = interrupt_value[0]
-                if hasattr(interrupt_obj, "value"):
-                    interrupt_message = str(interrupt_obj.value)
-                else:
-                    interrupt_message = str(interrupt_obj)
-            else:
-                interrupt_message = str(interrupt_value)
-
-            # Propagate the new interrupt
-            interrupt(interrupt_message)
+            return {"requirements": None}
 
     # No interrupt, execution completed - extract requirements
     requirements = subgraph_result.get("requirements")
 
     # The result contains 'requirements' field populated when complete
+    # plan/sub_queries are left to the planning node running alongside this one
     return {
-        "messages": [AIMessage(content=json.dumps(requirements), name="requirements")],
-        "plan": state.get("plan"),
-        "sub_queries": state.get("sub_queries"),
+        "messages": [
+            AIMessage(
+                content=serialize_requirements(requirements, "requirements"),
+                name="requirements",
+            )
+        ],
         "requirements": requirements,
         "itinerary": None,
         "bookings": None,
     }
 
 
-def planner_agent_node(state: TravelSystemState) -> TravelSystemState:
+def route_after_requirements(state: TravelSystemState, next_stage):
+    """Loop back while requirements are incomplete, otherwise go to next_stage."""
+    if state.get("requirements") is None:
+        return "requirements_subgraph"
+    return next_stage
+
+
+async def planner_agent_node(
+    state: TravelSystemState, config: RunnableConfig
+) -> TravelSystemState:
     """
     Invoke planner agent to create itinerary based on requirements.
     """
     requirements = state.get("requirements")
 
-    # Format requirements into context message for planner
-    requirements_str = json.dumps(requirements, indent=2)
+    # Same destination, length, interests and season as an earlier trip:
+    # reuse its days, re-dated, and only plan the days it doesn't cover
+    cached = await itinerary_cache.lookup(requirements)
+    if cached is not None and cached.missing == 0:
+        itinerary = {"days": cached.days}
+        return {
+            "messages": [AIMessage(content=compact_json(itinerary), name="planner")],
+            "itinerary": itinerary,
+        }
+
+    # Only the fields the planner uses, as compact JSON
+    requirements_str = serialize_requirements(requirements, "planner")
     planner_prompt = f"""Based on the following travel requirements, create a day-by-day itinerary:
-    
+
 {requirements_str}"""
+    if cached is not None:
+        planned = [
+            activity["name"] for day in cached.days for activity in day["activities"]
+        ]
+        planner_prompt += f"""
+
+The first {len(cached.days)} days are already planned with: {compact_json(planned)}.
+Only create the remaining {cached.missing} day(s), starting on the day after day {len(cached.days)}, without repeating those activities."""
 
     # Invoke planner agent
-    response = planner_agent.invoke(
-        {"messages": [HumanMessage(content=planner_prompt)]}
+    response = await get_planner_agent().ainvoke(
+        {"messages": [HumanMessage(content=planner_prompt)]}, config
     )
 
     itinerary = response["structured_response"].itinerary.model_dump()
+    if cached is not None:
+        itinerary = {
+            "days": append_days(cached.days, itinerary["days"], requirements)
+        }
+    await itinerary_cache.store(requirements, itinerary)
 
+    # Only write this stage's own key; the booker may be running in parallel
     return {
-        "messages": [AIMessage(content=json.dumps(itinerary), name="planner")],
-        "plan": state.get("plan"),
-        "sub_queries": state.get("sub_queries"),
-        "requirements": requirements,
+        "messages": [AIMessage(content=compact_json(itinerary), name="planner")],
         "itinerary": itinerary,
-        "bookings": None,
     }
 
 
-def booker_agent_node(state: TravelSystemState) -> TravelSystemState:
+async def booker_agent_node(
+    state: TravelSystemState, config: RunnableConfig
+) -> TravelSystemState:
     """
-    Invoke booker agent to book flights and hotels based on requirements and itinerary.
+    Book flights and hotels based on requirements.
+    Everything it needs (flight ID, destination, dates) is in the requirements,
+    so it runs in parallel with the planner. Bookings are made directly from
+    the requirements when possible; the booker agent only handles the cases
+    the deterministic executor can't.
     """
     requirements = state.get("requirements")
     itinerary = state.get("itinerary")
 
+    if settings.BOOKING_MODE != "llm":
+        executed = await execute_bookings(requirements)
+        if executed is not None:
+            bookings = executed.model_dump()
+            return {
+                "messages": [AIMessage(content=compact_json(bookings), name="booker")],
+                "bookings": bookings,
+            }
+
     # Format booking context
-    requirements_str = json.dumps(requirements, indent=2)
-    itinerary_str = json.dumps(itinerary, indent=2)
+    requirements_str = serialize_requirements(requirements, "booker")
+    itinerary_section = (
+        f"""
 
-    booker_prompt = f"""Based on the following requirements and itinerary, book the flights and hotels:
+ITINERARY:
+{compact_json(itinerary)}"""
+        if itinerary
+        else ""
+    )
 
-REQUIREMENTS:
-{requirements_str}
+    booker_prompt = f"""Based on the following requirements, book the flights and hotels:
 
-ITINERARY:
-{itinerary_str}
+REQUIREMENTS:
+{requirements_str}{itinerary_section}
 
 Extract the flight ID from the confirmed flight in requirements and book it.
-For hotels, use the destination city and dates from the itinerary or requirements to book a hotel.
+For hotels, use the destination city and dates from the requirements to book a hotel.
+Call book_flight and search_hotels together in your first response so they run at the same time.
 Return booking confirmations for both flight and hotel."""
 
     # Invoke booker agent
-    response = booker_agent.invoke({"messages": [HumanMessage(content=booker_prompt)]})
+    response = await get_booker_agent().ainvoke(
+        {"messages": [HumanMessage(content=booker_prompt)]}, config
+    )
 
     # Extract structured bookings from response
     bookings = response["structured_response"].bookings.model_dump()
 
     return {
-        "messages": [AIMessage(content=json.dumps(bookings), name="booker")],
-        "plan": state.get("plan"),
-        "sub_queries": state.get("sub_queries"),
-        "requirements": requirements,
-        "itinerary": itinerary,
+        "messages": [AIMessage(content=compact_json(bookings), name="booker")],
         "bookings": bookings,
     }
 
 
-# Build the graph
-graph = StateGraph(TravelSystemState)
+def build_travel_system_graph(
+    parallel_stages: bool = True, saver: Optional[BaseCheckpointSaver] = None
+):
+    """
+    Build and compile the travel system graph.
 
-graph.add_node("planning", planning_node)
-graph.add_node("requirements_subgraph", requirements_subgraph_node)
-graph.add_node("planner", planner_agent_node)
-graph.add_node("booker", booker_agent_node)
+    Planning always runs alongside requirements gathering. With parallel_stages,
+    the planner and booker fan out once requirements are complete and join at
+    the end; otherwise they run one after the other (planner, then booker).
+    `saver` defaults to the shared checkpointer.
+    """
+    graph = StateGraph(TravelSystemState)
+
+    graph.add_node("planning", planning_node)
+    graph.add_node("requirements_subgraph", requirements_subgraph_node)
+    graph.add_node("planner", planner_agent_node)
+    graph.add_node("booker", booker_agent_node)
+
+    # Planning runs in parallel with requirements gathering, so it never
+    # delays the first question to the user and is not re-run on resume
+    graph.add_edge(START, "planning")
+    graph.add_edge(START, "requirements_subgraph")
+    graph.add_edge("planning", END)
+
+    if parallel_stages:
+        graph.add_conditional_edges(
+            "requirements_subgraph",
+            lambda state: route_after_requirements(state, ["planner", "booker"]),
+            ["requirements_subgraph", "planner", "booker"],
+        )
+        graph.add_edge("planner", END)
+    else:
+        graph.add_conditional_edges(
+            "requirements_subgraph",
+            lambda state: route_after_requirements(state, "planner"),
+            ["requirements_subgraph", "planner"],
+        )
+        graph.add_edge("planner", "booker")
+    graph.add_edge("booker", END)
 
-# Define flow
-graph.add_edge(START, "planning")
-graph.add_edge("planning", "requirements_subgraph")
-graph.add_edge("requirements_subgraph", "planner")
-graph.add_edge("planner", "booker")
-graph.add_edge("booker", END)
+    return graph.compile(checkpointer=saver or get_checkpointer())
 
-# Compile the graph
-travel_system_graph = graph.compile(checkpointer=checkpointer)
 
+@lru_cache(maxsize=None)
+def get_travel_system_graph():
+    """The compiled travel system graph, built on first use."""
+    return build_travel_system_graph()
 
-if __name__ == "__main__":
+
+def build_graphs() -> None:
+    """Build both graphs and every agent now instead of on first use."""
+    get_requirements_graph()
+    get_travel_system_graph()
+    build_agents()
+
+
+async def main():
     initial_state = TravelSystemState(
         messages=[
             HumanMessage(
@@ -270,7 +384,7 @@ if __name__ == "__main__":
     config = {"configurable": {"thread_id": "thread-1"}}
 
     # Invoke the graph - interrupt loop is now handled inside requirements_subgraph_node
-    result = travel_system_graph.invoke(initial_state, config)
+    result = await get_travel_system_graph().ainvoke(initial_state, config)
 
     print("\n=== FINAL RESULTS ===")
     print(f"Plan: {result.get('plan')}")
@@ -278,3 +392,8 @@ if __name__ == "__main__":
     print(f"\nRequirements: {json.dumps(result.get('requirements'), indent=2)}")
     print(f"\nItinerary: {json.dumps(result.get('itinerary'), indent=2)}")
     print(f"\nBookings: {json.dumps(result.get('bookings'), indent=2)}")
+    await convex_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
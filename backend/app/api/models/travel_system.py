@@ -9,6 +9,8 @@ class TravelSystemChatRequest(BaseModel):
     message: str
     thread_id: str
     resume: bool = False
+    # Return a per-request breakdown of node, LLM, tool and upstream timings
+    timings: bool = False
 
 
 class TravelSystemChatResponse(BaseModel):
@@ -19,3 +21,4 @@ class TravelSystemChatResponse(BaseModel):
     requirements: Optional[CompleteRequirements] = None
     itinerary: Optional[Itinerary] = None
     bookings: Optional[Bookings] = None
+    timings: Optional[dict] = None  # Set when the request asked for timings
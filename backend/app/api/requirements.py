@@ -10,7 +10,7 @@ router = APIRouter()
 
 @router.post("/chat", response_model=RequirementsChatResponse)
 async def requirements_chat(request: RequirementsChatRequest):
-    message, is_interrupt, requirements = process_requirements_chat(
+    message, is_interrupt, requirements = await process_requirements_chat(
         request.message, request.thread_id, request.resume
     )
 
@@ -3,21 +3,21 @@ from typing import Tuple, Optional
 from langchain_core.messages import HumanMessage
 from langgraph.types import Command
 
-from app.agents.requirements_graph import compiled_graph
+from app.agents.requirements_graph import get_requirements_graph
 from app.agents.response_models.requirements_agent import CompleteRequirements
 
 
-def process_requirements_chat(
+async def process_requirements_chat(
     message: str, thread_id: str, resume: bool
 ) -> Tuple[str, bool, Optional[CompleteRequirements]]:
     config = {"configurable": {"thread_id": thread_id}}
 
     if resume:
         state = Command(resume=message)
-        result = compiled_graph.invoke(state, config)
+        result = await get_requirements_graph().ainvoke(state, config)
     else:
         initial_state = {"messages": [HumanMessage(content=message)]}
-        result = compiled_graph.invoke(initial_state, config)
+        result = await get_requirements_graph().ainvoke(initial_state, config)
 
     if "__interrupt__" in result:
         interrupt_value = result["__interrupt__"]
@@ -1,19 +1,22 @@
-from typing import Tuple, Optional
-from langchain_core.messages import HumanMessage
+import json
+from contextlib import nullcontext
+from typing import AsyncIterator, Tuple, Optional, Union
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
 from langgraph.types import Command
-import os
 
 from app.agents.travel_system_graph import (
-    travel_system_graph,
+    get_travel_system_graph,
     TravelSystemState,
     planning_node,
 )
 from app.agents.response_models.requirements_agent import CompleteRequirements
 from app.agents.response_models.planner_agent import Itinerary
 from app.agents.response_models.booker_agent import Bookings
+from app.config import settings
+from app.core.metrics import RequestTrace, request_trace
 
 
-def process_travel_system_chat(
+async def process_travel_system_chat(
     message: str, thread_id: str, resume: bool
 ) -> Tuple[
     str,
@@ -31,8 +34,10 @@ def process_travel_system_chat(
         Tuple of (message, is_interrupt, plan, sub_queries, requirements, itinerary, bookings)
     """
     try:
-        # Optional planning-only mode for verification without LLM quota
-        if os.getenv("PLANNING_ONLY", "0") == "1":
+        config = {"configurable": {"thread_id": thread_id}}
+
+        # Planning-only mode for verification without LLM quota (see PLANNING_ONLY)
+        if settings.PLANNING_ONLY:
             initial_state = TravelSystemState(
                 messages=[HumanMessage(content=message)],
                 plan=None,
@@ -41,7 +46,7 @@ def process_travel_system_chat(
                 itinerary=None,
                 bookings=None,
             )
-            planned = planning_node(initial_state)
+            planned = await planning_node(initial_state, config)
             return (
                 "✓ Query plan created",
                 False,
@@ -52,32 +57,16 @@ def process_travel_system_chat(
                 None,
             )
 
-        config = {"configurable": {"thread_id": thread_id}}
-
-        if resume:
-            # Resume execution with user input
-            result = travel_system_graph.invoke(
-                Command(resume=message),
-                config,
-            )
-        else:
-            # Initial invocation
-            initial_state = TravelSystemState(
-                messages=[HumanMessage(content=message)],
-                plan=None,
-                sub_queries=None,
-                requirements=None,
-                itinerary=None,
-                bookings=None,
-            )
-            result = travel_system_graph.invoke(initial_state, config)
+        result = await get_travel_system_graph().ainvoke(
+            _graph_input(message, resume), config
+        )
     except Exception as e:
         import traceback
 
         error_msg = str(e)
         error_type = type(e).__name__
         traceback.print_exc()
-        print(f"\n❌ ERROR in travel_system_graph.invoke: {error_type}: {error_msg}\n")
+        print(f"\n❌ ERROR in travel_system_graph.ainvoke: {error_type}: {error_msg}\n")
 
         # Return error message to user
         return (
@@ -90,6 +79,35 @@ def process_travel_system_chat(
             None,
         )
 
+    return _unpack_result(result)
+
+
+def _graph_input(message: str, resume: bool) -> Union[Command, TravelSystemState]:
+    if resume:
+        # Resume execution with user input
+        return Command(resume=message)
+
+    # Initial invocation
+    return TravelSystemState(
+        messages=[HumanMessage(content=message)],
+        plan=None,
+        sub_queries=None,
+        requirements=None,
+        itinerary=None,
+        bookings=None,
+    )
+
+
+def _unpack_result(result: dict) -> Tuple[
+    str,
+    bool,
+    Optional[str],
+    Optional[list],
+    Optional[CompleteRequirements],
+    Optional[Itinerary],
+    Optional[Bookings],
+]:
+    """Turn a graph result (state values plus any "__interrupt__") into the chat response tuple."""
     # Check if there's an interrupt
     if "__interrupt__" in result:
         # Extract interrupt message
@@ -167,3 +185,131 @@ def process_travel_system_chat(
         itinerary,
         bookings,
     )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_travel_system_chat(
+    message: str, thread_id: str, resume: bool, timings: bool = False
+) -> AsyncIterator[str]:
+    """
+    Stream a travel system chat turn as Server-Sent Events.
+
+    Events:
+        node_start / node_end: a pipeline stage began or finished
+        token: a streamed LLM token
+        message: a complete (non-streamed) AI message
+        tool_call / tool_result: an agent called a tool, and its output
+        interrupt: the graph needs more input from the user
+        done: final payload, same shape as the /chat response
+        error: the run failed
+    """
+    with request_trace() if timings else nullcontext() as trace:
+        async for event in _stream_events(message, thread_id, resume, trace):
+            yield event
+
+
+async def _stream_events(
+    message: str, thread_id: str, resume: bool, trace: Optional[RequestTrace]
+) -> AsyncIterator[str]:
+    config = {"configurable": {"thread_id": thread_id}}
+    interrupt_value = None
+
+    try:
+        async for namespace, mode, payload in get_travel_system_graph().astream(
+            _graph_input(message, resume),
+            config,
+            stream_mode=["tasks", "messages", "updates"],
+            subgraphs=True,
+        ):
+            if mode == "tasks":
+                # Only report top-level pipeline stages, not agent-internal steps
+                if namespace:
+                    continue
+                if "input" in payload:
+                    yield _sse("node_start", {"node": payload["name"]})
+                else:
+                    yield _sse(
+                        "node_end",
+                        {"node": payload["name"], "error": payload.get("error")},
+                    )
+
+            elif mode == "messages":
+                chunk, metadata = payload
+                stage = (
+                    namespace[0].split(":")[0]
+                    if namespace
+                    else metadata.get("langgraph_node")
+                )
+                for event, data in _message_events(chunk):
+                    yield _sse(event, {"stage": stage, **data})
+
+            elif mode == "updates" and not namespace and "__interrupt__" in payload:
+                interrupt_value = list(payload["__interrupt__"])
+                interrupt_obj = interrupt_value[0]
+                yield _sse(
+                    "interrupt",
+                    {"message": str(getattr(interrupt_obj, "value", interrupt_obj))},
+                )
+
+        state = await get_travel_system_graph().aget_state(config)
+        result = dict(state.values)
+        if interrupt_value:
+            result["__interrupt__"] = interrupt_value
+        message, is_interrupt, plan, sub_queries, requirements, itinerary, bookings = (
+            _unpack_result(result)
+        )
+        yield _sse(
+            "done",
+            {
+                "message": message,
+                "is_interrupt": is_interrupt,
+                "plan": plan,
+                "sub_queries": sub_queries,
+                "requirements": requirements.model_dump() if requirements else None,
+                "itinerary": itinerary.model_dump() if itinerary else None,
+                "bookings": bookings.model_dump() if bookings else None,
+                "timings": trace.to_dict() if trace else None,
+            },
+        )
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        yield _sse("error", {"message": f"Error: {type(e).__name__} - {e}"})
+
+
+def _message_events(message) -> list[tuple[str, dict]]:
+    """Map a message from the graph's "messages" stream to SSE events."""
+    if isinstance(message, ToolMessage):
+        return [
+            ("tool_result", {"name": message.name, "content": message.content})
+        ]
+
+    events = []
+    if isinstance(message, AIMessageChunk):
+        if message.content:
+            events.append(("token", {"content": message.content}))
+        # Only the first chunk of a tool call carries its name
+        for tool_chunk in message.tool_call_chunks:
+            if tool_chunk.get("name"):
+                events.append(
+                    ("tool_call", {"name": tool_chunk["name"], "id": tool_chunk["id"]})
+                )
+    elif isinstance(message, AIMessage):
+        if message.content:
+            events.append(("message", {"content": message.content}))
+        for tool_call in message.tool_calls:
+            events.append(
+                (
+                    "tool_call",
+                    {
+                        "name": tool_call["name"],
+                        "id": tool_call["id"],
+                        "args": tool_call["args"],
+                    },
+                )
+            )
+    return events
@@ -1,9 +1,16 @@
+from contextlib import nullcontext
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from app.api.models.travel_system import (
     TravelSystemChatRequest,
     TravelSystemChatResponse,
 )
-from app.api.services.travel_system_service import process_travel_system_chat
+from app.api.services.travel_system_service import (
+    process_travel_system_chat,
+    stream_travel_system_chat,
+)
+from app.core.metrics import request_trace
 
 router = APIRouter()
 
@@ -14,9 +21,12 @@ async def travel_system_chat(request: TravelSystemChatRequest):
     Chat endpoint for the full travel system pipeline.
     Handles requirements gathering, itinerary planning, and bookings.
     """
-    message, is_interrupt, plan, sub_queries, requirements, itinerary, bookings = (
-        process_travel_system_chat(request.message, request.thread_id, request.resume)
-    )
+    with request_trace() if request.timings else nullcontext() as trace:
+        message, is_interrupt, plan, sub_queries, requirements, itinerary, bookings = (
+            await process_travel_system_chat(
+                request.message, request.thread_id, request.resume
+            )
+        )
 
     return TravelSystemChatResponse(
         message=message,
@@ -26,4 +36,21 @@ async def travel_system_chat(request: TravelSystemChatRequest):
         requirements=requirements,
         itinerary=itinerary,
         bookings=bookings,
+        timings=trace.to_dict() if trace else None,
+    )
+
+
+@router.post("/stream")
+async def travel_system_stream(request: TravelSystemChatRequest):
+    """
+    Streaming variant of /chat using Server-Sent Events.
+    Emits stage, token, tool and interrupt events as they happen, then a
+    final "done" event with the same payload as /chat.
+    """
+    return StreamingResponse(
+        stream_travel_system_chat(
+            request.message, request.thread_id, request.resume, request.timings
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
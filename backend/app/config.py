@@ -13,18 +13,152 @@ class Settings(BaseModel):
 
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL_NAME: str = "gpt-4.1"
+    OPENAI_SMALL_MODEL_NAME: str = "gpt-4.1-mini"
     CONVEX_BASE_URL: str = ""
 
+    # Chat model per agent: small, large, auto (small first, escalating to
+    # large on invalid structured output or complex turns) or a model name
+    PLANNING_AGENT_MODEL: str = "small"
+    REQUIREMENTS_AGENT_MODEL: str = "auto"
+    PLANNER_AGENT_MODEL: str = "auto"
+    BOOKER_AGENT_MODEL: str = "small"
+    # Routed turns with a longer prompt than this go straight to the large model
+    MODEL_ROUTER_MAX_SMALL_TOKENS: int = 6000
+
+    # Convex HTTP client pool
+    CONVEX_CONNECT_TIMEOUT: float = 5.0
+    CONVEX_READ_TIMEOUT: float = 10.0
+    CONVEX_POOL_SIZE: int = 20
+    CONVEX_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Flight/hotel search result cache
+    SEARCH_CACHE_TTL_SECONDS: float = 300.0
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+
+    # Graph checkpointer (sqlite or memory)
+    CHECKPOINTER_BACKEND: str = "sqlite"
+    CHECKPOINT_DB_PATH: str = "checkpoints.sqlite"
+    CHECKPOINT_MAX_PER_THREAD: int = 5
+    CHECKPOINT_THREAD_TTL_SECONDS: float = 7 * 24 * 3600
+    CHECKPOINT_COMPACT_INTERVAL_SECONDS: float = 3600.0
+
+    # Query planning: off, heuristic, llm, or auto (heuristic first, LLM fallback)
+    PLANNING_MODE: str = "auto"
+    PLANNING_CACHE_TTL_SECONDS: float = 3600.0
+    PLANNING_CACHE_MAX_ENTRIES: int = 1024
+    # Answer chat requests with the query plan only, skipping the graph; with
+    # PLANNING_MODE=heuristic this verifies planning without any LLM calls
+    PLANNING_ONLY: bool = False
+
+    # Booking stage: auto (book directly from requirements, LLM fallback) or llm
+    BOOKING_MODE: str = "auto"
+
+    # Requirements agent context: recent turns kept verbatim, tool result summaries kept
+    REQUIREMENTS_WINDOW_TURNS: int = 3
+    REQUIREMENTS_MAX_TOOL_NOTES: int = 8
+
+    # Answers to requirements questions: auto (rule-based extraction, agent fallback) or llm
+    REQUIREMENTS_EXTRACTION_MODE: str = "auto"
+
+    # Planner itinerary cache (0 entries disables it)
+    ITINERARY_CACHE_PATH: str = "itinerary_cache.sqlite"
+    ITINERARY_CACHE_MAX_ENTRIES: int = 2000
+    ITINERARY_CACHE_TTL_SECONDS: float = 30 * 24 * 3600
+
+    # Planner web search: duckduckgo or stub (offline canned results)
+    WEB_SEARCH_BACKEND: str = "duckduckgo"
+    WEB_SEARCH_CACHE_PATH: str = "web_search_cache.sqlite"
+    WEB_SEARCH_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    WEB_SEARCH_CACHE_MAX_ENTRIES: int = 10000
+    WEB_SEARCH_RATE_PER_SECOND: float = 1.0
+    WEB_SEARCH_BURST: int = 3
+    WEB_SEARCH_MAX_RESULTS: int = 4
+    WEB_SEARCH_SNIPPET_CHARS: int = 300
+
+    # Chat model response cache, memory LRU in front of SQLite (0 entries disables it)
+    LLM_CACHE_PATH: str = "llm_cache.sqlite"
+    LLM_CACHE_MAX_ENTRIES: int = 0
+    LLM_CACHE_MEMORY_ENTRIES: int = 256
+    LLM_CACHE_TTL_SECONDS: float = 24 * 3600
+
+    # When agents and graphs are built: startup (before serving), background
+    # (on a thread once the server is up) or lazy (on first request)
+    AGENT_BUILD_MODE: str = "background"
+
+    # Convex reference data (cities, countries, routes)
+    REFERENCE_DATA_SNAPSHOT_PATH: str = "reference_data.json"
+    REFERENCE_DATA_REFRESH_SECONDS: float = 6 * 3600
+
 
 settings = Settings(
     OPENAI_API_KEY=os.getenv("OPENAI_API_KEY") or "",
     OPENAI_MODEL_NAME=os.getenv("OPENAI_MODEL_NAME", "gpt-4.1"),
+    OPENAI_SMALL_MODEL_NAME=os.getenv("OPENAI_SMALL_MODEL_NAME", "gpt-4.1-mini"),
+    PLANNING_AGENT_MODEL=os.getenv("PLANNING_AGENT_MODEL", "small"),
+    REQUIREMENTS_AGENT_MODEL=os.getenv("REQUIREMENTS_AGENT_MODEL", "auto"),
+    PLANNER_AGENT_MODEL=os.getenv("PLANNER_AGENT_MODEL", "auto"),
+    BOOKER_AGENT_MODEL=os.getenv("BOOKER_AGENT_MODEL", "small"),
+    MODEL_ROUTER_MAX_SMALL_TOKENS=int(os.getenv("MODEL_ROUTER_MAX_SMALL_TOKENS", "6000")),
     CONVEX_BASE_URL=os.getenv("CONVEX_BASE_URL") or "",
+    CONVEX_CONNECT_TIMEOUT=float(os.getenv("CONVEX_CONNECT_TIMEOUT", "5.0")),
+    CONVEX_READ_TIMEOUT=float(os.getenv("CONVEX_READ_TIMEOUT", "10.0")),
+    CONVEX_POOL_SIZE=int(os.getenv("CONVEX_POOL_SIZE", "20")),
+    CONVEX_KEEPALIVE_EXPIRY=float(os.getenv("CONVEX_KEEPALIVE_EXPIRY", "30.0")),
+    SEARCH_CACHE_TTL_SECONDS=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300")),
+    SEARCH_CACHE_MAX_ENTRIES=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+    CHECKPOINTER_BACKEND=os.getenv("CHECKPOINTER_BACKEND", "sqlite"),
+    CHECKPOINT_DB_PATH=os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite"),
+    CHECKPOINT_MAX_PER_THREAD=int(os.getenv("CHECKPOINT_MAX_PER_THREAD", "5")),
+    CHECKPOINT_THREAD_TTL_SECONDS=float(
+        os.getenv("CHECKPOINT_THREAD_TTL_SECONDS", str(7 * 24 * 3600))
+    ),
+    CHECKPOINT_COMPACT_INTERVAL_SECONDS=float(
+        os.getenv("CHECKPOINT_COMPACT_INTERVAL_SECONDS", "3600")
+    ),
+    PLANNING_MODE=os.getenv("PLANNING_MODE", "auto"),
+    PLANNING_CACHE_TTL_SECONDS=float(os.getenv("PLANNING_CACHE_TTL_SECONDS", "3600")),
+    PLANNING_CACHE_MAX_ENTRIES=int(os.getenv("PLANNING_CACHE_MAX_ENTRIES", "1024")),
+    PLANNING_ONLY=os.getenv("PLANNING_ONLY", "0") == "1",
+    BOOKING_MODE=os.getenv("BOOKING_MODE", "auto"),
+    REQUIREMENTS_WINDOW_TURNS=int(os.getenv("REQUIREMENTS_WINDOW_TURNS", "3")),
+    REQUIREMENTS_MAX_TOOL_NOTES=int(os.getenv("REQUIREMENTS_MAX_TOOL_NOTES", "8")),
+    REQUIREMENTS_EXTRACTION_MODE=os.getenv("REQUIREMENTS_EXTRACTION_MODE", "auto"),
+    ITINERARY_CACHE_PATH=os.getenv("ITINERARY_CACHE_PATH", "itinerary_cache.sqlite"),
+    ITINERARY_CACHE_MAX_ENTRIES=int(os.getenv("ITINERARY_CACHE_MAX_ENTRIES", "2000")),
+    ITINERARY_CACHE_TTL_SECONDS=float(
+        os.getenv("ITINERARY_CACHE_TTL_SECONDS", str(30 * 24 * 3600))
+    ),
+    WEB_SEARCH_BACKEND=os.getenv("WEB_SEARCH_BACKEND", "duckduckgo"),
+    WEB_SEARCH_CACHE_PATH=os.getenv("WEB_SEARCH_CACHE_PATH", "web_search_cache.sqlite"),
+    WEB_SEARCH_CACHE_TTL_SECONDS=float(
+        os.getenv("WEB_SEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+    ),
+    WEB_SEARCH_CACHE_MAX_ENTRIES=int(os.getenv("WEB_SEARCH_CACHE_MAX_ENTRIES", "10000")),
+    WEB_SEARCH_RATE_PER_SECOND=float(os.getenv("WEB_SEARCH_RATE_PER_SECOND", "1.0")),
+    WEB_SEARCH_BURST=int(os.getenv("WEB_SEARCH_BURST", "3")),
+    WEB_SEARCH_MAX_RESULTS=int(os.getenv("WEB_SEARCH_MAX_RESULTS", "4")),
+    WEB_SEARCH_SNIPPET_CHARS=int(os.getenv("WEB_SEARCH_SNIPPET_CHARS", "300")),
+    LLM_CACHE_PATH=os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite"),
+    LLM_CACHE_MAX_ENTRIES=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "0")),
+    LLM_CACHE_MEMORY_ENTRIES=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256")),
+    LLM_CACHE_TTL_SECONDS=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600))),
+    AGENT_BUILD_MODE=os.getenv("AGENT_BUILD_MODE", "background"),
+    REFERENCE_DATA_SNAPSHOT_PATH=os.getenv(
+        "REFERENCE_DATA_SNAPSHOT_PATH", "reference_data.json"
+    ),
+    REFERENCE_DATA_REFRESH_SECONDS=float(
+        os.getenv("REFERENCE_DATA_REFRESH_SECONDS", str(6 * 3600))
+    ),
 )
 
-# Fail fast if essential keys are missing
-if not settings.OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY environment variable not set.")
 
-if not settings.CONVEX_BASE_URL:
-    raise ValueError("CONVEX_BASE_URL environment variable not set.")
+def check_required_settings() -> None:
+    """
+    Fail fast if essential keys are missing. Called at app startup rather
+    than on import, so tools and tests can import the app without them.
+    """
+    if not settings.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY environment variable not set.")
+
+    if not settings.CONVEX_BASE_URL:
+        raise ValueError("CONVEX_BASE_URL environment variable not set.")
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+_caches: dict[str, "TTLCache | SqliteTTLCache"] = {}
+
+
+class _LoadCancelled(Exception):
+    """Set on an in-flight load whose caller was cancelled; waiters load again."""
+
+
+class SingleFlight:
+    """
+    Runs at most one load per key at a time: callers asking for a key whose
+    load is in flight wait for its result instead of loading it again. If
+    the loading caller is cancelled, one of the waiters starts a new load.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.set_exception(_LoadCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a fixed TTL.
+    `get_or_load` coalesces concurrent misses for the same key so only one
+    upstream load runs while the other callers wait for its result.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches[name] = self
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, loading it at most once concurrently."""
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        async def load() -> Any:
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return await self._single_flight.run(key, load)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which predicate(key, value) is true."""
+        with self._lock:
+            stale = [k for k, (_, v) in self._entries.items() if predicate(k, v)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._single_flight.coalesced,
+            "evictions": self.evictions,
+        }
+
+
+class SqliteStore:
+    """
+    Base for the persistent caches: one table in a SQLite file in WAL mode,
+    behind a lock. Rows expire ttl_seconds after they are written and the
+    least recently used ones are evicted past maxsize. Subclasses give the
+    table's `schema`, which needs `created_at` and `used_at` columns. Methods
+    block; call them through asyncio.to_thread from async code.
+    """
+
+    table: str
+    schema: str
+
+    def __init__(self, path: str, maxsize: int, ttl_seconds: float):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.executescript(
+                f"""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS {self.table} ({self.schema});
+                CREATE INDEX IF NOT EXISTS {self.table}_used_at ON {self.table} (used_at);
+                """
+            )
+        return self._conn
+
+    def _expire(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE created_at <= ?", (now - self.ttl_seconds,)
+        )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        evicted = conn.execute(
+            f"""
+            DELETE FROM {self.table} WHERE rowid IN (
+                SELECT rowid FROM {self.table} ORDER BY used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.maxsize,),
+        ).rowcount
+        self.evictions += max(evicted, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+
+
+class SqliteTTLCache(SqliteStore):
+    """
+    Persistent key/value cache in a SQLite file, for results worth keeping
+    across restarts. Values are stored as JSON.
+    """
+
+    table = "cache_entries"
+    schema = """
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        used_at REAL NOT NULL
+    """
+
+    def __init__(self, name: str, path: str, maxsize: int, ttl_seconds: float):
+        super().__init__(path, maxsize, ttl_seconds)
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        _caches[name] = self
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            conn.execute(f"UPDATE {self.table} SET used_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+        return True, json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._expire(conn, now)
+            self._evict(conn)
+            conn.commit()
+
+    def stats(self) -> dict:
+        return {
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def cache_stats(name: Optional[str] = None) -> dict:
+    """Return stats for one named cache, or for all registered caches."""
+    if name is not None:
+        return _caches[name].stats()
+    return {cache_name: cache.stats() for cache_name, cache in _caches.items()}
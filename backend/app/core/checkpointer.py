@@ -0,0 +1,193 @@
+import asyncio
+import sqlite3
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from app.config import settings
+
+
+class PersistentSqliteSaver(SqliteSaver):
+    """
+    File-backed checkpointer shared by the travel system and requirements graphs.
+
+    Extends SqliteSaver with:
+    - async methods, run on worker threads so graph ainvoke never blocks the loop
+    - a cap on retained checkpoints per thread (older ones and their writes are dropped)
+    - thread TTL expiry and compaction via `compact()`
+
+    The database runs in WAL mode, so several uvicorn workers can share one file
+    and serve the same thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_checkpoints_per_thread: int,
+        thread_ttl_seconds: float,
+    ):
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        super().__init__(conn)
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.thread_ttl_seconds = thread_ttl_seconds
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS thread_activity (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS thread_activity_updated_at
+                ON thread_activity (updated_at);
+            """
+        )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved_config = super().put(config, checkpoint, metadata, new_versions)
+        configurable = saved_config["configurable"]
+        self._trim_thread(configurable["thread_id"], configurable["checkpoint_ns"])
+        return saved_config
+
+    def _trim_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Record activity and keep only the newest checkpoints of a thread namespace."""
+        # Checkpoint IDs are time-ordered, so the newest sort last
+        keep = """
+            SELECT checkpoint_id FROM checkpoints
+            WHERE thread_id = ? AND checkpoint_ns = ?
+            ORDER BY checkpoint_id DESC LIMIT ?
+        """
+        args = (thread_id, checkpoint_ns, thread_id, checkpoint_ns)
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            for table in ("checkpoints", "writes"):
+                cur.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? "
+                    f"AND checkpoint_id NOT IN ({keep})",
+                    (*args, self.max_checkpoints_per_thread),
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute(
+                "DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),)
+            )
+
+    def expire_threads(self, now: Optional[float] = None) -> int:
+        """Delete every thread idle for longer than the TTL; returns how many."""
+        cutoff = (now or time.time()) - self.thread_ttl_seconds
+        with self.cursor() as cur:
+            cur.execute(
+                "SELECT thread_id FROM thread_activity WHERE updated_at < ?", (cutoff,)
+            )
+            expired = [row[0] for row in cur.fetchall()]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+
+    def compact(self) -> int:
+        """Expire idle threads and return freed pages to the filesystem."""
+        expired = self.expire_threads()
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+        return expired
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes,
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def build_checkpointer() -> BaseCheckpointSaver:
+    """Create the checkpointer selected by CHECKPOINTER_BACKEND (sqlite or memory)."""
+    if settings.CHECKPOINTER_BACKEND == "memory":
+        # Unbounded and process-local; only meant for quick local experiments
+        return InMemorySaver()
+    if settings.CHECKPOINTER_BACKEND != "sqlite":
+        raise ValueError(
+            f"Unknown CHECKPOINTER_BACKEND: {settings.CHECKPOINTER_BACKEND}"
+        )
+    return PersistentSqliteSaver(
+        settings.CHECKPOINT_DB_PATH,
+        max_checkpoints_per_thread=settings.CHECKPOINT_MAX_PER_THREAD,
+        thread_ttl_seconds=settings.CHECKPOINT_THREAD_TTL_SECONDS,
+    )
+
+
+async def run_checkpoint_compaction(interval_seconds: float) -> None:
+    """Periodically expire idle threads and compact the checkpoint database."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        checkpointer = get_checkpointer()
+        if isinstance(checkpointer, PersistentSqliteSaver):
+            try:
+                expired = await asyncio.to_thread(checkpointer.compact)
+                print(f"Checkpoint compaction expired {expired} thread(s)")
+            except sqlite3.Error as e:
+                print(f"Checkpoint compaction failed: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_checkpointer() -> BaseCheckpointSaver:
+    """The checkpointer shared by both graphs, opened on first use."""
+    return build_checkpointer()
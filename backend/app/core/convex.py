@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+from app.core.metrics import observe_latency
+
+
+class ConvexClient:
+    """
+    Shared HTTP client for the Convex flight and hotel API.
+    Keeps pooled keep-alive connections for both sync and async callers and
+    records per-endpoint latency under "convex <METHOD> <path>".
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float,
+        read_timeout: float,
+        pool_size: int,
+        keepalive_expiry: float,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.Client] = None
+        # One per event loop: an AsyncClient's pool is bound to the loop it
+        # was first used on, and can only be closed from that loop
+        self._async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                base_url=self.base_url, timeout=self._timeout, limits=self._limits
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        The current event loop's client. Scripts calling asyncio.run() should
+        `await aclose()` before the loop ends; a closed loop's client can no
+        longer be closed, and is only dropped here.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            for other in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[other]
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self._timeout, limits=self._limits
+            )
+        return client
+
+    def get(self, path: str, params: Optional[dict] = None) -> dict:
+        return self._request("GET", path, params=params)
+
+    def post(self, path: str, payload: dict) -> dict:
+        return self._request("POST", path, json=payload)
+
+    async def aget(self, path: str, params: Optional[dict] = None) -> dict:
+        return await self._arequest("GET", path, params=params)
+
+    async def apost(self, path: str, payload: dict) -> dict:
+        return await self._arequest("POST", path, json=payload)
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        start = time.perf_counter()
+        error = True
+        try:
+            response = self.client.request(method, path, **kwargs)
+            response.raise_for_status()
+            error = False
+            return response.json()
+        finally:
+            observe_latency(
+                f"convex {method} {path}", time.perf_counter() - start, error
+            )
+
+    async def _arequest(self, method: str, path: str, **kwargs) -> dict:
+        start = time.perf_counter()
+        error = True
+        try:
+            response = await self.async_client.request(method, path, **kwargs)
+            response.raise_for_status()
+            error = False
+            return response.json()
+        finally:
+            observe_latency(
+                f"convex {method} {path}", time.perf_counter() - start, error
+            )
+
+    async def aclose(self) -> None:
+        """Close every client, each on the loop it belongs to."""
+        current = asyncio.get_running_loop()
+        clients, self._async_clients = self._async_clients, {}
+        for loop, client in clients.items():
+            if loop is current:
+                await client.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                )
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+convex_client = ConvexClient(
+    base_url=settings.CONVEX_BASE_URL,
+    connect_timeout=settings.CONVEX_CONNECT_TIMEOUT,
+    read_timeout=settings.CONVEX_READ_TIMEOUT,
+    pool_size=settings.CONVEX_POOL_SIZE,
+    keepalive_expiry=settings.CONVEX_KEEPALIVE_EXPIRY,
+)
@@ -1,11 +1,51 @@
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
 from app.config import settings
+from app.core.llm_cache import LLMResponseCache, build_llm_cache
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
-model = ChatOpenAI(
-    model=settings.OPENAI_MODEL_NAME,
-    api_key=settings.OPENAI_API_KEY,
-    temperature=0,
-    streaming=True,
-)
+
+@lru_cache(maxsize=None)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Identical calls are answered from the cache when it is enabled; None
+    leaves caching off (no global LangChain cache is set). Keys include the
+    model name, so every model shares it.
+    """
+    return build_llm_cache(
+        settings.LLM_CACHE_PATH,
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    )
+
+
+def chat_model(model_name: str) -> "ChatOpenAI":
+    """A chat model with the shared settings and response cache."""
+    # Imported here: the OpenAI SDK is slow to import and only needed once an agent is built
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model_name,
+        api_key=settings.OPENAI_API_KEY,
+        temperature=0,
+        streaming=True,
+        # Streamed responses report their token usage too, for the cost metrics
+        stream_usage=True,
+        cache=get_llm_cache(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_model() -> "ChatOpenAI":
+    """The large model, built on first use."""
+    return chat_model(settings.OPENAI_MODEL_NAME)
+
+
+@lru_cache(maxsize=None)
+def get_small_model() -> "ChatOpenAI":
+    """The small, fast model for simple stages and routed turns, built on first use."""
+    return chat_model(settings.OPENAI_SMALL_MODEL_NAME)
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import sqlite3
+import warnings
+from typing import Any, Optional
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from app.core.cache import SqliteTTLCache, TTLCache
+
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache of chat model responses: an in-process LRU in front of a
+    SQLite file, both with the same TTL.
+
+    LangChain looks entries up by the serialized prompt messages (system
+    prompt included) and the model string, which carries the model name,
+    temperature and bound tools, and so the structured-output schema too.
+    Both are hashed into one key. Only worth enabling for temperature 0.
+    """
+
+    def __init__(self, memory: TTLCache, disk: SqliteTTLCache):
+        self.memory = memory
+        self.disk = disk
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    @staticmethod
+    def _decode(serialized: str) -> RETURN_VAL_TYPE:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            generations = loads(serialized, allowed_objects="core")
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            # A replayed response costs no tokens
+            if message is not None:
+                message.usage_metadata = None
+        return generations
+
+    def _lookup_memory(self, key: str) -> Optional[str]:
+        hit, serialized = self.memory.get(key)
+        return serialized if hit else None
+
+    def _lookup_disk(self, key: str) -> Optional[str]:
+        try:
+            hit, serialized = self.disk.get(key)
+        except sqlite3.Error as e:
+            print(f"LLM cache unavailable: {e}")
+            return None
+        if not hit:
+            return None
+        self.memory.set(key, serialized)
+        return serialized
+
+    def _store_disk(self, key: str, serialized: str) -> None:
+        try:
+            self.disk.set(key, serialized)
+        except sqlite3.Error as e:
+            print(f"Could not cache LLM response: {e}")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.key(prompt, llm_string)
+        serialized = self._lookup_memory(key) or self._lookup_disk(key)
+        return self._decode(serialized) if serialized else None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self.key(prompt, llm_string)
+        serialized = dumps(return_val)
+        self.memory.set(key, serialized)
+        self._store_disk(key, serialized)
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.key(prompt, llm_string)
+        serialized = self._lookup_memory(key) or await asyncio.to_thread(
+            self._lookup_disk, key
+        )
+        return self._decode(serialized) if serialized else None
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        key = self.key(prompt, llm_string)
+        serialized = dumps(return_val)
+        self.memory.set(key, serialized)
+        await asyncio.to_thread(self._store_disk, key, serialized)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+
+def build_llm_cache(
+    path: str, max_entries: int, memory_entries: int, ttl_seconds: float
+) -> Optional[LLMResponseCache]:
+    """The response cache for the shared model, or None when max_entries is 0."""
+    if max_entries <= 0:
+        return None
+    return LLMResponseCache(
+        memory=TTLCache("llm_memory", maxsize=memory_entries, ttl_seconds=ttl_seconds),
+        disk=SqliteTTLCache(
+            "llm_disk", path=path, maxsize=max_entries, ttl_seconds=ttl_seconds
+        ),
+    )
@@ -0,0 +1,264 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+# Upper bounds (seconds) of the latency histogram buckets, as in Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class LatencyStats:
+    """Running latency totals for a single named operation."""
+
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Observations per bucket in LATENCY_BUCKETS, plus one for anything slower
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds / self.count * 1000, 2)
+            if self.count
+            else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+@dataclass
+class TokenStats:
+    """Running token totals for a single named prompt or message kind."""
+
+    count: int = 0
+    total_tokens: int = 0
+    max_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_tokens": self.total_tokens,
+            "avg_tokens": round(self.total_tokens / self.count, 1) if self.count else 0.0,
+            "max_tokens": self.max_tokens,
+        }
+
+
+@dataclass
+class CostStats:
+    """Running LLM usage and cost for one stage on one model."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    # Calls on a model without a known price add tokens but no cost
+    cost_usd: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+class RequestTrace:
+    """Spans recorded while handling one request, for its timing breakdown."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.spans: list[dict] = []
+
+    def add(self, name: str, seconds: float, error: bool, **extra) -> None:
+        start = time.perf_counter() - seconds - self.started_at
+        span = {
+            "name": name,
+            "start_ms": round(max(start, 0.0) * 1000, 1),
+            "duration_ms": round(seconds * 1000, 1),
+        }
+        if error:
+            span["error"] = True
+        self.spans.append({**span, **extra})
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"]),
+        }
+
+
+_lock = threading.Lock()
+_latencies: dict[str, LatencyStats] = {}
+_tokens: dict[str, TokenStats] = {}
+_costs: dict[tuple[str, str], CostStats] = {}
+_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def observe_latency(name: str, seconds: float, error: bool = False, **extra) -> None:
+    """
+    Record one timed call of the operation `name`. Inside `request_trace()`
+    it is also added to the request's breakdown, with any `extra` fields.
+    """
+    with _lock:
+        stats = _latencies.setdefault(name, LatencyStats())
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.buckets[_bucket_index(seconds)] += 1
+        if error:
+            stats.errors += 1
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(name, seconds, error, **extra)
+
+
+def _bucket_index(seconds: float) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+@contextmanager
+def request_trace() -> Iterator[RequestTrace]:
+    """Collect the spans observed in this context (and tasks it starts)."""
+    trace = RequestTrace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(name: str, **extra) -> Iterator[None]:
+    """Time the block as the operation `name`; exceptions count as errors."""
+    start = time.perf_counter()
+    error = True
+    try:
+        yield
+        error = False
+    finally:
+        observe_latency(name, time.perf_counter() - start, error, **extra)
+
+
+def latency_snapshot() -> dict:
+    """Return a copy of all recorded latency stats keyed by operation name."""
+    with _lock:
+        return {name: stats.to_dict() for name, stats in _latencies.items()}
+
+
+def observe_tokens(name: str, tokens: int) -> None:
+    """Record the token size of one prompt or message of kind `name`."""
+    with _lock:
+        stats = _tokens.setdefault(name, TokenStats())
+        stats.count += 1
+        stats.total_tokens += tokens
+        stats.max_tokens = max(stats.max_tokens, tokens)
+
+
+def token_snapshot() -> dict:
+    """Return a copy of all recorded token stats keyed by name."""
+    with _lock:
+        return {name: stats.to_dict() for name, stats in _tokens.items()}
+
+
+def observe_cost(
+    stage: str,
+    model_name: str,
+    input_tokens: int,
+    output_tokens: int,
+    cost_usd: Optional[float],
+) -> None:
+    """Record one LLM call of `stage` on `model_name` and what it cost."""
+    with _lock:
+        stats = _costs.setdefault((stage, model_name), CostStats())
+        stats.calls += 1
+        stats.input_tokens += input_tokens
+        stats.output_tokens += output_tokens
+        stats.cost_usd += cost_usd or 0.0
+
+
+def cost_snapshot() -> dict:
+    """Return a copy of the LLM cost stats as {stage: {model: stats}}."""
+    with _lock:
+        snapshot: dict[str, dict] = {}
+        for (stage, model_name), stats in _costs.items():
+            snapshot.setdefault(stage, {})[model_name] = stats.to_dict()
+        return snapshot
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(counters: Optional[dict[str, dict[str, dict]]] = None) -> str:
+    """
+    All latency, token and LLM cost metrics in the Prometheus text
+    exposition format. `counters` adds counter families as {metric: {label value: {field: n}}},
+    e.g. the cache stats as travel_cache_{hits,misses,...}_total{name=...}.
+    """
+    with _lock:
+        latencies = {
+            name: (stats.count, stats.errors, stats.total_seconds, list(stats.buckets))
+            for name, stats in _latencies.items()
+        }
+        tokens = {
+            name: (stats.count, stats.total_tokens) for name, stats in _tokens.items()
+        }
+        costs = {key: stats.cost_usd for key, stats in _costs.items()}
+
+    lines = [
+        "# HELP travel_operation_seconds Latency of graph nodes, LLM and tool calls, upstream and HTTP requests.",
+        "# TYPE travel_operation_seconds histogram",
+    ]
+    for name, (count, _, total, buckets) in sorted(latencies.items()):
+        label = f'operation="{_label(name)}"'
+        cumulative = 0
+        for bound, observed in zip(LATENCY_BUCKETS, buckets):
+            cumulative += observed
+            lines.append(f'travel_operation_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'travel_operation_seconds_bucket{{{label},le="+Inf"}} {count}')
+        lines.append(f"travel_operation_seconds_sum{{{label}}} {total}")
+        lines.append(f"travel_operation_seconds_count{{{label}}} {count}")
+
+    lines += [
+        "# HELP travel_operation_errors_total Failed operations.",
+        "# TYPE travel_operation_errors_total counter",
+    ]
+    for name, (_, errors, _, _) in sorted(latencies.items()):
+        lines.append(f'travel_operation_errors_total{{operation="{_label(name)}"}} {errors}')
+
+    lines += [
+        "# HELP travel_tokens Token sizes of prompts, handoffs and LLM calls.",
+        "# TYPE travel_tokens summary",
+    ]
+    for name, (count, total) in sorted(tokens.items()):
+        label = f'name="{_label(name)}"'
+        lines.append(f"travel_tokens_sum{{{label}}} {total}")
+        lines.append(f"travel_tokens_count{{{label}}} {count}")
+
+    lines += [
+        "# HELP travel_llm_cost_usd_total Estimated LLM spend per stage and model.",
+        "# TYPE travel_llm_cost_usd_total counter",
+    ]
+    for (stage, model_name), cost in sorted(costs.items()):
+        lines.append(
+            f'travel_llm_cost_usd_total{{stage="{_label(stage)}",model="{_label(model_name)}"}} {cost}'
+        )
+
+    for metric, by_label in (counters or {}).items():
+        fields = sorted({f for values in by_label.values() for f in values})
+        for f in fields:
+            lines.append(f"# TYPE {metric}_{f}_total counter")
+            for label, values in sorted(by_label.items()):
+                if isinstance(values.get(f), (int, float)):
+                    lines.append(
+                        f'{metric}_{f}_total{{name="{_label(label)}"}} {values[f]}'
+                    )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,22 @@
+from typing import Optional
+
+# USD per 1M input / output tokens, from OpenAI's price list
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+
+def llm_cost(model_name: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """
+    Cost of one call in USD, or None for a model without a known price.
+    Dated snapshots ("gpt-4.1-mini-2025-04-14") are priced as their base model.
+    """
+    matches = [name for name in MODEL_PRICES if model_name.startswith(name)]
+    if not matches:
+        return None
+    input_price, output_price = MODEL_PRICES[max(matches, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
@@ -0,0 +1,275 @@
+import asyncio
+import difflib
+import json
+import os
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+from app.core.convex import convex_client
+
+
+@dataclass(frozen=True)
+class City:
+    name: str
+    airport_code: str
+    country: str
+    country_code: str
+    is_capital: bool = False
+
+
+@dataclass(frozen=True)
+class Country:
+    code: str
+    name: str
+    currency: str
+    timezone: str
+    region: Optional[str] = None
+
+
+def _normalize(text: str) -> str:
+    """Casefold and strip accents so "São Paulo" and "sao paulo" match."""
+    decomposed = unicodedata.normalize("NFKD", text.strip())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class ReferenceData:
+    """
+    In-memory indexes over the Convex /reference/cities, /reference/countries
+    and /reference/routes data. Every lookup is a dict or set access; only a
+    city name that misses the exact index falls back to fuzzy matching.
+    """
+
+    def __init__(self, cities: list[dict], countries: list[dict], routes: list[dict]):
+        self.cities = [
+            City(
+                name=c["name"],
+                airport_code=c["airportCode"].upper(),
+                country=c.get("country", ""),
+                country_code=c.get("countryCode", ""),
+                is_capital=c.get("isCapital", False),
+            )
+            for c in cities
+            if c.get("name") and c.get("airportCode")
+        ]
+        self.countries = [
+            Country(
+                code=c["code"].upper(),
+                name=c.get("name", ""),
+                currency=c.get("currency", ""),
+                timezone=c.get("timezone", ""),
+                region=c.get("region"),
+            )
+            for c in countries
+            if c.get("code")
+        ]
+
+        self.cities_by_code = {city.airport_code: city for city in self.cities}
+        self._cities_by_name = {_normalize(city.name): city for city in self.cities}
+        self._countries = {}
+        for country in self.countries:
+            self._countries[country.code] = country
+            self._countries[_normalize(country.name)] = country
+
+        # Directed adjacency: origin airport -> airports with a direct route
+        self.routes: dict[str, set[str]] = {}
+        for route in routes:
+            origin = route.get("origin", "").upper()
+            destination = route.get("destination", "").upper()
+            if origin and destination:
+                self.routes.setdefault(origin, set()).add(destination)
+
+        self._raw = {"cities": cities, "countries": countries, "routes": routes}
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ReferenceData":
+        return cls(
+            payload.get("cities", []),
+            payload.get("countries", []),
+            payload.get("routes", []),
+        )
+
+    def to_payload(self) -> dict:
+        return self._raw
+
+    def __bool__(self) -> bool:
+        return bool(self.cities or self.routes)
+
+    def lookup_city(self, query: str, cutoff: float = 0.75) -> Optional[City]:
+        """Resolve an IATA code or (possibly misspelled) city name to a city."""
+        city = self.cities_by_code.get(query.strip().upper())
+        if city is not None:
+            return city
+        key = _normalize(query)
+        city = self._cities_by_name.get(key)
+        if city is not None:
+            return city
+        matches = difflib.get_close_matches(key, self._cities_by_name, n=1, cutoff=cutoff)
+        return self._cities_by_name[matches[0]] if matches else None
+
+    def suggest_cities(self, query: str, limit: int = 3) -> list[City]:
+        """Closest city names to query, for "did you mean" answers."""
+        matches = difflib.get_close_matches(
+            _normalize(query), self._cities_by_name, n=limit, cutoff=0.5
+        )
+        return [self._cities_by_name[m] for m in matches]
+
+    def country_info(self, code_or_name: str) -> Optional[Country]:
+        """Look up a country by ISO code or name."""
+        return self._countries.get(code_or_name.strip().upper()) or self._countries.get(
+            _normalize(code_or_name)
+        )
+
+    def country_of(self, city: City) -> Optional[Country]:
+        return self.country_info(city.country_code) or self.country_info(city.country)
+
+    def has_route(self, origin: str, destination: str) -> bool:
+        return destination.upper() in self.routes.get(origin.upper(), ())
+
+    def destinations_from(self, origin: str) -> set[str]:
+        return self.routes.get(origin.upper(), set())
+
+    def knows_airport(self, code: str) -> bool:
+        code = code.upper()
+        return code in self.cities_by_code or code in self.routes
+
+    def connecting_routes(
+        self, origin: str, destination: str, max_stops: int = 1, limit: int = 5
+    ) -> list[list[str]]:
+        """
+        Breadth-first search for airport paths from origin to destination with
+        at most max_stops intermediate airports, fewest stops first.
+        """
+        origin, destination = origin.upper(), destination.upper()
+        paths = []
+        frontier = [[origin]]
+        for _ in range(max_stops + 1):
+            next_frontier = []
+            for path in frontier:
+                for airport in sorted(self.routes.get(path[-1], ())):
+                    if airport in path:
+                        continue
+                    if airport == destination:
+                        paths.append(path + [airport])
+                        if len(paths) >= limit:
+                            return paths
+                    else:
+                        next_frontier.append(path + [airport])
+            frontier = next_frontier
+        return paths
+
+    def alternative_destinations(self, origin: str, destination: str) -> list[str]:
+        """Other airports in the destination's country with a direct route from origin."""
+        city = self.cities_by_code.get(destination.upper())
+        if city is None:
+            return []
+        return sorted(
+            code
+            for code in self.destinations_from(origin)
+            if code != city.airport_code
+            and code in self.cities_by_code
+            and self.cities_by_code[code].country_code == city.country_code
+        )
+
+
+class ReferenceDataStore:
+    """
+    Holds the current ReferenceData. Loads it from Convex, keeps a JSON snapshot
+    on disk so a restart (or a Convex outage) still has data, and refreshes it
+    in the background.
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        self._data = ReferenceData([], [], [])
+        self._loaded = False
+        self._attempted = False
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def data(self) -> ReferenceData:
+        """Current indexes; empty until the first load."""
+        return self._data
+
+    async def get(self) -> ReferenceData:
+        """
+        Return the indexes, loading them on first use. Only the first call
+        waits on a failed load; later retries are left to the background refresh.
+        """
+        if not self._attempted:
+            async with self._get_lock():
+                if not self._attempted:
+                    await self.refresh()
+                    self._attempted = True
+        return self._data
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def refresh(self) -> bool:
+        """
+        Reload from Convex and rewrite the snapshot. If Convex is unreachable and
+        nothing is loaded yet, fall back to the snapshot. Returns True on a
+        successful Convex load.
+        """
+        try:
+            cities, countries, routes = await asyncio.gather(
+                convex_client.aget("/reference/cities"),
+                convex_client.aget("/reference/countries"),
+                convex_client.aget("/reference/routes"),
+            )
+            data = ReferenceData(
+                cities.get("cities", []),
+                countries.get("countries", []),
+                routes.get("routes", []),
+            )
+        # ValueError: a body that isn't JSON; the rest: JSON of the wrong shape
+        except (httpx.HTTPError, ValueError, KeyError, AttributeError, TypeError) as e:
+            print(f"Reference data refresh failed: {e}")
+            if not self._loaded:
+                self.load_snapshot()
+            return False
+
+        self._data = data
+        self._loaded = True
+        await asyncio.to_thread(self.save_snapshot)
+        return True
+
+    def load_snapshot(self) -> bool:
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Reference data snapshot unavailable: {e}")
+            return False
+        self._data = ReferenceData.from_payload(payload)
+        self._loaded = True
+        return True
+
+    def save_snapshot(self) -> None:
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data.to_payload(), f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Could not write reference data snapshot: {e}")
+
+
+async def run_reference_refresh(interval_seconds: float) -> None:
+    """Load reference data now, then keep refreshing it every interval."""
+    await reference_store.get()
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await reference_store.refresh()
+
+
+reference_store = ReferenceDataStore(settings.REFERENCE_DATA_SNAPSHOT_PATH)
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Optional
+
+from app.config import settings
+
+# tiktoken fetches its encoding files over the network on first use
+_LOAD_TIMEOUT_SECONDS = 10.0
+
+# Encodings by model name, filled in by load_encodings
+_encodings: dict[str, Any] = {}
+
+
+def _load_encoding(model_name: str):
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+async def load_encodings(*model_names: str) -> None:
+    """
+    Load the tiktoken encodings for the models on a thread, once at startup.
+    Until they are loaded (or when they can't be, e.g. offline) token counts
+    are estimated.
+    """
+    for model_name in dict.fromkeys(model_names):
+        try:
+            _encodings[model_name] = await asyncio.wait_for(
+                asyncio.to_thread(_load_encoding, model_name), _LOAD_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            print(f"tiktoken unavailable, estimating token counts: {type(e).__name__}")
+            return
+
+
+def count_tokens(text: str, model_name: Optional[str] = None) -> int:
+    """Token count of text for the model; falls back to ~4 characters per token."""
+    encoding = _encodings.get(model_name or settings.OPENAI_MODEL_NAME)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,135 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from app.core.metrics import observe_cost, observe_latency, observe_tokens
+from app.core.pricing import llm_cost
+
+
+class SpanCallbackHandler(BaseCallbackHandler):
+    """
+    Records a span for every graph node ("node planner", "node
+    requirements_agent/model"), LLM call ("llm planner", with the model,
+    input/output tokens and estimated cost) and tool call ("tool search_flight_availability") through
+    `observe_latency`, so they land in the histograms and request traces.
+
+    Agents call their model without the node's callback parent, so LLM and
+    tool calls are attributed to the node they run under through a context
+    variable set when the node starts (node callbacks run inline, before
+    LangGraph copies the context for the node body).
+    """
+
+    # Run synchronously in the caller so timings aren't skewed by scheduling
+    run_inline = True
+
+    def __init__(self):
+        # run ID -> (span name, start time, node label to restore on node end)
+        self._runs: dict[UUID, tuple[str, float, Optional[str]]] = {}
+
+    def _start(self, run_id, span_name, restore: Optional[str] = None) -> None:
+        self._runs[run_id] = (span_name, time.perf_counter(), restore)
+
+    def _end(self, run_id, error: bool, **extra) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        span_name, start, restore = run
+        if span_name.startswith("node "):
+            _current_node.set(restore)
+        observe_latency(span_name, time.perf_counter() - start, error, **extra)
+
+    def on_chain_start(
+        self,
+        serialized,
+        inputs,
+        *,
+        run_id: UUID,
+        metadata: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or kwargs.get("name") != node:
+            return
+        namespace = (metadata or {}).get("langgraph_checkpoint_ns") or node
+        label = "/".join(part.split(":")[0] for part in namespace.split("|"))
+        current = _current_node.get()
+        # An agent named after the node that runs it is not a node of its own
+        if label == current:
+            return
+        _current_node.set(label)
+        self._start(run_id, f"node {label}", restore=current)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=False)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        # Interrupts end a node's run normally
+        self._end(run_id, error=type(error).__name__ != "GraphInterrupt")
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        node = _current_node.get()
+        self._start(run_id, f"llm {node.split('/')[0] if node else 'unknown'}")
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self.on_chat_model_start(serialized, prompts, run_id=run_id)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = {}
+        model_name = (response.llm_output or {}).get("model_name")
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                metadata = getattr(message, "response_metadata", None) or {}
+                model_name = model_name or metadata.get("model_name")
+                for key, value in (getattr(message, "usage_metadata", None) or {}).items():
+                    if key in ("input_tokens", "output_tokens"):
+                        usage[key] = usage.get(key, 0) + value
+        run = self._runs.get(run_id)
+        extra = dict(usage)
+        if run is not None:
+            for key, value in usage.items():
+                observe_tokens(f"{run[0]} {key.removesuffix('_tokens')}", value)
+            # Cached responses carry no usage and cost nothing
+            if model_name and usage:
+                input_tokens = usage.get("input_tokens", 0)
+                output_tokens = usage.get("output_tokens", 0)
+                cost = llm_cost(model_name, input_tokens, output_tokens)
+                stage = run[0].removeprefix("llm ")
+                observe_cost(stage, model_name, input_tokens, output_tokens, cost)
+                if cost is not None:
+                    extra["cost_usd"] = round(cost, 6)
+        if model_name:
+            extra["model"] = model_name
+        self._end(run_id, error=False, **extra)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=True)
+
+    def on_tool_start(
+        self, serialized, input_str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "unknown")
+        self._start(run_id, f"tool {name}")
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=False)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=True)
+
+
+_current_node: ContextVar[Optional[str]] = ContextVar("current_node", default=None)
+
+span_handler = SpanCallbackHandler()
+
+# Every LangChain/LangGraph run in the process gets the handler
+_span_handler_var: ContextVar[Optional[SpanCallbackHandler]] = ContextVar(
+    "span_handler", default=span_handler
+)
+register_configure_hook(_span_handler_var, inheritable=True)
@@ -1,9 +1,79 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.requirements import router as requirements_router
 from app.api.travel_system import router as travel_system_router
+from app.config import check_required_settings, settings
+from app.agents.itinerary_cache import itinerary_cache
+from app.agents.travel_system_graph import build_graphs
+from app.core.cache import cache_stats
+from app.core.checkpointer import run_checkpoint_compaction
+from app.core.convex import convex_client
+from app.core.metrics import (
+    cost_snapshot,
+    latency_snapshot,
+    observe_latency,
+    prometheus_text,
+    span,
+    token_snapshot,
+)
+from app.core.reference_data import run_reference_refresh
+from app.core.tokens import load_encodings
+
+# Registers the span handler on every LangChain/LangGraph run
+import app.core.tracing  # noqa: F401
+
+
+async def build_graphs_now() -> None:
+    """Build the agents and both graphs, on a thread so requests aren't stalled."""
+    with span("startup build graphs"):
+        await asyncio.to_thread(build_graphs)
+
+
+async def build_graphs_in_background() -> None:
+    try:
+        await build_graphs_now()
+    except Exception as e:
+        # Whatever failed is built again on first use, and fails there visibly
+        print(f"Building agents and graphs failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_required_settings()
+    # Agents and graphs: before serving, on a thread while serving, or on first use
+    if settings.AGENT_BUILD_MODE not in ("startup", "background", "lazy"):
+        raise ValueError(f"Unknown AGENT_BUILD_MODE: {settings.AGENT_BUILD_MODE}")
+    graphs_built = None
+    if settings.AGENT_BUILD_MODE == "startup":
+        await build_graphs_now()
+    elif settings.AGENT_BUILD_MODE == "background":
+        graphs_built = asyncio.create_task(build_graphs_in_background())
+    compaction = asyncio.create_task(
+        run_checkpoint_compaction(settings.CHECKPOINT_COMPACT_INTERVAL_SECONDS)
+    )
+    reference_refresh = asyncio.create_task(
+        run_reference_refresh(settings.REFERENCE_DATA_REFRESH_SECONDS)
+    )
+    # Token counts are estimated until the encodings are in
+    encodings = asyncio.create_task(
+        load_encodings(settings.OPENAI_MODEL_NAME, settings.OPENAI_SMALL_MODEL_NAME)
+    )
+    yield
+    encodings.cancel()
+    if graphs_built is not None:
+        graphs_built.cancel()
+    compaction.cancel()
+    reference_refresh.cancel()
+    # Release pooled Convex connections on shutdown
+    await convex_client.aclose()
+
 
-app = FastAPI(title="Multi-Agent Travel Planner", version="0.1.0")
+app = FastAPI(title="Multi-Agent Travel Planner", version="0.1.0", lifespan=lifespan)
 
 # Add CORS middleware to allow frontend connections
 app.add_middleware(
@@ -14,6 +84,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    # Streaming responses are timed up to their headers, not the whole stream
+    start = time.perf_counter()
+    error = True
+    try:
+        response = await call_next(request)
+        error = response.status_code >= 500
+        return response
+    finally:
+        # Only matched routes get their own label, so unknown paths can't grow
+        # the metric set (no route here takes path parameters)
+        path = request.url.path if request.scope.get("route") else "unmatched"
+        observe_latency(
+            f"http {request.method} {path}", time.perf_counter() - start, error
+        )
+
+
 app.include_router(
     requirements_router, prefix="/api/requirements", tags=["requirements"]
 )
@@ -30,6 +119,8 @@ async def root():
         "endpoints": {
             "docs": "/docs",
             "travel_system_chat": "/api/travel-system/chat",
+            "travel_system_stream": "/api/travel-system/stream",
+            "metrics": "/metrics",
         },
     }
 
@@ -39,6 +130,32 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/stats")
+async def stats():
+    return {
+        "latency": latency_snapshot(),
+        "tokens": token_snapshot(),
+        "llm_costs": cost_snapshot(),
+        "caches": cache_stats(),
+        "itinerary_cache": itinerary_cache.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Latency histograms, token totals, LLM cost and cache counters for Prometheus."""
+    caches = {**cache_stats(), "itinerary": itinerary_cache.stats()}
+    counted = ("hits", "partial_hits", "misses", "coalesced", "evictions")
+    return prometheus_text(
+        counters={
+            "travel_cache": {
+                name: {key: value for key, value in stats.items() if key in counted}
+                for name, stats in caches.items()
+            }
+        }
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
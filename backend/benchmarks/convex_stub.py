@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Convex HTTP API, for benchmarks.
+
+Serves the endpoints the backend calls (flights, hotels, bookings and the
+reference data) with the data shapes from the README, generated from a fixed
+seed so runs are reproducible. Scale it with --flights and --hotels.
+
+    python benchmarks/convex_stub.py --port 8765 --flights 5000 --hotels 500
+    CONVEX_BASE_URL=http://127.0.0.1:8765 uvicorn app.main:app
+
+The pipeline benchmark starts one in-process with `start_stub_server`.
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+# (city, airport, country, country code, currency, timezone)
+SEED_CITIES = [
+    ("Tokyo", "NRT", "Japan", "JP", "JPY", "Asia/Tokyo"),
+    ("Osaka", "KIX", "Japan", "JP", "JPY", "Asia/Tokyo"),
+    ("Seoul", "ICN", "South Korea", "KR", "KRW", "Asia/Seoul"),
+    ("Busan", "PUS", "South Korea", "KR", "KRW", "Asia/Seoul"),
+    ("Bangkok", "BKK", "Thailand", "TH", "THB", "Asia/Bangkok"),
+    ("Singapore", "SIN", "Singapore", "SG", "SGD", "Asia/Singapore"),
+    ("Colombo", "CMB", "Sri Lanka", "LK", "LKR", "Asia/Colombo"),
+    ("Dubai", "DXB", "United Arab Emirates", "AE", "AED", "Asia/Dubai"),
+    ("London", "LHR", "United Kingdom", "GB", "GBP", "Europe/London"),
+    ("Paris", "CDG", "France", "FR", "EUR", "Europe/Paris"),
+    ("New York", "JFK", "United States", "US", "USD", "America/New_York"),
+    ("Sydney", "SYD", "Australia", "AU", "AUD", "Australia/Sydney"),
+]
+AIRLINES = ["Cathay Pacific", "Japan Airlines", "Korean Air", "Singapore Airlines", "Emirates"]
+AMENITIES = ["WiFi", "Pool", "Gym", "Spa", "Restaurant", "Bar", "Room Service", "Concierge"]
+HOTEL_BRANDS = ["Hilton", "Shangri-La", "Marriott", "Hyatt", "Novotel", "Ibis"]
+# Flights every dataset has, for the dates used by benchmarks/pipeline.py
+SCENARIO_FLIGHTS = [
+    ("NRT", "ICN", date(2025, 11, 15)),
+    ("ICN", "NRT", date(2025, 11, 18)),
+]
+
+
+def _id(rng: random.Random) -> str:
+    return uuid.UUID(int=rng.getrandbits(128)).hex[:32]
+
+
+def build_dataset(
+    flights: int = 2000,
+    hotels: int = 200,
+    start: date = date(2025, 11, 10),
+    days: int = 30,
+    seed: int = 7,
+) -> dict:
+    """Reference data, routes, flights and hotels in the Convex response shapes."""
+    rng = random.Random(seed)
+    countries = {}
+    cities = []
+    for name, code, country, country_code, currency, timezone in SEED_CITIES:
+        country_id = countries.setdefault(
+            country_code,
+            {
+                "_creationTime": 1758944679147.96,
+                "_id": _id(rng),
+                "code": country_code,
+                "currency": currency,
+                "name": country,
+                "region": timezone.split("/")[0],
+                "timezone": timezone,
+            },
+        )["_id"]
+        cities.append(
+            {
+                "_creationTime": 1758944679147.96,
+                "_id": _id(rng),
+                "airportCode": code,
+                "country": country,
+                "countryCode": country_code,
+                "countryId": country_id,
+                "isCapital": rng.random() < 0.5,
+                "name": name,
+            }
+        )
+    by_code = {city["airportCode"]: city for city in cities}
+
+    # Every city links to a handful of others; NRT <-> ICN always exists
+    routes = {("NRT", "ICN"), ("ICN", "NRT")}
+    codes = list(by_code)
+    for origin in codes:
+        for destination in rng.sample([c for c in codes if c != origin], 4):
+            routes.add((origin, destination))
+    routes = sorted(routes)
+
+    def flight(origin: str, destination: str, flight_date: date) -> dict:
+        departure = f"{rng.randint(5, 22):02d}:{rng.choice(['00', '15', '30', '45'])}"
+        duration = rng.randint(90, 720)
+        depart_minutes = int(departure[:2]) * 60 + int(departure[3:])
+        arrive_minutes = (depart_minutes + duration) % (24 * 60)
+        return {
+            "_creationTime": 1758949497662.85,
+            "_id": _id(rng),
+            "aircraft": rng.choice(["Airbus A350", "Boeing 787", "Airbus A321"]),
+            "airline": rng.choice(AIRLINES),
+            "arrivalTime": f"{arrive_minutes // 60:02d}:{arrive_minutes % 60:02d}",
+            "availableSeats": rng.choice([0] + [rng.randint(1, 250)] * 9),
+            "currency": "USD",
+            "departureTime": departure,
+            "destination": {
+                "airport": destination,
+                "city": by_code[destination]["name"],
+                "country": by_code[destination]["country"],
+            },
+            "destinationCityId": by_code[destination]["_id"],
+            "duration": duration,
+            "flightDate": flight_date.isoformat(),
+            "flightNumber": f"{rng.choice('CJKSE')}{rng.choice('AXLQK')}{rng.randint(100, 9999)}",
+            "origin": {
+                "airport": origin,
+                "city": by_code[origin]["name"],
+                "country": by_code[origin]["country"],
+            },
+            "originCityId": by_code[origin]["_id"],
+            "price": rng.randint(120, 1400),
+        }
+
+    # The benchmark scenarios' outbound and return dates always have options
+    flight_rows = [
+        flight(origin, destination, flight_date)
+        for origin, destination, flight_date in SCENARIO_FLIGHTS
+        for _ in range(3)
+    ]
+    for i in range(max(0, flights - len(flight_rows))):
+        origin, destination = routes[i % len(routes)]
+        flight_rows.append(
+            flight(origin, destination, start + timedelta(days=rng.randrange(days)))
+        )
+
+    hotel_rows = []
+    for i in range(hotels):
+        city = cities[i % len(cities)]
+        stars = rng.randint(2, 5)
+        hotel_rows.append(
+            {
+                "_creationTime": 1758949497662.92,
+                "_id": _id(rng),
+                "address": f"{rng.randint(1, 999)} Main Street, {city['airportCode']}",
+                "airportCode": city["airportCode"],
+                "amenities": rng.sample(AMENITIES, rng.randint(2, len(AMENITIES))),
+                "availableRooms": rng.randint(0, 80),
+                "city": city["name"],
+                "cityId": city["_id"],
+                "country": city["country"],
+                "currency": "USD",
+                "description": f"Luxury {stars}-star hotel in the heart of the city with modern amenities and excellent service.",
+                "name": f"{rng.choice(HOTEL_BRANDS)} {city['airportCode']} {i // len(cities) + 1}",
+                "pricePerNight": rng.randint(40, 120) * stars,
+                "starRating": stars,
+            }
+        )
+
+    return {
+        "cities": cities,
+        "countries": list(countries.values()),
+        "routes": [{"origin": o, "destination": d} for o, d in routes],
+        "flights": flight_rows,
+        "hotels": hotel_rows,
+    }
+
+
+def create_app(dataset: dict, latency_ms: float = 0.0) -> FastAPI:
+    """A FastAPI app answering like Convex from `dataset`, with optional added latency."""
+    app = FastAPI(title="Convex stub")
+    flights_by_route: dict[tuple[str, str], list[dict]] = {}
+    for flight in dataset["flights"]:
+        key = (flight["origin"]["airport"], flight["destination"]["airport"])
+        flights_by_route.setdefault(key, []).append(flight)
+    hotels_by_city: dict[str, list[dict]] = {}
+    for hotel in dataset["hotels"]:
+        hotels_by_city.setdefault(hotel["city"].casefold(), []).append(hotel)
+    bookings = {"flights": [], "hotels": []}
+
+    @app.middleware("http")
+    async def add_latency(request: Request, call_next):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+    @app.get("/flights")
+    async def all_flights():
+        return {"flights": dataset["flights"]}
+
+    @app.get("/flights/search")
+    async def search_flights(origin: str, destination: str, date: Optional[str] = None):
+        flights = flights_by_route.get((origin.upper(), destination.upper()), [])
+        if date:
+            flights = [f for f in flights if f["flightDate"] == date]
+        return {"flights": flights}
+
+    @app.post("/flights/book")
+    async def book_flight(request: Request):
+        payload = await request.json()
+        booking = {
+            "bookingId": uuid.uuid4().hex,
+            "bookingReference": f"FL{len(bookings['flights']) + 50000000}",
+            "seatNumber": f"{len(bookings['flights']) % 40 + 1}E",
+            "status": "confirmed",
+        }
+        bookings["flights"].append({**payload, **booking})
+        return {"success": True, "booking": booking}
+
+    @app.get("/hotels")
+    async def all_hotels():
+        return {"hotels": dataset["hotels"]}
+
+    @app.get("/hotels/search")
+    async def search_hotels(
+        city: str, checkIn: Optional[str] = None, checkOut: Optional[str] = None
+    ):
+        return {"hotels": hotels_by_city.get(city.casefold(), [])}
+
+    @app.post("/hotels/book")
+    async def book_hotel(request: Request):
+        payload = await request.json()
+        hotel = next(
+            (h for h in dataset["hotels"] if h["_id"] == payload.get("hotelId")), None
+        )
+        if hotel is None:
+            return {"success": False, "error": "Hotel not found"}
+        nights = max(
+            1,
+            (
+                date.fromisoformat(payload["checkOutDate"])
+                - date.fromisoformat(payload["checkInDate"])
+            ).days,
+        )
+        booking = {
+            "bookingId": uuid.uuid4().hex,
+            "bookingReference": f"HT{len(bookings['hotels']) + 50000000}",
+            "numberOfNights": nights,
+            "status": "confirmed",
+            "totalPrice": hotel["pricePerNight"] * nights,
+        }
+        bookings["hotels"].append({**payload, **booking})
+        return {"success": True, "booking": booking}
+
+    @app.get("/bookings/flights")
+    async def flight_bookings():
+        return {"bookings": bookings["flights"]}
+
+    @app.get("/bookings/hotels")
+    async def hotel_bookings():
+        return {"bookings": bookings["hotels"]}
+
+    @app.get("/reference/cities")
+    async def reference_cities():
+        return {"cities": dataset["cities"]}
+
+    @app.get("/reference/countries")
+    async def reference_countries():
+        return {"countries": dataset["countries"]}
+
+    @app.get("/reference/routes")
+    async def reference_routes():
+        return {"routes": dataset["routes"]}
+
+    return app
+
+
+def start_stub_server(
+    dataset: dict, port: int = 8765, latency_ms: float = 0.0
+) -> uvicorn.Server:
+    """Run the stub on a background thread and wait until it accepts requests."""
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(dataset, latency_ms),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError(f"Convex stub did not start on port {port}")
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--flights", type=int, default=2000)
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Delay added to every response"
+    )
+    args = parser.parse_args()
+
+    dataset = build_dataset(flights=args.flights, hotels=args.hotels)
+    print(
+        f"Convex stub on http://127.0.0.1:{args.port}: {len(dataset['flights'])} flights, "
+        f"{len(dataset['hotels'])} hotels, {len(dataset['routes'])} routes"
+    )
+    uvicorn.run(
+        create_app(dataset, args.latency_ms),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
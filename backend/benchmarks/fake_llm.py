@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Deterministic stand-in for the chat model, for benchmarks.
+
+`FakeChatModel` answers every agent the way a well-behaved model would:
+the requirements agent searches the flight and asks for what is missing,
+the planner batches its web searches and then returns an itinerary, and
+every structured answer is a valid ToolStrategy tool call. Each call waits
+`latency_seconds` to stand in for the provider's response time, and reports
+`model_name` so the cost metrics price it like that model. With
+`invalid_every` set, every Nth answer is a malformed tool call instead, to
+exercise the model router's escalation.
+
+    import app.core.llm
+    fake = FakeChatModel(latency_seconds=0.2)
+    app.core.llm.get_model = app.core.llm.get_small_model = lambda: fake  # before the agents are built
+"""
+
+import asyncio
+import json
+import re
+import uuid
+from datetime import date, timedelta
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+TRAVELER = {
+    "adults": 1,
+    "children": 0,
+    "lead_name": "John Doe",
+    "lead_email": "john@example.com",
+}
+TRIP = {
+    "type": "round_trip",
+    "origin": {"city": "Tokyo", "airport_iata": "NRT"},
+    "destination": {"city": "Seoul", "airport_iata": "ICN"},
+    "depart_date": "2025-11-15",
+    "return_date": "2025-11-18",
+}
+PREFERENCES = {
+    "cabin_class": "economy",
+    "non_stop": True,
+    "max_layovers": 0,
+    "date_flex_days": 0,
+    "interests": ["food", "culture"],
+}
+HOTEL_PREFS = {"stars": "3-5", "area": "central", "room_type": "Deluxe"}
+ACTIVITIES = [
+    ("Gyeongbokgung Palace", "culture"),
+    ("Gwangjang Market", "food"),
+    ("Bukchon Hanok Village", "culture"),
+    ("Myeongdong street food", "food"),
+    ("N Seoul Tower", "scenic"),
+    ("Insadong tea houses", "culture"),
+]
+
+_AMOUNT = re.compile(r"\$\s?(\d[\d,]*)")
+_YES = re.compile(r"\b(yes|yeah|sure|ok|okay|book it|sounds good)\b", re.I)
+_DATE = re.compile(r'"(depart_date|return_date)":"(\d{4}-\d{2}-\d{2})"')
+_CITY = re.compile(r'"destination":"([^"]+)"')
+
+
+def tool_call(name: str, args: dict) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {
+                "name": name,
+                "args": args,
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "tool_call",
+            }
+        ],
+    )
+
+
+def _budget(total: float) -> dict:
+    return {
+        "total_currency": "USD",
+        "total_amount": total,
+        "flights_amount": round(total * 0.4),
+        "hotels_amount": round(total * 0.5),
+    }
+
+
+def _flight_check(options: list[dict]) -> dict:
+    top = options[0] if options else None
+    return {
+        "outbound_query": {
+            "from_iata": TRIP["origin"]["airport_iata"],
+            "to_iata": TRIP["destination"]["airport_iata"],
+            "date": TRIP["depart_date"],
+            "passengers": TRAVELER["adults"],
+            "cabin": PREFERENCES["cabin_class"],
+            "non_stop": PREFERENCES["non_stop"],
+        },
+        "outbound_result": {
+            "available": top is not None,
+            "top_option": top
+            and {
+                key: top[key]
+                for key in (
+                    "flight_id",
+                    "carrier",
+                    "flight_number",
+                    "depart_iso",
+                    "arrive_iso",
+                    "price_usd",
+                )
+            },
+        },
+    }
+
+
+def _known_fields(messages: list[BaseMessage]) -> dict:
+    """The fields in the agent context's "gathered so far" note, if any."""
+    for message in messages:
+        if message.type == "system" and message.text.startswith(
+            "Requirements gathered so far"
+        ):
+            return json.loads(message.text.split("\n", 1)[1].split("\n\n")[0])
+    return {}
+
+
+def respond_requirements(messages: list[BaseMessage], schema: str) -> AIMessage:
+    """
+    Search the flight on a new conversation, then fill in everything the
+    user said. A message mentioning a $ budget and a go-ahead ("book it")
+    completes the requirements in one turn; otherwise the budget and the
+    flight confirmation are asked for one at a time.
+    """
+    humans = [m.text for m in messages if m.type == "human"]
+    latest = humans[-1] if humans else ""
+    known = _known_fields(messages)
+    last = messages[-1]
+    if last.type == "tool" and last.name == "search_flight_availability":
+        update = {
+            "traveler": TRAVELER,
+            "trip": TRIP,
+            "preferences": PREFERENCES,
+            "hotel_prefs": HOTEL_PREFS,
+            "flight_check": _flight_check(json.loads(last.text).get("options", [])),
+        }
+    elif known:
+        update = {}
+    else:
+        return tool_call(
+            "search_flight_availability",
+            {
+                "origin": TRIP["origin"]["airport_iata"],
+                "destination": TRIP["destination"]["airport_iata"],
+                "date": TRIP["depart_date"],
+                "cabin": PREFERENCES["cabin_class"],
+                "top_k": 3,
+            },
+        )
+
+    amount = _AMOUNT.search(latest)
+    if amount:
+        update["budget"] = _budget(float(amount.group(1).replace(",", "")))
+    if _YES.search(latest):
+        update["user_confirmations"] = {"accept_outbound_top_option": True}
+    if "budget" not in update and not known.get("budget"):
+        update["question"] = "What is your total budget for the trip?"
+    elif "user_confirmations" not in update:
+        update["question"] = "Shall I go ahead with the top flight option?"
+    return tool_call(schema, update)
+
+
+def respond_planner(messages: list[BaseMessage], schema: str) -> AIMessage:
+    """Batch the web searches on the first call, then return the day plan."""
+    prompt = next(m.text for m in messages if m.type == "human")
+    if not any(m.type == "tool" for m in messages):
+        city = (_CITY.search(prompt) or [None, "Seoul"])[1]
+        return tool_call(
+            "web_search",
+            {"queries": [f"{city} {topic}" for topic in ("food", "culture", "sights")]},
+        )
+    dates = dict(_DATE.findall(prompt))
+    start = date.fromisoformat(dates.get("depart_date", TRIP["depart_date"]))
+    end = date.fromisoformat(dates.get("return_date", TRIP["return_date"]))
+    remaining = re.search(r"Only create the remaining (\d+) day", prompt)
+    days = int(remaining.group(1)) if remaining else (end - start).days + 1
+    city = (_CITY.search(prompt) or [None, "Seoul"])[1]
+    itinerary = [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "city": city,
+            "activities": [
+                {"name": name, "type": kind}
+                for name, kind in ACTIVITIES[i * 2 % len(ACTIVITIES) :][:2]
+            ],
+        }
+        for i in range(days)
+    ]
+    return tool_call(schema, {"itinerary": {"days": itinerary}})
+
+
+def respond(messages: list[BaseMessage], tool_names: list[str]) -> AIMessage:
+    """The next message for an agent, picked by its structured-output tool."""
+    if "RequirementsUpdateResponseModel" in tool_names:
+        return respond_requirements(messages, "RequirementsUpdateResponseModel")
+    if "PlannerAgentResponseModel" in tool_names:
+        return respond_planner(messages, "PlannerAgentResponseModel")
+    if "PlanningAgentResponseModel" in tool_names:
+        return tool_call(
+            "PlanningAgentResponseModel",
+            {
+                "plan": "Check flights, then plan the stay around the traveler's interests.",
+                "sub_queries": ["flights NRT to ICN", "Seoul food", "Seoul culture"],
+            },
+        )
+    if "BookerAgentResponseModel" in tool_names:
+        return tool_call(
+            "BookerAgentResponseModel",
+            {
+                "bookings": {
+                    "flights": {
+                        "booking_id": "fake-booking",
+                        "status": "confirmed",
+                        "ticket_ref": "FAKE0001",
+                        "flight_id": "fake-flight",
+                    }
+                }
+            },
+        )
+    return AIMessage(content="OK")
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning `respond(...)` after `latency_seconds`; counts its calls."""
+
+    latency_seconds: float = 0.0
+    model_name: str = "fake"
+    invalid_every: int = 0
+    tool_names: list[str] = []
+    calls: list[int] = [0]
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        names = [convert_to_openai_tool(tool)["function"]["name"] for tool in tools]
+        # Copies share `calls`, so the count covers every agent
+        return self.model_copy(update={"tool_names": names})
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        self.calls[0] += 1
+        message = respond(messages, self.tool_names)
+        if self.invalid_every and self.calls[0] % self.invalid_every == 0:
+            message = AIMessage(
+                content="",
+                invalid_tool_calls=[
+                    {
+                        "name": call["name"],
+                        "args": json.dumps(call["args"])[:-1],
+                        "id": call["id"],
+                        "error": "Truncated arguments",
+                        "type": "invalid_tool_call",
+                    }
+                    for call in message.tool_calls
+                ],
+            )
+        message.response_metadata = {"model_name": self.model_name}
+        message.usage_metadata = {
+            "input_tokens": sum(len(m.text) // 4 for m in messages),
+            "output_tokens": len(
+                json.dumps(message.tool_calls or message.invalid_tool_calls)
+            )
+            // 4,
+            "total_tokens": 0,
+        }
+        return message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        message = self._respond(messages)
+        chunk = ChatGenerationChunk(
+            message=AIMessageChunk(
+                content=message.content,
+                tool_call_chunks=[
+                    {
+                        "name": call["name"],
+                        "args": call["args"]
+                        if isinstance(call["args"], str)
+                        else json.dumps(call["args"]),
+                        "id": call["id"],
+                        "index": i,
+                        "type": "tool_call_chunk",
+                    }
+                    for i, call in enumerate(
+                        message.tool_calls or message.invalid_tool_calls
+                    )
+                ],
+                usage_metadata=message.usage_metadata,
+                response_metadata=message.response_metadata,
+            )
+        )
+        if run_manager:
+            await run_manager.on_llm_new_token(message.content, chunk=chunk)
+        yield chunk
+
+    @property
+    def call_count(self) -> int:
+        return self.calls[0]
+
+
+def model_with(
+    latency_seconds: float = 0.0, model_name: str = "fake", invalid_every: int = 0
+) -> FakeChatModel:
+    """A fresh model with its own call counter."""
+    return FakeChatModel(
+        latency_seconds=latency_seconds,
+        model_name=model_name,
+        invalid_every=invalid_every,
+        calls=[0],
+    )
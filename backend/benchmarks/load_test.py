@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Load test for the travel system chat endpoint.
+Run this AFTER starting the backend server.
+
+Measures how many conversations a single worker keeps in flight, and how
+responsive /health stays while chat turns are running.
+
+    python benchmarks/load_test.py --conversations 50
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BACKEND_URL = "http://localhost:8000"
+DEFAULT_MESSAGE = "I want to go to Seoul(ICN) from Tokyo(NRT) on 2025-11-15."
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def chat_turn(base_url, message, timeout):
+    """Send a single fresh chat turn and return its latency in seconds."""
+    payload = {
+        "message": message,
+        "thread_id": f"load-{uuid.uuid4().hex}",
+        "resume": False,
+    }
+    start = time.perf_counter()
+    response = requests.post(
+        f"{base_url}/api/travel-system/chat", json=payload, timeout=timeout
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def probe_health(base_url, stop_event, latencies, interval=0.1):
+    """Poll /health until stop_event is set, recording each latency."""
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        try:
+            requests.get(f"{base_url}/health", timeout=30)
+            latencies.append(time.perf_counter() - start)
+        except requests.exceptions.RequestException:
+            latencies.append(float("inf"))
+        stop_event.wait(interval)
+
+
+def run_phase(base_url, message, conversations, concurrency, timeout):
+    """Run `conversations` chat turns with the given concurrency."""
+    health_latencies = []
+    stop_event = threading.Event()
+    prober = threading.Thread(
+        target=probe_health, args=(base_url, stop_event, health_latencies)
+    )
+    prober.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(chat_turn, base_url, message, timeout)
+            for _ in range(conversations)
+        ]
+        chat_latencies = []
+        errors = 0
+        for future in futures:
+            try:
+                chat_latencies.append(future.result())
+            except Exception:
+                errors += 1
+    wall_time = time.perf_counter() - start
+
+    stop_event.set()
+    prober.join()
+
+    return {
+        "wall_time": wall_time,
+        "throughput": len(chat_latencies) / wall_time if wall_time else 0.0,
+        "chat_p50": percentile(chat_latencies, 50),
+        "chat_p95": percentile(chat_latencies, 95),
+        "health_p50": percentile(health_latencies, 50),
+        "health_p95": percentile(health_latencies, 95),
+        "health_max": max(health_latencies) if health_latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def print_phase(name, stats):
+    print(f"\n{name}")
+    print(f"  wall time:       {stats['wall_time']:.2f}s")
+    print(f"  throughput:      {stats['throughput']:.2f} turns/s")
+    print(f"  chat p50 / p95:  {stats['chat_p50']:.2f}s / {stats['chat_p95']:.2f}s")
+    print(
+        f"  /health p50/p95: {stats['health_p50'] * 1000:.1f}ms / "
+        f"{stats['health_p95'] * 1000:.1f}ms (max {stats['health_max'] * 1000:.1f}ms)"
+    )
+    if stats["errors"]:
+        print(f"  errors:          {stats['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default=BACKEND_URL)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--message", default=DEFAULT_MESSAGE)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Multi-Agent Travel Planner - Load Test")
+    print("=" * 60)
+
+    sequential = run_phase(
+        args.url, args.message, args.conversations, 1, args.timeout
+    )
+    print_phase("Sequential (1 conversation at a time)", sequential)
+
+    concurrent = run_phase(
+        args.url, args.message, args.conversations, args.conversations, args.timeout
+    )
+    print_phase(
+        f"Concurrent ({args.conversations} conversations in flight)", concurrent
+    )
+
+    if concurrent["wall_time"]:
+        speedup = sequential["wall_time"] / concurrent["wall_time"]
+        print(f"\nConcurrency gain: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
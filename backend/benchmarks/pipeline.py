@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the chat pipeline, fully offline.
+
+Starts the Convex stand-in (benchmarks/convex_stub.py), swaps the chat models
+for deterministic fakes (benchmarks/fake_llm.py) and drives the FastAPI
+app in-process through three scenarios:
+
+- one-shot: a single message with everything, including the budget and go-ahead
+- multi-turn: a first message, then the budget, then the flight confirmation
+- concurrent: --users multi-turn conversations at once
+
+Reports p50/p95/p99 latency, throughput and RSS per endpoint and per graph
+node, and the LLM calls, estimated cost and model routing per stage. The
+large and small models are separate fakes priced as the configured models;
+--small-invalid-every makes the small one fail now and then. Checkpoints
+and caches go to a temporary directory.
+
+    python benchmarks/pipeline.py --users 20 --llm-latency-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Optional
+
+BENCHMARKS = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS.parent))
+sys.path.insert(0, str(BENCHMARKS))
+
+import httpx  # noqa: E402
+from langchain_core.callbacks import AsyncCallbackHandler  # noqa: E402
+from langchain_core.tracers.context import register_configure_hook  # noqa: E402
+
+from convex_stub import build_dataset, start_stub_server  # noqa: E402
+from fake_llm import model_with  # noqa: E402
+from load_test import percentile  # noqa: E402
+
+FIRST_MESSAGE = (
+    "I want to go to Seoul(ICN) from Tokyo(NRT) on 2025-11-15 and come back on "
+    "2025-11-18. Economy, non-stop. I like food and culture. John Doe, john@example.com."
+)
+ONE_SHOT_MESSAGE = FIRST_MESSAGE + " My budget is $3000 in total, book the top flight, ok."
+REPLIES = ["$3000 total", "yes"]
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class Recorder:
+    """Latencies, RSS samples and error counts per label."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.rss: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, label: str, seconds: float, error: bool = False) -> None:
+        self.latencies[label].append(seconds)
+        self.rss[label].append(rss_mb())
+        if error:
+            self.errors[label] += 1
+
+
+class NodeTimer(AsyncCallbackHandler):
+    """
+    Times every LangGraph node run. Nodes are labelled by their path through
+    the graphs, e.g. "planner/model" for the model step of the planner agent.
+    """
+
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+        self._started: dict[Any, tuple[str, float]] = {}
+
+    async def on_chain_start(
+        self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or kwargs.get("name") != node:
+            return
+        namespace = (metadata or {}).get("langgraph_checkpoint_ns", node)
+        label = "/".join(part.split(":")[0] for part in namespace.split("|"))
+        # An agent named after the node that runs it is not a node of its own
+        parent = self._started.get(parent_run_id)
+        if parent is not None and parent[0] == label:
+            return
+        self._started[run_id] = (label, time.perf_counter())
+
+    async def _finish(self, run_id, error: bool) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            label, start = started
+            self.recorder.record(label, time.perf_counter() - start, error)
+
+    async def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        await self._finish(run_id, error=False)
+
+    async def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        # Interrupts surface as errors; they end the node's run normally
+        await self._finish(run_id, error=type(error).__name__ != "GraphInterrupt")
+
+
+node_timer_var: ContextVar[Optional[NodeTimer]] = ContextVar(
+    "benchmark_node_timer", default=None
+)
+register_configure_hook(node_timer_var, inheritable=True)
+
+
+async def post(client, recorder, endpoint, message, thread_id, resume) -> dict:
+    """Send one chat turn to `endpoint` and record its latency."""
+    payload = {"message": message, "thread_id": thread_id, "resume": resume}
+    start = time.perf_counter()
+    error = True
+    try:
+        if endpoint == "/api/travel-system/stream":
+            result = {}
+            async with client.stream("POST", endpoint, json=payload) as response:
+                response.raise_for_status()
+                event = None
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event = line.split(":", 1)[1].strip()
+                    elif line.startswith("data:") and event == "done":
+                        result = json.loads(line.split(":", 1)[1])
+        else:
+            response = await client.post(endpoint, json=payload)
+            response.raise_for_status()
+            result = response.json()
+        error = False
+        return result
+    finally:
+        recorder.record(f"POST {endpoint}", time.perf_counter() - start, error)
+
+
+async def conversation(client, recorder, endpoint, messages) -> dict:
+    """Run one conversation; later messages answer the previous question."""
+    thread_id = f"bench-{uuid.uuid4().hex}"
+    start = time.perf_counter()
+    result = {}
+    for i, message in enumerate(messages):
+        result = await post(client, recorder, endpoint, message, thread_id, i > 0)
+        if not result.get("is_interrupt"):
+            break
+    complete = bool(result.get("itinerary") and result.get("bookings"))
+    recorder.record(
+        f"conversation ({len(messages)} message(s))",
+        time.perf_counter() - start,
+        error=not complete,
+    )
+    return result
+
+
+def print_table(title: str, recorder: Recorder, wall_seconds: float) -> None:
+    print(f"\n{title}")
+    print(
+        f"  {'':52} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'per s':>7} {'RSS MB':>7} {'err':>4}"
+    )
+    for label in sorted(recorder.latencies):
+        values = recorder.latencies[label]
+        print(
+            f"  {label[:52]:52} {len(values):>5} "
+            f"{percentile(values, 50) * 1000:>6.0f}ms {percentile(values, 95) * 1000:>6.0f}ms "
+            f"{percentile(values, 99) * 1000:>6.0f}ms {len(values) / wall_seconds:>7.1f} "
+            f"{max(recorder.rss[label]):>7.1f} {recorder.errors[label]:>4}"
+        )
+
+
+async def run_scenario(app, title, runs, endpoint, messages, concurrency):
+    """Run `runs` conversations, `concurrency` at a time, and print the results."""
+    recorder = Recorder()
+    timer = NodeTimer(recorder)
+    token = node_timer_var.set(timer)
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async def one(client):
+        async with semaphore:
+            await conversation(client, recorder, endpoint, messages)
+
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=300
+        ) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(client) for _ in range(runs)))
+            wall = time.perf_counter() - start
+    finally:
+        node_timer_var.reset(token)
+
+    print_table(
+        f"{title}: {runs} conversation(s), {concurrency} at a time, {wall:.2f}s",
+        recorder,
+        wall,
+    )
+
+
+def configure_environment(args, workdir: str) -> None:
+    """Point the app at the stub and keep its files out of the working tree."""
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["CONVEX_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+    os.environ["WEB_SEARCH_BACKEND"] = "stub"
+    for name, filename in [
+        ("CHECKPOINT_DB_PATH", "checkpoints.sqlite"),
+        ("ITINERARY_CACHE_PATH", "itinerary_cache.sqlite"),
+        ("WEB_SEARCH_CACHE_PATH", "web_search_cache.sqlite"),
+        ("REFERENCE_DATA_SNAPSHOT_PATH", "reference_data.json"),
+    ]:
+        os.environ[name] = os.path.join(workdir, filename)
+    os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "llm_cache.sqlite")
+    if args.no_caches:
+        os.environ["ITINERARY_CACHE_MAX_ENTRIES"] = "0"
+    if args.llm_cache:
+        os.environ["LLM_CACHE_MAX_ENTRIES"] = "5000"
+
+
+def print_costs() -> None:
+    """LLM calls, tokens and estimated spend per stage and model, and routing."""
+    from app.core.metrics import cost_snapshot, latency_snapshot
+
+    print(f"\nLLM cost per stage\n  {'':36} {'calls':>6} {'in tok':>9} {'out tok':>8} {'USD':>9}")
+    for stage, models in sorted(cost_snapshot().items()):
+        for model_name, stats in sorted(models.items()):
+            print(
+                f"  {f'{stage} ({model_name})'[:36]:36} {stats['calls']:>6} "
+                f"{stats['input_tokens']:>9} {stats['output_tokens']:>8} "
+                f"{stats['cost_usd']:>9.4f}"
+            )
+    routes = {
+        name: stats for name, stats in latency_snapshot().items() if name.startswith("route ")
+    }
+    if routes:
+        print(f"\nModel routing\n  {'':36} {'calls':>6} {'avg':>9}")
+        for name, stats in sorted(routes.items()):
+            print(f"  {name[:36]:36} {stats['count']:>6} {stats['avg_ms']:>7.0f}ms")
+
+
+async def run(args, fake, small_fake) -> None:
+    # Imported only now, so the settings and the model above are picked up
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        started_rss = rss_mb()
+        await run_scenario(
+            app, "one-shot", args.runs, "/api/travel-system/chat", [ONE_SHOT_MESSAGE], 1
+        )
+        await run_scenario(
+            app,
+            "one-shot (streamed)",
+            args.runs,
+            "/api/travel-system/stream",
+            [ONE_SHOT_MESSAGE],
+            1,
+        )
+        await run_scenario(
+            app,
+            "multi-turn",
+            args.runs,
+            "/api/travel-system/chat",
+            [FIRST_MESSAGE, *REPLIES],
+            1,
+        )
+        await run_scenario(
+            app,
+            "concurrent users",
+            args.users * args.runs,
+            "/api/travel-system/chat",
+            [FIRST_MESSAGE, *REPLIES],
+            args.users,
+        )
+
+    print_costs()
+    print(
+        f"\nLLM calls: {fake.call_count} large, {small_fake.call_count} small, "
+        f"RSS: {started_rss:.1f}MB at start, "
+        f"{rss_mb():.1f}MB at end, {peak_rss_mb():.1f}MB peak"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Conversations per scenario")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent users")
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--small-llm-latency-ms", type=float, default=80)
+    parser.add_argument(
+        "--small-invalid-every",
+        type=int,
+        default=0,
+        help="Make every Nth small-model answer malformed, to exercise escalation",
+    )
+    parser.add_argument("--convex-latency-ms", type=float, default=20)
+    parser.add_argument("--flights", type=int, default=5000)
+    parser.add_argument("--hotels", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8799, help="Port for the Convex stub")
+    parser.add_argument(
+        "--no-caches", action="store_true", help="Disable the itinerary cache"
+    )
+    parser.add_argument(
+        "--llm-cache", action="store_true", help="Enable the LLM response cache"
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="pipeline-bench-")
+    configure_environment(args, workdir)
+    dataset = build_dataset(flights=args.flights, hotels=args.hotels)
+    server = start_stub_server(dataset, port=args.port, latency_ms=args.convex_latency_ms)
+
+    import app.core.llm
+    from app.config import settings
+
+    # Fakes named like the configured models, so the cost metrics price them
+    fake = model_with(args.llm_latency_ms / 1000, settings.OPENAI_MODEL_NAME)
+    small_fake = model_with(
+        args.small_llm_latency_ms / 1000,
+        settings.OPENAI_SMALL_MODEL_NAME,
+        invalid_every=args.small_invalid_every,
+    )
+    # They answer through the same response cache the real models would use
+    fake.cache = small_fake.cache = app.core.llm.get_llm_cache()
+    app.core.llm.get_model = lambda: fake
+    app.core.llm.get_small_model = lambda: small_fake
+
+    print("🚀 Offline pipeline benchmark")
+    print(
+        f"LLM latency {args.llm_latency_ms:.0f}ms (small model "
+        f"{args.small_llm_latency_ms:.0f}ms), Convex latency {args.convex_latency_ms:.0f}ms, "
+        f"{len(dataset['flights'])} flights, {len(dataset['hotels'])} hotels, files in {workdir}"
+    )
+    try:
+        asyncio.run(run(args, fake, small_fake))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
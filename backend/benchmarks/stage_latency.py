@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Compare the wall-clock time of the post-requirements stages (itinerary
+planning and booking) with sequential vs parallel graph edges.
+
+Each run seeds a fresh thread with completed requirements and times only the
+planner and booker stages. It calls the configured LLM and Convex deployment,
+and the booker makes real bookings, so point CONVEX_BASE_URL at a test
+deployment.
+
+    python benchmarks/stage_latency.py --runs 3
+"""
+
+import argparse
+import asyncio
+import copy
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+from app.agents.tools.flight_tools import fetch_flights  # noqa: E402
+from app.agents.tools.ranking import rank_flights  # noqa: E402
+from app.agents.travel_system_graph import build_travel_system_graph  # noqa: E402
+from app.core.convex import convex_client  # noqa: E402
+
+MESSAGE = "I want to go to Seoul(ICN) from Tokyo(NRT). My dates are flexible."
+REQUIREMENTS = {
+    "traveler": {"adults": 1, "children": 0},
+    "trip": {
+        "type": "round_trip",
+        "origin": {"city": "Tokyo", "airport_iata": "NRT"},
+        "destination": {"city": "Seoul", "airport_iata": "ICN"},
+        "depart_date": "2025-11-15",
+        "return_date": "2025-11-18",
+    },
+    "preferences": {"cabin_class": "economy", "interests": ["food", "culture"]},
+    "budget": {"total_currency": "USD", "total_amount": 3000, "hotels_amount": 1500},
+    "hotel_prefs": {"stars": "3-5", "room_type": "Standard"},
+    "flight_check": {},
+    "user_confirmations": {"accept_outbound_top_option": True},
+    "missing_info": {"missing_info": [], "question": ""},
+}
+
+
+async def sample_requirements():
+    """Fill in the sample's confirmed flight from the cheapest real NRT→ICN flight."""
+    requirements = copy.deepcopy(REQUIREMENTS)
+    options, _ = rank_flights(await fetch_flights("NRT", "ICN"), top_k=1)
+    if options:
+        top = options[0]
+        requirements["trip"]["depart_date"] = top["depart_iso"][:10]
+        requirements["flight_check"] = {
+            "outbound_query": {"from_iata": "NRT", "to_iata": "ICN"},
+            "outbound_result": {"available": True, "top_option": top},
+        }
+    return requirements
+
+
+async def time_stages(graph, requirements):
+    """Run the planner and booker stages once on a fresh thread; return seconds."""
+    config = {"configurable": {"thread_id": f"stages-{uuid.uuid4().hex}"}}
+    await graph.aupdate_state(
+        config,
+        {"messages": [HumanMessage(content=MESSAGE)], "requirements": requirements},
+        as_node="requirements_subgraph",
+    )
+    start = time.perf_counter()
+    result = await graph.ainvoke(None, config)
+    elapsed = time.perf_counter() - start
+    if not result.get("itinerary") or not result.get("bookings"):
+        print("  ⚠️  run finished without an itinerary or bookings")
+    return elapsed
+
+
+def summarize(label, timings):
+    mean = statistics.mean(timings)
+    print(
+        f"{label:<11} mean {mean:6.2f}s  min {min(timings):6.2f}s  "
+        f"max {max(timings):6.2f}s  ({len(timings)} runs)"
+    )
+    return mean
+
+
+async def run(runs):
+    requirements = await sample_requirements()
+    graphs = {
+        "sequential": build_travel_system_graph(False, InMemorySaver()),
+        "parallel": build_travel_system_graph(True, InMemorySaver()),
+    }
+    timings = {label: [] for label in graphs}
+
+    # Interleave the variants so LLM latency drift affects both equally
+    for i in range(runs):
+        for label, graph in graphs.items():
+            elapsed = await time_stages(graph, requirements)
+            timings[label].append(elapsed)
+            print(f"run {i + 1} {label:<11} {elapsed:6.2f}s")
+
+    print("\n" + "=" * 60)
+    sequential = summarize("sequential", timings["sequential"])
+    parallel = summarize("parallel", timings["parallel"])
+    print(f"speedup     {sequential / parallel:6.2f}x")
+    print("=" * 60)
+    await convex_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: how long a fresh process takes to import the app,
+start serving, and have its agents and graphs built.
+
+Each run spawns a new interpreter (as a uvicorn worker would) and times:
+
+- import: `import app.main`, and which heavy packages it pulled in
+- ready: the FastAPI lifespan startup, i.e. when requests are accepted
+- built: the agents and both graphs are built (for AGENT_BUILD_MODE=lazy,
+  what the first request would pay on top of ready)
+- spawn: interpreter start to ready, measured from the parent
+
+for each AGENT_BUILD_MODE. No LLM or Convex calls are made; files go to a
+temporary directory.
+
+    python benchmarks/startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+# Packages worth keeping out of the import, when they are
+HEAVY_MODULES = [
+    "openai",
+    "langchain_openai",
+    "langchain.agents",
+    "langchain_community",
+    "langgraph.graph",
+]
+
+# Runs in the child process; prints one JSON line with its timings
+CHILD = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+heavy = [name for name in json.loads(sys.argv[1]) if name in sys.modules]
+modules = len(sys.modules)
+
+
+async def main():
+    from app.core.metrics import latency_snapshot
+    async with app.main.app.router.lifespan_context(app.main.app):
+        ready = time.perf_counter()
+        if app.main.settings.AGENT_BUILD_MODE == "lazy":
+            from app.agents.travel_system_graph import build_graphs
+            build_graphs()
+        else:
+            while "startup build graphs" not in latency_snapshot():
+                await asyncio.sleep(0.005)
+        built = time.perf_counter()
+    return ready, built
+
+
+ready, built = asyncio.run(main())
+print(json.dumps({
+    "import": imported - start,
+    "ready": ready - start,
+    "built": built - start,
+    "heavy": heavy,
+    "modules": modules,
+}))
+"""
+
+
+def run_child(mode: str, workdir: str) -> dict:
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "startup-benchmark"),
+        # Nothing listens here; the reference data refresh just logs a failure
+        "CONVEX_BASE_URL": "http://127.0.0.1:9",
+        "AGENT_BUILD_MODE": mode,
+        "CHECKPOINT_DB_PATH": os.path.join(workdir, "checkpoints.sqlite"),
+        "ITINERARY_CACHE_PATH": os.path.join(workdir, "itinerary_cache.sqlite"),
+        "WEB_SEARCH_CACHE_PATH": os.path.join(workdir, "web_search_cache.sqlite"),
+        "REFERENCE_DATA_SNAPSHOT_PATH": os.path.join(workdir, "reference_data.json"),
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite"),
+    }
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-c", CHILD, json.dumps(HEAVY_MODULES)],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    spawned = time.perf_counter() - start
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    # Interpreter start to ready: the spawn time minus what ran after ready
+    result["spawn"] = spawned - (result["built"] - result["ready"])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Processes per mode")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["startup", "background", "lazy"],
+        help="AGENT_BUILD_MODE values to compare",
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    # A first run warms the OS file cache, so every mode starts equally warm
+    run_child("lazy", workdir)
+
+    print("🚀 Cold-start benchmark")
+    print(f"{args.runs} process(es) per mode, files in {workdir}")
+    print(
+        f"\n  {'AGENT_BUILD_MODE':18} {'import':>8} {'ready':>8} {'built':>8} "
+        f"{'spawn':>8} {'modules':>8}"
+    )
+    heavy = {}
+    for mode in args.modes:
+        results = [run_child(mode, workdir) for _ in range(args.runs)]
+        medians = {
+            key: statistics.median(r[key] for r in results)
+            for key in ("import", "ready", "built", "spawn", "modules")
+        }
+        heavy[mode] = results[-1]["heavy"]
+        print(
+            f"  {mode:18} {medians['import'] * 1000:>6.0f}ms {medians['ready'] * 1000:>6.0f}ms "
+            f"{medians['built'] * 1000:>6.0f}ms {medians['spawn'] * 1000:>6.0f}ms "
+            f"{medians['modules']:>8.0f}"
+        )
+    print("\nMedians; ready and built are measured from interpreter start to the app")
+    print("being importable, serving, and fully built. Heavy packages after import:")
+    for mode, names in heavy.items():
+        print(f"  {mode:18} {', '.join(names) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import asyncio
+
+from app.agents import booking_executor
+
+PLAN = {
+    "flight_id": "f1",
+    "name": "Alex Kim",
+    "email": "alex@example.com",
+    "city": "Seoul",
+    "check_in": "2025-11-15",
+    "check_out": "2025-11-18",
+    "stars": "3-4",
+    "amenities": None,
+    "max_price_per_night": None,
+    "room_type": "Standard",
+}
+
+
+class FakeTool:
+    def __init__(self, response):
+        self.response = response
+
+    async def ainvoke(self, args):
+        return self.response
+
+
+def test_flight_booking_with_missing_reference_is_a_failed_booking(monkeypatch):
+    response = {"success": True, "booking_id": "b1", "status": "confirmed"}
+    monkeypatch.setattr(booking_executor, "book_flight", FakeTool(response))
+
+    assert asyncio.run(booking_executor._book_flight(PLAN)) is None
+
+
+def test_hotel_booking_with_null_price_is_a_failed_booking(monkeypatch):
+    search = {"available": True, "hotels": [{"hotel_id": "h1"}]}
+    response = {
+        "success": True,
+        "booking_id": "b2",
+        "booking_reference": "R2",
+        "status": "confirmed",
+        "total_price": None,
+    }
+    monkeypatch.setattr(booking_executor, "search_hotels", FakeTool(search))
+    monkeypatch.setattr(booking_executor, "book_hotel", FakeTool(response))
+
+    assert asyncio.run(booking_executor._search_and_book_hotel(PLAN)) is None
+
+
+def test_complete_flight_booking_is_confirmed(monkeypatch):
+    response = {
+        "success": True,
+        "booking_id": "b1",
+        "booking_reference": "T1",
+        "status": "confirmed",
+    }
+    monkeypatch.setattr(booking_executor, "book_flight", FakeTool(response))
+
+    result = asyncio.run(booking_executor._book_flight(PLAN))
+
+    assert result.booking_id == "b1"
+    assert result.ticket_ref == "T1"
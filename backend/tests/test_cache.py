@@ -0,0 +1,26 @@
+import asyncio
+
+from app.core.cache import TTLCache
+
+
+def test_waiters_reload_when_loading_caller_is_cancelled():
+    cache = TTLCache("test", maxsize=10, ttl_seconds=60)
+    loads = []
+
+    async def loader():
+        loads.append(None)
+        await asyncio.sleep(0.01)
+        return len(loads)
+
+    async def main():
+        leader = asyncio.create_task(cache.get_or_load("key", loader))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(cache.get_or_load("key", loader)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == [2, 2, 2]
+    assert len(loads) == 2
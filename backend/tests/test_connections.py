@@ -0,0 +1,58 @@
+from app.agents.tools.connections import FlightNetwork
+
+
+def flight(origin, destination, flight_date, departure, arrival, price, flight_id):
+    return {
+        "_id": flight_id,
+        "airline": "Test Air",
+        "flightNumber": flight_id.upper(),
+        "origin": {"airport": origin},
+        "destination": {"airport": destination},
+        "flightDate": flight_date,
+        "departureTime": departure,
+        "arrivalTime": arrival,
+        "price": price,
+        "availableSeats": 10,
+    }
+
+
+FLIGHTS = [
+    flight("NRT", "ICN", "2025-11-15", "08:00", "10:30", 200, "nrt-icn"),
+    flight("ICN", "BKK", "2025-11-15", "13:00", "17:00", 250, "icn-bkk"),
+    flight("NRT", "BKK", "2025-11-20", "09:00", "14:00", 600, "nrt-bkk"),
+]
+
+
+def test_search_without_date_covers_every_day():
+    itineraries = FlightNetwork(FLIGHTS).search("NRT", "BKK")
+
+    assert len(itineraries) == 2
+    assert itineraries[0]["total_price_usd"] == 450
+    assert itineraries[1]["total_price_usd"] == 600
+
+
+def test_search_with_date_keeps_to_that_day():
+    itineraries = FlightNetwork(FLIGHTS).search("NRT", "BKK", date="2025-11-20")
+
+    assert len(itineraries) == 1
+    assert itineraries[0]["total_price_usd"] == 600
+
+
+def test_unreachable_destination_has_no_itineraries():
+    assert FlightNetwork(FLIGHTS).search("NRT", "SYD", max_layovers=3) == []
+
+
+def test_two_layover_itinerary_needs_max_layovers_two():
+    flights = FLIGHTS + [
+        flight("NRT", "TPE", "2025-11-16", "08:00", "11:00", 100, "nrt-tpe"),
+        flight("TPE", "HKG", "2025-11-16", "12:30", "14:30", 80, "tpe-hkg"),
+        flight("HKG", "BKK", "2025-11-16", "16:00", "18:00", 90, "hkg-bkk"),
+    ]
+    network = FlightNetwork(flights)
+
+    one_stop = network.search("NRT", "BKK", max_layovers=1, top_k=1)
+    two_stops = network.search("NRT", "BKK", max_layovers=2, top_k=1)
+
+    assert one_stop[0]["total_price_usd"] == 450
+    assert two_stops[0]["total_price_usd"] == 270
+    assert len(two_stops[0]["legs"]) == 3
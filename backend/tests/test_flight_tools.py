@@ -0,0 +1,48 @@
+import asyncio
+
+from app.agents.tools import flight_tools
+from app.core.reference_data import ReferenceData
+
+CITIES = [
+    {"name": "Tokyo", "airportCode": "NRT"},
+    {"name": "Seoul", "airportCode": "ICN"},
+    {"name": "Bangkok", "airportCode": "BKK"},
+]
+
+
+def no_route_answer(monkeypatch, routes, origin, destination):
+    reference = ReferenceData(CITIES, [], routes)
+
+    async def get():
+        return reference
+
+    monkeypatch.setattr(flight_tools.reference_store, "get", get)
+    return asyncio.run(flight_tools._no_route_answer(origin, destination))
+
+
+def test_missing_route_is_answered_locally(monkeypatch):
+    routes = [
+        {"origin": "NRT", "destination": "ICN"},
+        {"origin": "ICN", "destination": "BKK"},
+    ]
+
+    answer = no_route_answer(monkeypatch, routes, "NRT", "BKK")
+
+    assert answer["no_route"] is True
+    assert answer["one_stop_routes"] == [["NRT", "ICN", "BKK"]]
+
+
+def test_existing_route_goes_to_the_search(monkeypatch):
+    routes = [{"origin": "NRT", "destination": "ICN"}]
+
+    assert no_route_answer(monkeypatch, routes, "NRT", "ICN") is None
+
+
+def test_empty_route_graph_goes_to_the_search(monkeypatch):
+    assert no_route_answer(monkeypatch, [], "NRT", "BKK") is None
+
+
+def test_origin_without_routes_goes_to_the_search(monkeypatch):
+    routes = [{"origin": "ICN", "destination": "BKK"}]
+
+    assert no_route_answer(monkeypatch, routes, "NRT", "BKK") is None
@@ -0,0 +1,76 @@
+import asyncio
+
+from app.agents.itinerary_cache import ItineraryCache, append_days
+
+
+def requirements(depart_date, return_date, city="Tokyo"):
+    return {
+        "trip": {
+            "destination": {"city": city},
+            "depart_date": depart_date,
+            "return_date": return_date,
+        },
+        "preferences": {"interests": ["Food", "museums"]},
+    }
+
+
+def itinerary(start_day, days):
+    return {
+        "days": [
+            {
+                "date": f"2025-11-{start_day + i:02d}",
+                "city": "Tokyo",
+                "activities": [{"name": f"Day {i + 1}", "type": "food"}],
+            }
+            for i in range(days)
+        ]
+    }
+
+
+def cache(tmp_path):
+    return ItineraryCache(str(tmp_path / "itineraries.sqlite"), max_entries=10, ttl_seconds=60)
+
+
+def test_exact_trip_is_a_full_hit_on_the_new_dates(tmp_path):
+    store = cache(tmp_path)
+    asyncio.run(store.store(requirements("2025-11-10", "2025-11-12"), itinerary(10, 3)))
+
+    found = asyncio.run(store.lookup(requirements("2025-11-20", "2025-11-22")))
+
+    assert found.missing == 0
+    assert [d["date"] for d in found.days] == ["2025-11-20", "2025-11-21", "2025-11-22"]
+    assert store.stats()["hits"] == 1
+
+
+def test_longer_trip_reuses_a_shorter_one_and_plans_the_rest(tmp_path):
+    store = cache(tmp_path)
+    asyncio.run(store.store(requirements("2025-11-10", "2025-11-12"), itinerary(10, 3)))
+    longer = requirements("2025-11-20", "2025-11-24")
+
+    found = asyncio.run(store.lookup(longer))
+    days = append_days(found.days, itinerary(1, 2)["days"], longer)
+
+    assert found.missing == 2
+    assert store.stats()["partial_hits"] == 1
+    assert [d["date"] for d in days] == [
+        "2025-11-20", "2025-11-21", "2025-11-22", "2025-11-23", "2025-11-24"
+    ]
+    assert [d["activities"][0]["name"] for d in days][3:] == ["Day 1", "Day 2"]
+
+
+def test_shorter_trip_uses_the_first_days_of_a_longer_one(tmp_path):
+    store = cache(tmp_path)
+    asyncio.run(store.store(requirements("2025-11-10", "2025-11-14"), itinerary(10, 5)))
+
+    found = asyncio.run(store.lookup(requirements("2025-11-20", "2025-11-21")))
+
+    assert found.missing == 0
+    assert len(found.days) == 2
+
+
+def test_other_destination_is_a_miss(tmp_path):
+    store = cache(tmp_path)
+    asyncio.run(store.store(requirements("2025-11-10", "2025-11-12"), itinerary(10, 3)))
+
+    assert asyncio.run(store.lookup(requirements("2025-11-10", "2025-11-12", "Osaka"))) is None
+    assert store.stats()["misses"] == 1
@@ -0,0 +1,58 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from app.core.llm_cache import build_llm_cache
+
+PROMPT = '[{"role": "user", "content": "Plan a day in Tokyo"}]'
+MODEL = "gpt-4.1-mini temperature=0"
+
+
+def response(text="Visit Asakusa"):
+    message = AIMessage(
+        content=text,
+        usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    )
+    return [ChatGeneration(message=message)]
+
+
+def llm_cache(tmp_path):
+    return build_llm_cache(
+        str(tmp_path / "llm.sqlite"), max_entries=10, memory_entries=10, ttl_seconds=60
+    )
+
+
+def test_zero_entries_disables_the_cache(tmp_path):
+    assert build_llm_cache(str(tmp_path / "llm.sqlite"), 0, 10, 60) is None
+
+
+def test_stored_response_is_served_from_memory_without_usage(tmp_path):
+    cache = llm_cache(tmp_path)
+    cache.update(PROMPT, MODEL, response())
+
+    generations = cache.lookup(PROMPT, MODEL)
+
+    assert generations[0].message.content == "Visit Asakusa"
+    assert generations[0].message.usage_metadata is None
+    assert cache.lookup(PROMPT, "gpt-4.1 temperature=0") is None
+
+
+def test_disk_tier_survives_a_new_process_and_refills_memory(tmp_path):
+    asyncio.run(llm_cache(tmp_path).aupdate(PROMPT, MODEL, response()))
+    restarted = llm_cache(tmp_path)
+
+    generations = asyncio.run(restarted.alookup(PROMPT, MODEL))
+
+    assert generations[0].message.content == "Visit Asakusa"
+    assert restarted.memory.get(restarted.key(PROMPT, MODEL))[0]
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = llm_cache(tmp_path)
+    cache.update(PROMPT, MODEL, response())
+
+    cache.clear()
+
+    assert cache.lookup(PROMPT, MODEL) is None
+    assert llm_cache(tmp_path).lookup(PROMPT, MODEL) is None
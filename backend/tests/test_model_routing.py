@@ -0,0 +1,86 @@
+import asyncio
+
+from langchain.agents.middleware import ModelRequest, ModelResponse
+from langchain.agents.structured_output import ToolStrategy
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from pydantic import BaseModel
+
+from app.agents.model_routing import ModelRouter, complexity, failure
+
+SMALL = GenericFakeChatModel(messages=iter([]))
+LARGE = GenericFakeChatModel(messages=iter([]))
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def request(*messages, response_format=None):
+    return ModelRequest(
+        model=SMALL,
+        messages=[HumanMessage("Plan a trip to Tokyo"), *messages],
+        tools=[{"name": "search_flight_availability"}],
+        response_format=response_format,
+    )
+
+
+def tool_round(i):
+    call = {"name": "search_flight_availability", "args": {}, "id": f"call-{i}"}
+    return [AIMessage("", tool_calls=[call]), ToolMessage("{}", tool_call_id=f"call-{i}")]
+
+
+def test_simple_turn_stays_on_the_small_model():
+    assert complexity(request(), max_small_tokens=6000) is None
+
+
+def test_complex_turns_skip_the_small_model():
+    retry = ToolMessage("Invalid output. Please fix your mistakes.", tool_call_id="call-0")
+    rounds = [m for i in range(4) for m in tool_round(i)]
+
+    assert complexity(request(retry), 6000) == "retrying invalid structured output"
+    assert complexity(request(*rounds), 6000) == "many tool rounds"
+    assert complexity(request(), max_small_tokens=2) == "long prompt"
+
+
+def test_unusable_small_model_responses_are_failures():
+    strategy = ToolStrategy(Answer)
+    unknown = AIMessage("", tool_calls=[{"name": "book_flight", "args": {}, "id": "c1"}])
+    structured = AIMessage("", tool_calls=[{"name": "Answer", "args": {}, "id": "c2"}])
+
+    assert failure(request(), ModelResponse(result=[])) == "no response"
+    assert failure(request(), ModelResponse(result=[AIMessage("")])) == "empty response"
+    assert failure(request(), ModelResponse(result=[unknown])) == "unknown tool book_flight"
+    assert (
+        failure(request(response_format=strategy), ModelResponse(result=[structured]))
+        == "invalid structured output"
+    )
+    assert failure(request(), ModelResponse(result=[AIMessage("Done")])) is None
+
+
+def test_router_escalates_a_failed_small_answer_to_the_large_model():
+    router = ModelRouter("test", small=SMALL, large=LARGE, max_small_tokens=6000)
+    calls = []
+
+    async def handler(routed):
+        calls.append(routed.model)
+        text = "" if routed.model is SMALL else "Here is your plan"
+        return ModelResponse(result=[AIMessage(text)])
+
+    response = asyncio.run(router.awrap_model_call(request(), handler))
+
+    assert calls == [SMALL, LARGE]
+    assert response.result[0].text == "Here is your plan"
+
+
+def test_router_sends_complex_turns_straight_to_the_large_model():
+    router = ModelRouter("test", small=SMALL, large=LARGE, max_small_tokens=2)
+    calls = []
+
+    def handler(routed):
+        calls.append(routed.model)
+        return ModelResponse(result=[AIMessage("Here is your plan")])
+
+    router.wrap_model_call(request(), handler)
+
+    assert calls == [LARGE]
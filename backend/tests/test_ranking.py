@@ -0,0 +1,69 @@
+from app.agents.tools.ranking import rank_flights, rank_hotels
+
+
+def flight(flight_id, price, duration):
+    return {
+        "_id": flight_id,
+        "flightDate": "2025-11-15",
+        "departureTime": "08:00",
+        "arrivalTime": "10:30",
+        "price": price,
+        "duration": duration,
+        "availableSeats": 10,
+    }
+
+
+FLIGHTS = [
+    flight("no-price", None, 120),
+    flight("slow", 300, 240),
+    flight("no-duration", 200, None),
+    flight("fast", 400, 90),
+]
+
+
+def test_flights_missing_the_sort_field_rank_last():
+    by_price, _ = rank_flights(FLIGHTS)
+    by_duration, _ = rank_flights(FLIGHTS, sort_by="duration")
+
+    assert [f["flight_id"] for f in by_price] == ["no-duration", "slow", "fast", "no-price"]
+    assert [f["flight_id"] for f in by_duration] == ["fast", "no-price", "slow", "no-duration"]
+
+
+def test_price_cap_skips_flights_without_a_price():
+    options, total = rank_flights(FLIGHTS, max_price=350)
+
+    assert total == 2
+    assert [f["flight_id"] for f in options] == ["no-duration", "slow"]
+
+
+def hotel(hotel_id, price_per_night, stars):
+    return {
+        "_id": hotel_id,
+        "pricePerNight": price_per_night,
+        "starRating": stars,
+        "amenities": ["wifi"],
+        "availableRooms": 3,
+    }
+
+
+HOTELS = [
+    hotel("no-price", None, 5),
+    hotel("budget", 80, 3),
+    hotel("unrated", 120, None),
+    hotel("luxury", 300, 5),
+]
+
+
+def test_hotels_missing_the_sort_field_rank_last():
+    by_price, _ = rank_hotels(HOTELS)
+    by_rating, _ = rank_hotels(HOTELS, sort_by="rating")
+
+    assert [h["hotel_id"] for h in by_price] == ["budget", "unrated", "luxury", "no-price"]
+    assert [h["hotel_id"] for h in by_rating] == ["luxury", "no-price", "budget", "unrated"]
+
+
+def test_hotel_filters_skip_missing_price_and_rating():
+    options, total = rank_hotels(HOTELS, stars="3-5", max_price_per_night=200)
+
+    assert total == 1
+    assert [h["hotel_id"] for h in options] == ["budget"]
@@ -0,0 +1,17 @@
+import asyncio
+
+from app.core import reference_data
+from app.core.reference_data import ReferenceDataStore
+
+
+def test_malformed_response_counts_as_a_failed_load(monkeypatch, tmp_path):
+    async def aget(path, params=None):
+        # A JSON list where an object is expected
+        return []
+
+    monkeypatch.setattr(reference_data.convex_client, "aget", aget)
+    store = ReferenceDataStore(str(tmp_path / "reference_data.json"))
+
+    assert asyncio.run(store.refresh()) is False
+    assert not asyncio.run(store.get())
+    assert store._attempted
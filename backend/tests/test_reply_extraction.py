@@ -0,0 +1,92 @@
+from app.agents.reply_extraction import extract_reply
+from app.core.reference_data import ReferenceData
+
+REFERENCE = ReferenceData(
+    [
+        {"name": "Seoul", "airportCode": "ICN"},
+        {"name": "Bangkok", "airportCode": "BKK"},
+    ],
+    [],
+    [],
+)
+
+
+def test_single_date_is_depart_date_for_one_way_trip():
+    partial = {"trip": {"type": "one_way", "depart_date": "2025-11-15"}}
+
+    result = extract_reply("2025-11-20", "When would you like to fly?", partial, REFERENCE)
+
+    assert result.understood
+    assert result.update == {"trip": {"depart_date": "2025-11-20"}}
+
+
+def test_single_date_is_return_date_when_asked_for_round_trip():
+    partial = {"trip": {"type": "round_trip", "depart_date": "2025-11-15"}}
+
+    result = extract_reply(
+        "2025-11-22", "When would you like to return?", partial, REFERENCE
+    )
+
+    assert result.understood
+    assert result.update == {"trip": {"return_date": "2025-11-22"}}
+
+
+def test_return_question_without_round_trip_goes_to_agent():
+    partial = {"trip": {"depart_date": "2025-11-15"}}
+
+    result = extract_reply(
+        "2025-11-22", "When would you like to return?", partial, REFERENCE
+    )
+
+    assert not result.understood
+
+
+def test_from_cue_sets_origin_when_asked_for_destination():
+    result = extract_reply("From ICN", "Where are you going?", {}, REFERENCE)
+
+    assert result.understood
+    assert result.update == {"trip": {"origin": {"city": "Seoul", "airport_iata": "ICN"}}}
+
+
+def test_cues_order_two_airports():
+    result = extract_reply("to BKK from ICN", "Where are you travelling?", {}, REFERENCE)
+
+    assert result.update["trip"]["origin"]["airport_iata"] == "ICN"
+    assert result.update["trip"]["destination"]["airport_iata"] == "BKK"
+
+
+def test_bare_amount_fills_the_budget_field_asked_about():
+    partial = {"budget": {"total_amount": 3000.0, "total_currency": "USD"}}
+
+    result = extract_reply(
+        "$800", "How much of your budget is for hotels?", partial, REFERENCE
+    )
+
+    assert result.understood
+    assert result.update == {
+        "budget": {"hotels_amount": 800.0, "total_currency": "USD"}
+    }
+
+
+def test_bare_amount_for_several_budget_fields_goes_to_agent():
+    result = extract_reply(
+        "$800",
+        "Could you tell me how much of the budget is for flights and how much "
+        "of the budget is for hotels?",
+        {},
+        REFERENCE,
+    )
+
+    assert not result.understood
+    assert "budget" not in result.update
+
+
+def test_single_date_for_departure_and_return_question_goes_to_agent():
+    partial = {"trip": {"type": "round_trip"}}
+
+    result = extract_reply(
+        "2025-11-15", "What are your departure and return dates?", partial, REFERENCE
+    )
+
+    assert not result.understood
+    assert "trip" not in result.update
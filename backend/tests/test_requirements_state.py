@@ -0,0 +1,117 @@
+from app.agents.requirements_state import merge_update, missing_fields
+from app.agents.response_models.requirements_agent import (
+    RequirementsUpdateResponseModel,
+)
+
+TOP_OPTION = {
+    "flight_id": "f1",
+    "carrier": "Test Air",
+    "flight_number": "TA1",
+    "depart_iso": "2025-11-15T08:00:00",
+    "arrive_iso": "2025-11-15T10:30:00",
+    "price_usd": 200.0,
+}
+
+CONFIRMED = {
+    "traveler": {
+        "adults": 1,
+        "children": 0,
+        "lead_name": "Alex Kim",
+        "lead_email": "alex@example.com",
+    },
+    "trip": {
+        "type": "one_way",
+        "origin": {"city": "Tokyo", "airport_iata": "NRT"},
+        "destination": {"city": "Seoul", "airport_iata": "ICN"},
+        "depart_date": "2025-11-15",
+    },
+    "preferences": {
+        "cabin_class": "economy",
+        "non_stop": False,
+        "max_layovers": 1,
+        "date_flex_days": 0,
+        "interests": ["food"],
+    },
+    "budget": {
+        "total_currency": "USD",
+        "total_amount": 2000.0,
+        "flights_amount": 500.0,
+        "hotels_amount": 1500.0,
+    },
+    "hotel_prefs": {"stars": "3-4", "area": "central", "room_type": "double"},
+    "flight_check": {
+        "outbound_query": {
+            "from_iata": "NRT",
+            "to_iata": "ICN",
+            "date": "2025-11-15",
+            "passengers": 1,
+            "cabin": "economy",
+            "non_stop": False,
+        },
+        "outbound_result": {"available": True, "top_option": TOP_OPTION},
+    },
+    "user_confirmations": {"accept_outbound_top_option": True},
+}
+
+
+def update(**sections):
+    return RequirementsUpdateResponseModel.model_validate(sections)
+
+
+def test_confirmed_requirements_are_complete():
+    assert missing_fields(CONFIRMED) == []
+
+
+def test_missing_lead_email_and_confirmation_are_reported():
+    partial = {
+        **CONFIRMED,
+        "traveler": {**CONFIRMED["traveler"], "lead_email": None},
+        "user_confirmations": {},
+    }
+
+    assert missing_fields(partial) == [
+        "user_confirmations.accept_outbound_top_option",
+        "traveler.lead_email",
+    ]
+
+
+def test_round_trip_needs_a_return_date():
+    partial = {**CONFIRMED, "trip": {**CONFIRMED["trip"], "type": "round_trip"}}
+
+    assert missing_fields(partial) == ["trip.return_date"]
+
+
+def test_merge_keeps_fields_the_update_leaves_out():
+    merged = merge_update(CONFIRMED, update(budget={"hotels_amount": 1200.0}))
+
+    assert merged["budget"]["hotels_amount"] == 1200.0
+    assert merged["budget"]["total_amount"] == 2000.0
+    assert merged["flight_check"] == CONFIRMED["flight_check"]
+
+
+def test_changing_lead_details_keeps_the_flight_confirmation():
+    merged = merge_update(
+        CONFIRMED,
+        update(
+            traveler={"lead_email": "alex.kim@example.com"},
+            preferences={"interests": ["food", "museums"]},
+        ),
+    )
+
+    assert merged["user_confirmations"] == {"accept_outbound_top_option": True}
+    assert merged["flight_check"] == CONFIRMED["flight_check"]
+    assert missing_fields(merged) == []
+
+
+def test_changing_a_flight_input_drops_the_flight_confirmation():
+    merged = merge_update(CONFIRMED, update(preferences={"cabin_class": "business"}))
+
+    assert "flight_check" not in merged
+    assert "user_confirmations" not in merged
+    assert "user_confirmations.accept_outbound_top_option" in missing_fields(merged)
+
+
+def test_unchanged_flight_input_keeps_the_flight_confirmation():
+    merged = merge_update(CONFIRMED, update(traveler={"adults": 1}))
+
+    assert merged["user_confirmations"] == {"accept_outbound_top_option": True}
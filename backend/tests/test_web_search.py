@@ -0,0 +1,90 @@
+import asyncio
+
+from app.agents.tools.web_search import StubSearchBackend, WebSearcher, normalize_query
+from app.core.cache import SqliteTTLCache
+from app.core.rate_limit import TokenBucket
+
+
+def searcher(tmp_path, backend, rate=1000.0, capacity=10.0):
+    cache = SqliteTTLCache(
+        "test_web_search", path=str(tmp_path / "web.sqlite"), maxsize=100, ttl_seconds=60
+    )
+    return WebSearcher(
+        backend=backend,
+        cache=cache,
+        limiter=TokenBucket(rate=rate, capacity=capacity),
+        max_results=2,
+        snippet_chars=200,
+    )
+
+
+class FailingBackend:
+    async def search(self, query, max_results):
+        raise RuntimeError(f"no results for {query}")
+
+
+def test_normalize_query():
+    assert normalize_query("  Tokyo   FOOD! ") == "tokyo food"
+
+
+def test_repeated_query_is_served_from_the_cache(tmp_path):
+    backend = StubSearchBackend()
+    web = searcher(tmp_path, backend)
+
+    first = asyncio.run(web.search("Tokyo food"))
+    second = asyncio.run(web.search("tokyo  food!"))
+
+    assert first == second
+    assert backend.calls == 1
+
+
+def test_search_many_merges_distinct_queries(tmp_path):
+    backend = StubSearchBackend()
+    web = searcher(tmp_path, backend)
+
+    response = asyncio.run(web.search_many(["Tokyo food", "tokyo food", "Tokyo parks"]))
+
+    assert backend.calls == 2
+    assert [r["query"] for r in response["results"]] == ["Tokyo food"] * 2 + ["Tokyo parks"] * 2
+    assert "failed" not in response
+
+
+def test_search_many_reports_failed_queries(tmp_path):
+    web = searcher(tmp_path, FailingBackend())
+
+    response = asyncio.run(web.search_many(["Tokyo food"]))
+
+    assert response["results"] == []
+    assert response["failed"] == [{"query": "Tokyo food", "error": "no results for Tokyo food"}]
+
+
+def test_waiters_search_again_when_first_caller_is_cancelled(tmp_path):
+    backend = StubSearchBackend(delay_seconds=0.02)
+    web = searcher(tmp_path, backend)
+
+    async def main():
+        first = asyncio.create_task(web.search("Tokyo food"))
+        await asyncio.sleep(0.005)
+        waiting = asyncio.create_task(web.search_many(["Tokyo food"]))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await waiting
+
+    response = asyncio.run(main())
+
+    assert len(response["results"]) == 2
+    assert "failed" not in response
+    assert backend.calls == 2
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    bucket = TokenBucket(rate=50.0, capacity=2.0)
+
+    async def main():
+        for _ in range(3):
+            await bucket.acquire()
+
+    asyncio.run(main())
+
+    assert bucket.acquired == 3
+    assert bucket.waited_seconds >= 0.015